@@ -1,3 +1,47 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Email, ImportRun, Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = [
+        "name",
+        "status",
+        "progress",
+        "attempts",
+        "run_after",
+        "locked_by",
+        "made_by",
+    ]
+    list_filter = ["status", "name"]
+
+
+@admin.register(Email)
+class EmailAdmin(admin.ModelAdmin):
+    list_display = [
+        "to",
+        "subject",
+        "status",
+        "attempts",
+        "send_after",
+        "sent_on",
+        "batch",
+    ]
+    list_filter = ["status", "batch"]
+    search_fields = ["to"]
+
+
+@admin.register(ImportRun)
+class ImportRunAdmin(admin.ModelAdmin):
+    list_display = [
+        "file_name",
+        "center",
+        "status",
+        "rows",
+        "entries",
+        "made_by",
+        "created_on",
+    ]
+    list_filter = ["status"]
+    exclude = ["state"]
@@ -1,5 +1,13 @@
 from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
 
 
 class BaseConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
     name = "base"
+
+    def ready(self):
+        import base.signals  # noqa
+
+        # the background tasks of the apps (see base.jobs)
+        autodiscover_modules("tasks")
@@ -0,0 +1,391 @@
+"""
+synthetic datasets with the volumes of the biggest centers, to reproduce
+scaling problems locally. the rows are written with bulk_create, so the
+save() methods and signals are skipped and their work (names, tokens,
+ledger, cached versions) is done here once for each batch. a new run with
+a seed already used adds its centers after the ones made before.
+"""
+import random
+
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+from faker import Faker
+
+from base.signals import COUNTED_MODELS
+from center.models import Center
+from event.models import Event, Frequency
+from factories import (
+    ActivityFactory,
+    BankflagFactory,
+    CenterFactory,
+    PaytypeFactory,
+    UserFactory,
+)
+from person.models import Historic, Person, PersonNameToken
+from person.name_index import bump_version
+from publicwork.models import (
+    HistoricOfSeeker,
+    Lecture,
+    Listener,
+    PublicworkGroup,
+    Seeker,
+    SeekerNameToken,
+)
+from rcadmin.common import (
+    ASPECTS,
+    LECTURE_TYPES,
+    OCCURRENCES,
+    SEEKER_STATUS,
+    bump_count_version,
+    short_name,
+    us_inter_char,
+)
+from treasury.models import CashLedger, FormOfPayment, Order, Payment
+from user.models import Profile, User
+from workgroup.models import Membership, Workgroup
+
+# rows of each kind created for each center
+DEFAULT_COUNTS = {
+    "persons": 2000,
+    "historics": 2000,
+    "events": 100,
+    "frequencies": 4000,
+    "workgroups": 20,
+    "memberships": 30,  # per workgroup
+    "orders": 1000,
+    "seekers": 2000,
+    "lectures": 100,
+    "listeners": 4000,
+    "pw_groups": 20,
+    "pw_members": 20,  # per group
+}
+
+
+class DatasetGenerator:
+    def __init__(self, seed=0, scale=1, batch_size=1000, **counts):
+        self.seed = seed
+        self.rand = random.Random(seed)
+        self.fake = Faker("pt_BR")
+        self.fake.seed_instance(seed)
+        self.batch_size = batch_size
+        # an explicit count is kept as given, even 0
+        self.counts = {}
+        for name, count in DEFAULT_COUNTS.items():
+            if counts.get(name) is not None:
+                count = counts[name]
+            else:
+                count *= scale
+            self.counts[name] = max(0, int(count))
+        self.today = timezone.now().date()
+        # the password of every generated user
+        self.password = make_password(f"dataset-{seed}")
+
+    def get_count(self, name, *sources):
+        """the count of name, or 0 when a source of its rows is empty."""
+        return self.counts[name] if all(sources) else 0
+
+    def bulk_create(self, model, objs):
+        return model.objects.bulk_create(objs, batch_size=self.batch_size)
+
+    def get_date(self, max_days, min_days=0):
+        return self.today - timedelta(self.rand.randint(min_days, max_days))
+
+    def get_or_create(self, factory, name):
+        obj = factory._meta.model.objects.filter(name=name).first()
+        return obj or factory.create(name=name)
+
+    def generate(self, centers=1):
+        activity = self.get_or_create(ActivityFactory, "Dataset activity")
+        paytype = self.get_or_create(PaytypeFactory, "Dataset paytype")
+        bank_flag = self.get_or_create(BankflagFactory, "Dataset")
+        first = Center.objects.filter(
+            name__startswith=f"Dataset Center {self.seed}-"
+        ).count()
+        return [
+            self.create_center(number, activity, paytype, bank_flag)
+            for number in range(first, first + centers)
+        ]
+
+    def create_center(self, number, activity, paytype, bank_flag):
+        tag = f"{self.seed}-{number}"
+        user = UserFactory.create(email=f"dataset.{tag}@example.com")
+        center = CenterFactory.create(
+            name=f"Dataset Center {tag}",
+            short_name=f"DS-{tag}",
+            city=self.fake.city(),
+            email=f"center.{tag}@example.com",
+            made_by=user,
+        )
+        user.person.center = center
+        user.person.save()
+
+        persons = self.create_persons(center, tag)
+        self.create_historics(center, persons)
+        events = self.create_events(center, activity, persons)
+        self.create_workgroups(center, persons, user.person)
+        self.create_orders(center, persons, events, paytype, bank_flag)
+        self.create_publicwork(center, user.person)
+
+        PersonNameToken.objects.insert(
+            Person.objects.filter(center=center), "name_sa"
+        )
+        SeekerNameToken.objects.insert(
+            Seeker.objects.filter(center=center), "name_sa", "city_sa"
+        )
+        CashLedger.objects.rebuild(center)
+        bump_version(center.pk)
+        for model in COUNTED_MODELS:
+            bump_count_version(model, center.pk)
+        return center
+
+    #  persons  ###############################################################
+    def create_persons(self, center, tag):
+        emails = [
+            f"dataset.{tag}.{n}@example.com"
+            for n in range(self.counts["persons"])
+        ]
+        self.bulk_create(
+            User,
+            [
+                UserFactory.build(email=email, password=self.password)
+                for email in emails
+            ],
+        )
+        users = list(User.objects.filter(email__in=emails).order_by("email"))
+        self.bulk_create(
+            Profile,
+            [
+                Profile(
+                    user=user,
+                    gender=self.rand.choice(["M", "F"]),
+                    city=self.fake.city(),
+                    state=self.fake.estado_sigla(),
+                )
+                for user in users
+            ],
+        )
+        persons = []
+        for user in users:
+            name = self.fake.name()
+            persons.append(
+                Person(
+                    user=user,
+                    center=center,
+                    name=name,
+                    name_sa=us_inter_char(name),
+                    short_name=short_name(name),
+                    birth=self.get_date(30000, 6000),
+                    aspect=self.rand.choice(ASPECTS)[0],
+                    aspect_date=self.get_date(3000),
+                    made_by=center.made_by,
+                )
+            )
+        self.bulk_create(Person, persons)
+        return persons
+
+    def create_historics(self, center, persons):
+        self.bulk_create(
+            Historic,
+            [
+                Historic(
+                    person=self.rand.choice(persons),
+                    occurrence=self.rand.choice(OCCURRENCES)[0],
+                    date=self.get_date(3000),
+                    made_by=center.made_by,
+                )
+                for _ in range(self.get_count("historics", persons))
+            ],
+        )
+
+    #  events  ################################################################
+    def create_events(self, center, activity, persons):
+        events = [
+            Event(
+                activity=activity,
+                center=center,
+                date=self.get_date(365),
+                made_by=center.made_by,
+            )
+            for _ in range(self.counts["events"])
+        ]
+        self.bulk_create(Event, events)
+        self.bulk_create(
+            Frequency,
+            [
+                Frequency(
+                    event=self.rand.choice(events),
+                    person=self.rand.choice(persons),
+                    aspect=self.rand.choice(ASPECTS)[0],
+                )
+                for _ in range(self.get_count("frequencies", events, persons))
+            ],
+        )
+        return events
+
+    #  workgroups  ############################################################
+    def create_workgroups(self, center, persons, mentor):
+        self.bulk_create(
+            Workgroup,
+            [
+                Workgroup(
+                    name=f"Workgroup {number}",
+                    center=center,
+                    workgroup_type="MNT",
+                    made_by=center.made_by,
+                )
+                for number in range(self.counts["workgroups"])
+            ],
+        )
+        memberships = []
+        for workgroup in Workgroup.objects.filter(center=center):
+            memberships.append(
+                Membership(workgroup=workgroup, person=mentor, role_type="MTR")
+            )
+            memberships += [
+                Membership(workgroup=workgroup, person=person)
+                for person in self.rand.sample(
+                    persons, min(self.counts["memberships"], len(persons))
+                )
+            ]
+        self.bulk_create(Membership, memberships)
+
+    #  orders  ################################################################
+    def create_orders(self, center, persons, events, paytype, bank_flag):
+        orders, payments, payforms = [], [], []
+        payment_links, payform_links = [], []
+        for _ in range(self.get_count("orders", persons, events)):
+            person = self.rand.choice(persons)
+            value = self.rand.choice([50, 80, 120, 200])
+            order = Order(
+                center=center,
+                person=person,
+                amount=value,
+                status=self.rand.choice(["CCD", "CCD", "PND"]),
+                self_payed=self.rand.random() < 0.1,
+                made_by=center.made_by,
+            )
+            payment = Payment(
+                paytype=paytype,
+                person=person,
+                event=self.rand.choice(events),
+                value=value,
+            )
+            payform = FormOfPayment(
+                payform_type=self.rand.choice(["CSH", "PIX", "DBT", "CDT"]),
+                bank_flag=bank_flag,
+                value=value,
+            )
+            orders.append(order)
+            payments.append(payment)
+            payforms.append(payform)
+            payment_links.append(
+                Order.payments.through(
+                    order_id=order.pk, payment_id=payment.pk
+                )
+            )
+            payform_links.append(
+                Order.form_of_payments.through(
+                    order_id=order.pk, formofpayment_id=payform.pk
+                )
+            )
+        self.bulk_create(Order, orders)
+        self.bulk_create(Payment, payments)
+        self.bulk_create(FormOfPayment, payforms)
+        self.bulk_create(Order.payments.through, payment_links)
+        self.bulk_create(Order.form_of_payments.through, payform_links)
+
+    #  publicwork  ############################################################
+    def create_publicwork(self, center, mentor):
+        seekers = []
+        for number in range(self.counts["seekers"]):
+            name, city = self.fake.name(), self.fake.city()
+            seekers.append(
+                Seeker(
+                    center=center,
+                    name=name,
+                    name_sa=us_inter_char(name),
+                    short_name=short_name(name),
+                    birth=self.get_date(30000, 6000),
+                    gender=self.rand.choice(["M", "F"]),
+                    city=city,
+                    city_sa=us_inter_char(city),
+                    state=self.fake.estado_sigla(),
+                    email=f"seeker.{center.pk}.{number}@example.com",
+                    status=self.rand.choice(SEEKER_STATUS)[0],
+                    status_date=self.get_date(900),
+                    made_by=center.made_by,
+                )
+            )
+        self.bulk_create(Seeker, seekers)
+        seekers = list(Seeker.objects.filter(center=center))
+        self.bulk_create(
+            HistoricOfSeeker,
+            [
+                HistoricOfSeeker(
+                    seeker=seeker,
+                    occurrence=seeker.status,
+                    date=seeker.status_date,
+                    made_by=center.made_by,
+                )
+                for seeker in seekers
+            ],
+        )
+
+        self.bulk_create(
+            Lecture,
+            [
+                Lecture(
+                    center=center,
+                    type=self.rand.choice(LECTURE_TYPES)[0],
+                    theme=f"Lecture {number}",
+                    date=self.get_date(365),
+                    made_by=center.made_by,
+                )
+                for number in range(self.counts["lectures"])
+            ],
+        )
+        lectures = list(Lecture.objects.filter(center=center))
+        self.bulk_create(
+            Listener,
+            [
+                Listener(
+                    lecture=self.rand.choice(lectures),
+                    seeker=self.rand.choice(seekers),
+                )
+                for _ in range(self.get_count("listeners", lectures, seekers))
+            ],
+        )
+
+        self.bulk_create(
+            PublicworkGroup,
+            [
+                PublicworkGroup(
+                    name=f"Group {number}",
+                    center=center,
+                    made_by=center.made_by,
+                )
+                for number in range(self.counts["pw_groups"])
+            ],
+        )
+        groups = list(PublicworkGroup.objects.filter(center=center))
+        members = PublicworkGroup.members.through
+        mentors = PublicworkGroup.mentors.through
+        self.bulk_create(
+            members,
+            [
+                members(publicworkgroup_id=group.pk, seeker_id=seeker.pk)
+                for group in groups
+                for seeker in self.rand.sample(
+                    seekers, min(self.counts["pw_members"], len(seekers))
+                )
+            ],
+        )
+        self.bulk_create(
+            mentors,
+            [
+                mentors(publicworkgroup_id=group.pk, person_id=mentor.pk)
+                for group in groups
+            ],
+        )
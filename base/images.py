@@ -0,0 +1,124 @@
+"""
+the renditions of the uploaded images. an upload is only recorded on save:
+a background job (see base.jobs) makes its renditions once, with the name
+of each file taken from the hash of the content of the image, and until
+they are ready the pages show a placeholder. the original file is kept as
+it was uploaded.
+"""
+import hashlib
+
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.templatetags.static import static
+from PIL import Image, ImageOps
+
+from .jobs import enqueue
+from .models import ImageRendition
+
+# the largest side of each rendition
+RENDITIONS = {"thumbnail": 80, "list": 300, "detail": 800}
+# JPEG or WEBP
+IMAGE_FORMAT = settings.get("IMAGE_FORMAT", "JPEG").upper()
+IMAGE_QUALITY = settings.get("IMAGE_QUALITY", 85)
+# the quality of the grayscale renditions (the vouchers)
+GRAYSCALE_QUALITY = 50
+RENDITIONS_PATH = "renditions"
+PLACEHOLDER = "images/placeholder.png"
+# the images of each model that have renditions, and if in grayscale
+IMAGE_FIELDS = (
+    ("user.Profile", "image", False),
+    ("center.Center", "image", False),
+    ("center.Center", "pix_image", False),
+    ("treasury.FormOfPayment", "voucher_img", True),
+    ("publicwork.Seeker", "image", False),
+    ("publicwork.TempRegOfSeeker", "image", False),
+)
+
+
+def is_uploaded(file):
+    """an image sent by a user, not empty nor the default of its field."""
+    return bool(file) and file.name != file.field.default
+
+
+def request_renditions(file, grayscale=False):
+    """
+    record a new upload and make its renditions once the transaction is
+    committed, in a background job.
+    """
+    # the tasks import the models of the apps, that import this module
+    from .tasks import make_renditions
+
+    if not is_uploaded(file):
+        return None
+    rendition, _ = ImageRendition.objects.update_or_create(
+        source=file.name,
+        defaults=dict(
+            grayscale=grayscale, status="PND", digest="", files={}, error=""
+        ),
+    )
+    transaction.on_commit(lambda: enqueue(make_renditions, rendition.pk))
+    return rendition
+
+
+def render(rendition):
+    """make the files of the renditions, reusing them if already made."""
+    with default_storage.open(rendition.source, "rb") as _file:
+        content = _file.read()
+    digest = hashlib.sha256(content).hexdigest()
+    extension = "webp" if IMAGE_FORMAT == "WEBP" else "jpg"
+    suffix = "_gray" if rendition.grayscale else ""
+
+    files = {}
+    image = None
+    for name, size in RENDITIONS.items():
+        path = (
+            f"{RENDITIONS_PATH}/{digest[:2]}/"
+            f"{digest}_{name}{suffix}.{extension}"
+        )
+        if not default_storage.exists(path):
+            if image is None:
+                image = get_image(content, rendition.grayscale)
+            default_storage.save(
+                path, ContentFile(get_content(image, size, rendition))
+            )
+        files[name] = path
+
+    rendition.digest, rendition.files = digest, files
+    rendition.status, rendition.error = "DNE", ""
+    rendition.save()
+    return rendition
+
+
+def get_url(file, name="list"):
+    """the url of a rendition of file, or of a placeholder until it's made."""
+    if not file:
+        return static(PLACEHOLDER)
+    if not is_uploaded(file):
+        return file.url
+    files = (
+        ImageRendition.objects.filter(source=file.name, status="DNE")
+        .values_list("files", flat=True)
+        .first()
+    )
+    if not files or name not in files:
+        return static(PLACEHOLDER)
+    return default_storage.url(files[name])
+
+
+# helpers
+def get_image(content, grayscale=False):
+    image = ImageOps.exif_transpose(Image.open(BytesIO(content)))
+    return image.convert("L" if grayscale else "RGB")
+
+
+def get_content(image, size, rendition):
+    _image = image.copy()
+    _image.thumbnail((size, size))
+    quality = GRAYSCALE_QUALITY if rendition.grayscale else IMAGE_QUALITY
+    output = BytesIO()
+    _image.save(output, format=IMAGE_FORMAT, quality=quality)
+    return output.getvalue()
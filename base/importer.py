@@ -0,0 +1,499 @@
+"""
+the import of people as invitations, from the files made by SanitizeCsv.
+the file is read in chunks and the emails already used (by users or
+invitations) are read once, so each chunk is checked in memory and its
+invitations are inserted by one bulk_create, in a transaction. given an
+ImportRun, the state of the importer is saved with each chunk, and an
+interrupted import goes on from the last chunk saved. the state only keeps
+the counters: the rows to report are appended to the files of the import
+with each chunk, and read back at the end.
+"""
+import os
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+
+from person.models import Invitation, Person
+from person.name_index import bump_version
+from rcadmin.common import bump_count_version, sanitize_name
+from user.models import User
+
+from .models import ImportRun
+from .sanitize_to_import import get_digits, get_phones, get_valid_cpfs
+
+IMPORT_PATH = f"{os.path.dirname(settings.BASE_DIR)}/imports"
+ADDRESS = "https://rcadmin.rosacruzaurea.org.br"
+CHUNK_SIZE = 500
+OCCURRENCES = ["A1", "A2", "A3", "A4", "GR", "A5", "A6"]
+# what is kept in the checkpoints
+STATE = ["start", "done", "total", "written"]
+# the files written with each chunk
+WRITTEN = ["used_email", "to_send_email"]
+
+
+class PeopleImporter:
+    def __init__(
+        self,
+        center,
+        file_name,
+        path=None,
+        chunk_size=None,
+        on_chunk=None,
+        import_run=None,
+    ):
+        self.center = center
+        self.file_name = file_name
+        self.path = path or IMPORT_PATH
+        self.chunk_size = chunk_size or CHUNK_SIZE
+        # called after each chunk with the number of rows read
+        self.on_chunk = on_chunk
+        self.user = center.made_by
+        self.import_run = import_run
+
+        # rows of the file imported
+        self.done = 0
+        # rows written to the files of WRITTEN
+        self.written = dict.fromkeys(WRITTEN, 0)
+        # lists to report
+        self.total = 0
+        self.importeds = []
+        self.without_email = []
+        self.duplicate_email = []
+        self.used_email = []
+        self.to_send_email = []
+
+    def run(self):
+        rejecteds = self.read_rejecteds()
+        if self.import_run and self.import_run.state:
+            self.set_state(self.import_run.state)
+        else:
+            self.start = datetime.now()
+            self.total = rejecteds
+        # the rows written after the checkpoint are left out
+        self.trim_files()
+        self.used = set()
+        for model in (User, Invitation):
+            self.used.update(
+                model.objects.values_list("email", flat=True).iterator()
+            )
+
+        chunks = self.read_chunks(f"{self.file_name}.csv", skip=self.done)
+        for chunk in chunks:
+            self.import_chunk(self.prepare(chunk).to_dict("records"))
+            if self.on_chunk:
+                self.on_chunk(self.total)
+
+        self.used_email = self.read_written("used_email")
+        self.to_send_email = self.read_written("to_send_email")
+        self.importeds = [
+            f"{row['name']} - {row['email']}" for row in self.to_send_email
+        ]
+        self.write_report()
+        if self.import_run:
+            # the entry of the import in the history
+            self.save_state(
+                status="DNE",
+                entries=self.total,
+                importeds=len(self.importeds),
+                without_email=len(self.without_email),
+                duplicate_email=len(self.duplicate_email),
+                used_email=len(self.used_email),
+                duration=datetime.now() - self.start,
+            )
+        return self
+
+    def read_chunks(self, file, skip=0):
+        """the rows of file (in the import path), after skip, in frames."""
+        chunks = pd.read_csv(
+            f"{self.path}/{file}",
+            dtype=str,
+            keep_default_na=False,
+            chunksize=self.chunk_size,
+            skiprows=range(1, skip + 1),
+        )
+        yield from chunks
+
+    def get_state(self):
+        state = {name: getattr(self, name) for name in STATE}
+        state["start"] = self.start.isoformat()
+        return state
+
+    def set_state(self, state):
+        for name in STATE:
+            setattr(self, name, state[name])
+        self.start = datetime.fromisoformat(state["start"])
+
+    def save_state(self, **changes):
+        """the checkpoint of the import run, after the last chunk."""
+        self.import_run.rows = self.total
+        self.import_run.state = self.get_state()
+        for field, value in changes.items():
+            setattr(self.import_run, field, value)
+        self.import_run.save()
+
+    def get_file(self, kind):
+        return f"{self.path}/{kind}/{kind}__{self.file_name}.csv"
+
+    def trim_files(self):
+        """keep in the written files only the rows of the checkpoint."""
+        for kind, rows in self.written.items():
+            path = self.get_file(kind)
+            if not os.path.exists(path):
+                continue
+            if rows:
+                pd.read_csv(
+                    path, dtype=str, keep_default_na=False, nrows=rows
+                ).to_csv(path, encoding="utf-8", index=False)
+            else:
+                os.remove(path)
+
+    def append_rows(self, kind, rows):
+        if not rows:
+            return
+        pd.DataFrame(rows).to_csv(
+            self.get_file(kind),
+            mode="a",
+            header=not self.written[kind],
+            encoding="utf-8",
+            index=False,
+        )
+        self.written[kind] += len(rows)
+
+    def read_written(self, kind):
+        if not self.written[kind]:
+            return []
+        return pd.read_csv(
+            self.get_file(kind), dtype=str, keep_default_na=False
+        ).to_dict("records")
+
+    def read_rejecteds(self):
+        """the rows left out by SanitizeCsv, and how many they are."""
+        rejecteds = 0
+        for kind in ("without_email", "duplicate_email"):
+            file = f"{kind}/{kind}__{self.file_name}.csv"
+            if not os.path.exists(f"{self.path}/{file}"):
+                continue
+            for chunk in self.read_chunks(file):
+                rows = chunk.to_dict("records")
+                if kind == "without_email":
+                    self.without_email += [row["name"] for row in rows]
+                else:
+                    self.duplicate_email += [
+                        f"{row['name']} - {row['email']}" for row in rows
+                    ]
+                rejecteds += len(rows)
+        return rejecteds
+
+    def prepare(self, chunk):
+        """
+        the formats of the rows, done at once for the chunk, in new columns
+        (the rows not imported are written as read).
+        """
+        blanks = pd.Series("", index=chunk.index)
+        cpfs, id_cards = chunk.get("cpf", blanks), chunk.get("id_card", blanks)
+        chunk["_id_card"] = np.where(
+            get_valid_cpfs(cpfs),
+            get_digits(cpfs).str.replace(
+                r"(\d{3})(\d{3})(\d{3})(\d{2})", r"\1.\2.\3-\4", regex=True
+            ),
+            id_cards.where(id_cards.str.len() > 3, None),
+        )
+        phones = chunk["cell_phone"].str.strip()
+        chunk["_phone"] = get_phones(
+            phones.where(phones != "", chunk["phone"].str.strip())
+        )
+        chunk["_state"] = chunk["state"].str.upper()
+        return chunk
+
+    def import_chunk(self, rows):
+        invitations, used_email = [], []
+        for row in rows:
+            self.total += 1
+            # checking if email is used by a user or an invitation
+            if row["email"] in self.used:
+                used_email.append(
+                    {k: v for k, v in row.items() if not k.startswith("_")}
+                )
+                continue
+            self.used.add(row["email"])
+            invitations.append(self.get_invitation(row))
+
+        to_send_email = [
+            {
+                "name": invite.name,
+                "email": invite.email,
+                "link": "{}{}".format(
+                    ADDRESS,
+                    reverse("confirm_invitation", args=[invite.pk]),
+                ),
+            }
+            for invite in invitations
+        ]
+        self.done += len(rows)
+
+        with transaction.atomic():
+            Invitation.objects.bulk_create(invitations)
+            # written before the checkpoint, trimmed if it is not saved
+            self.append_rows("used_email", used_email)
+            self.append_rows("to_send_email", to_send_email)
+            if self.import_run:
+                self.save_state()
+
+    def get_invitation(self, row):
+        invite = Invitation(
+            center=self.center,
+            name=sanitize_name(row["name"]),
+            email=row["email"],
+            migration=True,
+            birth=row["birth"] or None,
+            gender=row["gender"],
+            address=row["address"],
+            number=row["number"],
+            complement=row["complement"],
+            district=row["district"],
+            city=row["city"],
+            state=row["_state"],
+            country=self.center.country,
+            zip_code=row["zip"].strip(),
+            phone=row["_phone"],
+            sos_contact=sanitize_name(row["sos_contact"]),
+            sos_phone=row["sos_phone"].strip(),
+            id_card=row["_id_card"],
+        )
+
+        # list of occurrences
+        invite.historic = {
+            occurrence: row[occurrence]
+            for occurrence in OCCURRENCES
+            if row.get(occurrence)
+        }
+
+        # observations
+        if row.get("obs"):
+            invite.observations = f"| {row['obs']} "
+        if row.get("obs2"):
+            invite.observations += f"| {row['obs2']} "
+
+        # import retrog
+        if row.get("from"):
+            invite.observations += "| Retrog. {} -> {} in {} ".format(
+                row["from"], row["to"], row["date"]
+            )
+        return fit_to_fields(invite)
+
+    def write_report(self):
+        report_path = f"{self.path}/reports/{self.file_name}__report.txt"
+        with open(report_path, "w") as report:
+            report.write("  IMPORT PEOPLE  ".center(80, "*"))
+            report.write(f"\n\ncenter:      {self.center}")
+            report.write(f"\nfile:        {self.file_name}.csv")
+            report.write(f"\nimported_by: {self.user}")
+            report.write(
+                "\nimported_on: {}".format(
+                    self.start.strftime("%Y-%m-%d %H:%M:%S.%f")
+                )
+            )
+            report.write(f"\ntime:        {datetime.now() - self.start}")
+            report.write("\n\n")
+            report.write("  SUMMARY  ".center(80, "*"))
+            report.write(f"\n\n- ENTRIES:         {self.total}")
+            report.write(f"\n- IMPORTEDS:       {len(self.importeds)}")
+            report.write(f"\n- WITHOUT_EMAIL:   {len(self.without_email)}")
+            report.write(f"\n- DUPLICATE_EMAIL: {len(self.duplicate_email)}")
+            report.write(f"\n- USED_EMAIL:      {len(self.used_email)}")
+            report.write("\n\n")
+            report.write("  DETAIL  ".center(80, "*"))
+            for title, items in (
+                ("IMPORTEDS", self.importeds),
+                ("WITHOUT EMAIL", self.without_email),
+                ("DUPLICATE EMAIL", self.duplicate_email),
+                (
+                    "USED_EMAIL",
+                    [
+                        f"{sanitize_name(item['name'])} - {item['email']}"
+                        for item in self.used_email
+                    ],
+                ),
+            ):
+                if items:
+                    report.write(f"\n\n{title}:")
+                    for n, item in enumerate(items):
+                        report.write(f"\n  {n + 1} - {item}")
+
+
+class PeopleToSignLgpd:
+    """
+    moves the active people of a center to invitations, to sign the LGPD
+    again: the people (with their users and profiles) are read by one query,
+    the invitations are inserted by one bulk_create and the people and their
+    users are deactivated by two updates, all in one transaction.
+    """
+
+    def __init__(self, center, name, path=None):
+        self.center = center
+        # the name given to the files of the center
+        self.name = name
+        self.path = path or IMPORT_PATH
+        self.user = center.made_by
+
+        # lists to report
+        self.people_to_sign_lgpd = []
+        self.already_in_db = []
+        self.to_send_email = []
+
+    def run(self, dry_run=False):
+        """with dry_run, only counts the people (nothing is written)."""
+        start = datetime.now()
+        persons = list(
+            self.center.person_set.filter(is_active=True).select_related(
+                "user__profile"
+            )
+        )
+        invited = set(
+            Invitation.objects.filter(
+                email__in=[person.user.email for person in persons]
+            ).values_list("email", flat=True)
+        )
+
+        invitations, moved = [], []
+        for person in persons:
+            if person.user.email in invited:
+                self.already_in_db.append(
+                    f"{person.name} - {person.user.email}"
+                )
+                continue
+            invitations.append(self.get_invitation(person))
+            moved.append(person)
+        self.people_to_sign_lgpd = [
+            f"{invite.name} - {invite.email}" for invite in invitations
+        ]
+        if dry_run:
+            return self
+
+        with transaction.atomic():
+            Invitation.objects.bulk_create(invitations)
+            Person.objects.filter(pk__in=[p.pk for p in moved]).update(
+                is_active=False
+            )
+            User.objects.filter(pk__in=[p.user_id for p in moved]).update(
+                is_active=False
+            )
+            # the entry of the import in the history
+            ImportRun.objects.create(
+                center=self.center,
+                kind="LGP",
+                file_name=self.name,
+                status="DNE",
+                entries=len(persons),
+                rows=len(persons),
+                importeds=len(invitations),
+                used_email=len(self.already_in_db),
+                duration=datetime.now() - start,
+                made_by=self.user,
+            )
+        # the people deactivated leave the name index and the counts
+        bump_version(self.center.pk)
+        bump_count_version(Person, self.center.pk)
+
+        self.to_send_email = [
+            {
+                "name": invite.name,
+                "email": invite.email,
+                "link": "{}{}".format(
+                    ADDRESS, reverse("confirm_invitation", args=[invite.pk])
+                ),
+            }
+            for invite in invitations
+        ]
+        self.write_files()
+        self.write_report(start)
+        return self
+
+    def get_invitation(self, person):
+        profile = person.user.profile
+        invite = Invitation(
+            center=self.center,
+            name=person.name,
+            birth=person.birth,
+            gender=profile.gender,
+            id_card=person.id_card,
+            address=profile.address,
+            number=profile.number,
+            complement=profile.complement,
+            district=profile.district,
+            city=profile.city,
+            state=profile.state,
+            country=profile.country,
+            zip_code=profile.zip_code,
+            phone=profile.phone,
+            email=person.user.email,
+            sos_contact=profile.sos_contact,
+            sos_phone=profile.sos_phone,
+            historic={str(person.aspect): str(person.aspect)},
+            observations=person.observations,
+            migration=True,
+            sign_lgpd=True,
+        )
+        invite.adjust_fields()
+        return fit_to_fields(invite)
+
+    def write_files(self):
+        # write to_send_email .csv file
+        if self.to_send_email:
+            pd.DataFrame(self.to_send_email).to_csv(
+                "{}/to_send_email/to_send_email__{}__to_sign_lgpd.csv".format(
+                    self.path, self.name
+                ),
+                encoding="utf-8",
+                index=False,
+            )
+
+    def write_report(self, start):
+        report_path = "{}/reports/{}_to_sign_lgpd__report.txt".format(
+            self.path, self.name
+        )
+        with open(report_path, "w") as report:
+            report.write("  PEOPLE TO SIGN LGPD  ".center(80, "*"))
+            report.write(f"\n\ncenter:      {self.center}")
+            report.write(f"\nimported_by: {self.user}")
+            report.write(
+                "\nimported_on: {}".format(
+                    start.strftime("%Y-%m-%d %H:%M:%S.%f")
+                )
+            )
+            report.write(f"\ntime:        {datetime.now() - start}")
+            report.write("\n\n")
+            report.write("  SUMMARY  ".center(80, "*"))
+            report.write(f"\n\n- ALREADY IN DB:   {len(self.already_in_db)}")
+            report.write(
+                f"\n- IMPORTEDS:       {len(self.people_to_sign_lgpd)}"
+            )
+            report.write("\n\n")
+            report.write("  DETAIL  ".center(80, "*"))
+            for title, items in (
+                ("ALREADY IN DB", self.already_in_db),
+                ("IMPORTEDS", self.people_to_sign_lgpd),
+            ):
+                if items:
+                    report.write(f"\n\n{title}:")
+                    for n, item in enumerate(items):
+                        report.write(f"\n  {n + 1} - {item}")
+
+
+# helpers
+def fit_to_fields(obj):
+    """
+    cut the texts of obj to the max_length of their fields: one row too
+    long would abort the insert of the whole chunk.
+    """
+    for field in obj._meta.concrete_fields:
+        value = getattr(obj, field.attname)
+        if field.max_length and isinstance(value, str):
+            setattr(obj, field.attname, value[: field.max_length])
+    return obj
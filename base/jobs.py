@@ -0,0 +1,105 @@
+"""
+background jobs, kept in the Job table and run by the run_jobs command, so
+the long tasks leave the request. a task is a function registered with
+@task, in the tasks.py of an app: it receives the job (to report its
+progress) and the arguments given to enqueue, and what it returns (json)
+is kept as the result of the job.
+"""
+import logging
+import os
+import socket
+import time
+import traceback
+
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import Job
+
+# seconds before the first retry, doubled on each attempt
+RETRY_DELAY = 30
+# seconds after which a running job is taken as lost by its worker
+STALE_TIMEOUT = 60 * 60
+
+TASKS = {}
+
+logger = logging.getLogger(__name__)
+
+
+def task(name=None, max_attempts=3):
+    def register(func):
+        func.job_name = name or f"{func.__module__}.{func.__name__}"
+        func.max_attempts = max_attempts
+        TASKS[func.job_name] = func
+        return func
+
+    return register
+
+
+def enqueue(func, *args, made_by=None, run_after=None, **kwargs):
+    return Job.objects.enqueue(
+        func.job_name,
+        *args,
+        made_by=made_by,
+        run_after=run_after,
+        max_attempts=func.max_attempts,
+        **kwargs,
+    )
+
+
+def run_job(job):
+    """runs a claimed job, and schedules its retry when it fails."""
+    func = TASKS.get(job.name)
+    try:
+        if func is None:
+            raise LookupError(f"unknown task: {job.name}")
+        result = func(job, *job.args, **job.kwargs)
+    except Exception:
+        logger.exception("job %s failed", job)
+        changes = dict(error=traceback.format_exc(), status="ERR")
+        if job.attempts < job.max_attempts:
+            delay = RETRY_DELAY * 2 ** (job.attempts - 1)
+            changes.update(
+                status="PND",
+                run_after=timezone.now() + timedelta(seconds=delay),
+            )
+        finish(job, **changes)
+        return False
+
+    finish(job, status="DNE", progress=100, result=result, error="")
+    return True
+
+
+def finish(job, **changes):
+    for field, value in changes.items():
+        setattr(job, field, value)
+    job.locked_by, job.locked_on = "", None
+    job.save()
+
+
+class Worker:
+    def __init__(self, sleep=2, burst=False, max_jobs=None):
+        self.sleep = sleep
+        self.burst = burst
+        self.max_jobs = max_jobs
+
+    def run(self):
+        """
+        runs the pending jobs, waiting for new ones, or until the queue
+        is empty in burst mode. returns the number of jobs run.
+        """
+        name = f"{socket.gethostname()}:{os.getpid()}"
+        done = 0
+        while not self.max_jobs or done < self.max_jobs:
+            close_old_connections()
+            job = Job.objects.claim(name)
+            if job is None:
+                if self.burst:
+                    break
+                time.sleep(self.sleep)
+                continue
+            run_job(job)
+            done += 1
+        return done
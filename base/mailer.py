@@ -0,0 +1,195 @@
+"""
+the outbox: the emails are kept in the Email table and sent by the
+send_emails command, so a page never waits for the mail server and the
+failed emails are tried again. the sender takes the emails in batches,
+renders them only then, sends each batch through one connection and keeps
+the rate allowed by the mail server.
+"""
+import logging
+import os
+import socket
+import time
+import traceback
+
+from datetime import timedelta
+
+import pandas as pd
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import close_old_connections
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from rcadmin.common import GRC
+
+from .models import Email
+
+NO_REPLY = "no-reply@rosacruzaurea.org.br"
+# emails sent through each connection
+EMAIL_BATCH_SIZE = settings.get("EMAIL_BATCH_SIZE", 50)
+# emails sent per second (0 is no limit)
+EMAIL_RATE = settings.get("EMAIL_RATE", 0)
+# seconds before the first retry, doubled on each attempt
+RETRY_DELAY = 60
+# seconds after which an email being sent is taken as lost by its sender
+STALE_TIMEOUT = 15 * 60
+
+logger = logging.getLogger(__name__)
+
+
+def send_email(
+    body_text,
+    body_html,
+    _subject,
+    _to,
+    _from=NO_REPLY,
+    _context={},
+    batch="",
+):
+    """put the email in the outbox."""
+    return Email.objects.queue(
+        to=_to,
+        subject=f"{GRC} - {_subject}",
+        body_text=body_text,
+        body_html=body_html,
+        from_email=_from,
+        context=_context,
+        batch=batch,
+    )
+
+
+def send_csv_emails(path, body_text, body_html, _subject, _from=NO_REPLY):
+    """
+    put in the outbox an email to each row of the .csv of path (as the
+    to_send_email files of the imports), with the row as context. the emails
+    are queued once: returns 0 when the file was queued before.
+    """
+    batch = os.path.basename(path)
+    if Email.objects.filter(batch=batch).exists():
+        return 0
+
+    frame = pd.read_csv(path, dtype=str).fillna("")
+    emails = Email.objects.queue_many(
+        dict(
+            to=row["email"],
+            subject=f"{GRC} - {_subject}",
+            body_text=body_text,
+            body_html=body_html,
+            from_email=_from,
+            context=row,
+            batch=batch,
+        )
+        for row in frame.to_dict("records")
+        if row.get("email")
+    )
+    return len(emails)
+
+
+def send_batch(sender, batch_size=None, throttle=None):
+    """
+    send a batch of the outbox through one connection, keeping the rate of
+    throttle (shared by the batches of a run). returns the number of emails
+    taken from the outbox.
+    """
+    emails = Email.objects.claim(sender, batch_size or EMAIL_BATCH_SIZE)
+    if not emails:
+        return 0
+
+    throttle = throttle or Throttle(EMAIL_RATE)
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception:
+        logger.exception("the mail server is out")
+        for email in emails:
+            retry(email)
+        return len(emails)
+
+    try:
+        for email in emails:
+            throttle.wait()
+            try:
+                connection.send_messages([get_message(email, connection)])
+            except Exception:
+                logger.exception("email %s failed", email.pk)
+                retry(email)
+            else:
+                finish(email, status="SNT", sent_on=timezone.now(), error="")
+    finally:
+        connection.close()
+    return len(emails)
+
+
+def get_message(email, connection=None):
+    """the message of email, rendered with its context."""
+    context = email.get_context()
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=render_to_string(email.body_text, context),
+        from_email=email.from_email,
+        to=[email.to],
+        connection=connection,
+    )
+    message.attach_alternative(
+        render_to_string(email.body_html, context), "text/html"
+    )
+    return message
+
+
+def retry(email):
+    """schedule email again, until it reaches its max attempts."""
+    changes = dict(error=traceback.format_exc(), status="ERR")
+    if email.attempts < email.max_attempts:
+        delay = RETRY_DELAY * 2 ** (email.attempts - 1)
+        changes.update(
+            status="PND",
+            send_after=timezone.now() + timedelta(seconds=delay),
+        )
+    finish(email, **changes)
+
+
+def finish(email, **changes):
+    changes.update(locked_by="", locked_on=None)
+    Email.objects.filter(pk=email.pk).update(**changes)
+
+
+class Throttle:
+    """keeps the calls of wait to rate per second."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.last = None
+
+    def wait(self):
+        if self.interval and self.last is not None:
+            pause = self.last + self.interval - time.monotonic()
+            if pause > 0:
+                time.sleep(pause)
+        self.last = time.monotonic()
+
+
+class Sender:
+    def __init__(self, sleep=5, burst=False, batch_size=None, rate=None):
+        self.sleep = sleep
+        self.burst = burst
+        self.batch_size = batch_size
+        self.rate = rate
+
+    def run(self):
+        """
+        send the outbox, waiting for new emails, or until it is empty in
+        burst mode. returns the number of emails taken from the outbox.
+        """
+        name = f"{socket.gethostname()}:{os.getpid()}"
+        throttle = Throttle(EMAIL_RATE if self.rate is None else self.rate)
+        done = 0
+        while True:
+            close_old_connections()
+            taken = send_batch(name, self.batch_size, throttle)
+            if not taken:
+                if self.burst:
+                    break
+                time.sleep(self.sleep)
+            done += taken
+        return done
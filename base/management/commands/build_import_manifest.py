@@ -0,0 +1,86 @@
+import os
+import re
+
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from base.importer import IMPORT_PATH
+from base.models import ImportRun
+from center.models import Center
+from user.models import User
+
+# header of each data imported
+DATA = ("center", "file", "imported_", "time", "- ")
+
+
+class Command(BaseCommand):
+    help = (
+        "Add to the import history the imports made before it, from their "
+        "report files."
+    )
+
+    def handle(self, *args, **options):
+        centers = {str(center): center for center in Center.objects.all()}
+        reports = {run.report for run in ImportRun.objects.all()}
+
+        added = 0
+        for file in sorted(os.listdir(f"{IMPORT_PATH}/reports")):
+            if not file.endswith("__report.txt") or file in reports:
+                continue
+            entry = get_entry(f"{IMPORT_PATH}/reports/{file}")
+            center = centers.get(entry.get("center"))
+            if center is None:
+                self.stdout.write(f"{file}: center not found")
+                continue
+
+            lgpd = file.endswith("_to_sign_lgpd__report.txt")
+            import_run = ImportRun.objects.create(
+                center=center,
+                kind="LGP" if lgpd else "IMP",
+                file_name=file.split("_to_sign_lgpd__" if lgpd else "__")[0],
+                status="DNE",
+                entries=entry.get("entries", entry.get("importeds", 0)),
+                importeds=entry.get("importeds", 0),
+                without_email=entry.get("without_email", 0),
+                duplicate_email=entry.get("duplicate_email", 0),
+                used_email=entry.get("used_email", entry.get("already", 0)),
+                duration=entry.get("time"),
+                made_by=User.objects.filter(
+                    email=entry.get("imported_by")
+                ).first(),
+            )
+            if entry.get("imported_on"):
+                ImportRun.objects.filter(pk=import_run.pk).update(
+                    created_on=timezone.make_aware(entry["imported_on"])
+                )
+            added += 1
+
+        self.stdout.write(self.style.SUCCESS(f"{added} imports added"))
+
+
+# helpers
+def get_entry(path):
+    """the header and the summary of a report file."""
+    entry = {}
+    with open(path, "r") as _file:
+        for line in _file.readlines():
+            if not line.startswith(DATA) or ": " not in line:
+                continue
+            _line = line.split(": ")
+            _key = re.findall(r"\w+", _line[0].lower())[0]
+            _value = _line[1].strip()
+            if _key == "imported_on":
+                _value = datetime.strptime(_value, "%Y-%m-%d %H:%M:%S.%f")
+            elif _key == "time":
+                hours, minutes, seconds = _value.split(":")
+                _value = timedelta(
+                    hours=int(hours),
+                    minutes=int(minutes),
+                    seconds=float(seconds),
+                )
+            elif _value.isdigit():
+                _value = int(_value)
+            entry[_key] = _value
+    return entry
@@ -0,0 +1,28 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from base.images import IMAGE_FIELDS, request_renditions
+from base.models import ImageRendition
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue the renditions (see base.images) of the images uploaded "
+        "before them."
+    )
+
+    def handle(self, *args, **options):
+        done = set(ImageRendition.objects.values_list("source", flat=True))
+
+        queued = 0
+        for model_name, field, grayscale in IMAGE_FIELDS:
+            model = apps.get_model(model_name)
+            for obj in model.objects.only("pk", field).iterator():
+                file = getattr(obj, field)
+                if file.name in done:
+                    continue
+                if request_renditions(file, grayscale=grayscale):
+                    done.add(file.name)
+                    queued += 1
+
+        self.stdout.write(self.style.SUCCESS(f"{queued} images queued"))
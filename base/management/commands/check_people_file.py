@@ -0,0 +1,45 @@
+import os
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from base.sanitize_to_import import SanitizeCsv
+
+
+class Command(BaseCommand):
+    help = (
+        "Check the rows of a .csv of people before it is imported, with a "
+        "pool of processes for the big files (the upload checks them in "
+        "the process of the request)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help="the .csv file to check")
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="processes of the pool (default: one by cpu)",
+        )
+
+    def handle(self, *args, **options):
+        path = os.path.abspath(options["file"])
+        with open(path, "rb") as _file:
+            sf = SanitizeCsv(
+                file=File(_file, name=os.path.basename(path)),
+                path=os.path.dirname(path),
+                processes=options["processes"],
+            )
+        if sf.df is False:
+            raise CommandError(f"{path} is inconsistent!")
+
+        if sf.errors.empty:
+            self.stdout.write(self.style.SUCCESS("no rows with errors"))
+            return
+        sf.generate_errors()
+        levels = sf.errors.groupby("level").line.nunique()
+        self.stdout.write(
+            f"{levels.get('error', 0)} rows with errors and "
+            f"{levels.get('warning', 0)} with warnings, see "
+            f"{sf.path}/errors/errors__{sf.file}"
+        )
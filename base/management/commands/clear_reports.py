@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from base.report_store import REPORT_TTL, clear_reports
+
+
+class Command(BaseCommand):
+    help = (
+        f"Remove the report files older than REPORT_TTL ({REPORT_TTL}s), "
+        "to be run periodically (cron)."
+    )
+
+    def handle(self, *args, **options):
+        removed = clear_reports()
+        self.stdout.write(
+            self.style.SUCCESS(f"{removed} expired report files removed")
+        )
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from base.dataset import DEFAULT_COUNTS, DatasetGenerator
+
+
+class Command(BaseCommand):
+    help = "Generate centers with synthetic data in large volumes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--centers", type=int, default=1, help="number of centers"
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="the same seed generates the same data",
+        )
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1,
+            help="multiply the default counts",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        for name, count in DEFAULT_COUNTS.items():
+            parser.add_argument(
+                f"--{name.replace('_', '-')}",
+                type=int,
+                help=f"{name} per center (default: {count})",
+            )
+
+    def handle(self, *args, **options):
+        generator = DatasetGenerator(
+            seed=options["seed"],
+            scale=options["scale"],
+            batch_size=options["batch_size"],
+            **{name: options[name] for name in DEFAULT_COUNTS},
+        )
+        for name, count in generator.counts.items():
+            self.stdout.write(f"{name}: {count} per center")
+
+        with transaction.atomic():
+            centers = generator.generate(options["centers"])
+
+        for center in centers:
+            self.stdout.write(
+                self.style.SUCCESS(f"center created: {center} ({center.pk})")
+            )
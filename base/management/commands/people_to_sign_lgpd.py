@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from base.importer import PeopleToSignLgpd
+from center.models import Center
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the active people of the centers to invitations, to sign the "
+        "LGPD again (each center in one transaction)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "centers",
+            nargs="+",
+            help="names (or part of the names) of the centers",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="only count the people of each center",
+        )
+
+    def handle(self, *args, **options):
+        for name in options["centers"]:
+            center = Center.objects.filter(name__icontains=name).first()
+            if center is None:
+                self.stderr.write(f"{name}: center not found")
+                continue
+
+            done = PeopleToSignLgpd(center, name).run(options["dry_run"])
+            message = "{}: {} people to sign lgpd, {} already in db".format(
+                center,
+                len(done.people_to_sign_lgpd),
+                len(done.already_in_db),
+            )
+            if options["dry_run"]:
+                self.stdout.write(f"{message} (dry run)")
+            else:
+                self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from base.models import use_trigram_index
+from person.models import Person, PersonNameToken
+from publicwork.models import Seeker, SeekerNameToken
+
+
+class Command(BaseCommand):
+    help = "Rebuild the name tokens used by the person and seeker searchs."
+
+    def handle(self, *args, **options):
+        if use_trigram_index():
+            self.stdout.write("names are searched by the pg_trgm indexes.")
+            return
+        with transaction.atomic():
+            PersonNameToken.objects.rebuild(Person.objects.all(), "name_sa")
+            SeekerNameToken.objects.rebuild(
+                Seeker.objects.all(), "name_sa", "city_sa"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "search index rebuilt: "
+                f"{PersonNameToken.objects.count()} person tokens, "
+                f"{SeekerNameToken.objects.count()} seeker tokens"
+            )
+        )
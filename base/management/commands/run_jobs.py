@@ -0,0 +1,61 @@
+import multiprocessing
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from base.jobs import STALE_TIMEOUT, Worker
+from base.models import Job
+
+
+def run_worker(sleep, burst):
+    Worker(sleep=sleep, burst=burst).run()
+
+
+class Command(BaseCommand):
+    help = "Run the background jobs (see base.jobs) with worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="number of worker processes",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=2,
+            help="seconds to wait when the queue is empty",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="stop when the queue is empty",
+        )
+
+    def handle(self, *args, **options):
+        requeued = Job.objects.requeue_stale(STALE_TIMEOUT)
+        if requeued:
+            self.stdout.write(f"{requeued} stale jobs back to the queue")
+
+        if options["processes"] == 1:
+            done = Worker(options["sleep"], options["burst"]).run()
+            self.stdout.write(self.style.SUCCESS(f"{done} jobs run"))
+            return
+
+        # the forked workers must open their own connections
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(
+                target=run_worker, args=(options["sleep"], options["burst"])
+            )
+            for _ in range(options["processes"])
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(workers)} workers finished")
+        )
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from base.mailer import STALE_TIMEOUT, Sender
+from base.models import Email
+
+
+class Command(BaseCommand):
+    help = "Send the emails of the outbox (see base.mailer)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=5,
+            help="seconds to wait when the outbox is empty",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="stop when the outbox is empty",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="emails sent through each connection",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            help="emails sent per second (0 is no limit)",
+        )
+
+    def handle(self, *args, **options):
+        requeued = Email.objects.requeue_stale(STALE_TIMEOUT)
+        if requeued:
+            self.stdout.write(f"{requeued} stale emails back to the outbox")
+
+        done = Sender(
+            sleep=options["sleep"],
+            burst=options["burst"],
+            batch_size=options["batch_size"],
+            rate=options["rate"],
+        ).run()
+        self.stdout.write(
+            self.style.SUCCESS(f"{done} emails taken from the outbox")
+        )
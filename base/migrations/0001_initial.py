@@ -0,0 +1,49 @@
+# Generated by Django 3.2.16 on 2026-10-18 10:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='name')),
+                ('args', jsonfield.fields.JSONField(blank=True, default=list)),
+                ('kwargs', jsonfield.fields.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('PND', 'pending'), ('RUN', 'running'), ('DNE', 'done'), ('ERR', 'failed')], default='PND', max_length=3, verbose_name='status')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='attempts')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3, verbose_name='max attempts')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='run after')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='locked by')),
+                ('locked_on', models.DateTimeField(blank=True, null=True, verbose_name='locked on')),
+                ('progress', models.PositiveSmallIntegerField(default=0, verbose_name='progress')),
+                ('message', models.CharField(blank=True, max_length=200, verbose_name='message')),
+                ('result', jsonfield.fields.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, verbose_name='error')),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('modified_on', models.DateTimeField(auto_now=True)),
+                ('made_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_job', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'job',
+                'verbose_name_plural': 'jobs',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'run_after'], name='base_job_status_2e68f3_idx'),
+        ),
+    ]
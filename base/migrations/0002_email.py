@@ -0,0 +1,49 @@
+# Generated by Django 3.2.16 on 2026-10-18 10:11
+
+from django.db import migrations, models
+import django.utils.timezone
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Email',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('to', models.EmailField(max_length=254, verbose_name='to')),
+                ('subject', models.CharField(max_length=200, verbose_name='subject')),
+                ('body_text', models.CharField(max_length=200, verbose_name='text template')),
+                ('body_html', models.CharField(max_length=200, verbose_name='html template')),
+                ('from_email', models.EmailField(max_length=254, verbose_name='from')),
+                ('context', jsonfield.fields.JSONField(blank=True, default=dict)),
+                ('batch', models.CharField(blank=True, max_length=200, verbose_name='batch')),
+                ('status', models.CharField(choices=[('PND', 'pending'), ('SND', 'sending'), ('SNT', 'sent'), ('ERR', 'failed')], default='PND', max_length=3, verbose_name='status')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='attempts')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=5, verbose_name='max attempts')),
+                ('send_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='send after')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='locked by')),
+                ('locked_on', models.DateTimeField(blank=True, null=True, verbose_name='locked on')),
+                ('sent_on', models.DateTimeField(blank=True, null=True, verbose_name='sent on')),
+                ('error', models.TextField(blank=True, verbose_name='error')),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'email',
+                'verbose_name_plural': 'emails',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='email',
+            index=models.Index(fields=['status', 'send_after'], name='base_email_status_c591ff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='email',
+            index=models.Index(fields=['batch'], name='base_email_batch_0d5740_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.16 on 2026-10-18 10:22
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('center', '0012_center_name_trgm'),
+        ('base', '0002_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_name', models.CharField(max_length=200, verbose_name='file')),
+                ('status', models.CharField(choices=[('PND', 'pending'), ('RUN', 'running'), ('DNE', 'done'), ('ERR', 'failed')], default='PND', max_length=3, verbose_name='status')),
+                ('entries', models.PositiveIntegerField(default=0, verbose_name='entries')),
+                ('rows', models.PositiveIntegerField(default=0, verbose_name='rows')),
+                ('state', jsonfield.fields.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True, verbose_name='error')),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('modified_on', models.DateTimeField(auto_now=True)),
+                ('center', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='center.center', verbose_name='center')),
+                ('made_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_import_run', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'import',
+                'verbose_name_plural': 'imports',
+                'ordering': ['-created_on'],
+            },
+        ),
+    ]
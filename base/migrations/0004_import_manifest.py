@@ -0,0 +1,48 @@
+# Generated by Django 3.2.16 on 2026-10-18 10:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0003_importrun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importrun',
+            name='duplicate_email',
+            field=models.PositiveIntegerField(default=0, verbose_name='duplicate email'),
+        ),
+        migrations.AddField(
+            model_name='importrun',
+            name='duration',
+            field=models.DurationField(blank=True, null=True, verbose_name='duration'),
+        ),
+        migrations.AddField(
+            model_name='importrun',
+            name='file_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='file hash'),
+        ),
+        migrations.AddField(
+            model_name='importrun',
+            name='importeds',
+            field=models.PositiveIntegerField(default=0, verbose_name='importeds'),
+        ),
+        migrations.AddField(
+            model_name='importrun',
+            name='kind',
+            field=models.CharField(choices=[('IMP', 'import'), ('LGP', 'to sign lgpd')], default='IMP', max_length=3, verbose_name='kind'),
+        ),
+        migrations.AddField(
+            model_name='importrun',
+            name='used_email',
+            field=models.PositiveIntegerField(default=0, verbose_name='used email'),
+        ),
+        migrations.AddField(
+            model_name='importrun',
+            name='without_email',
+            field=models.PositiveIntegerField(default=0, verbose_name='without email'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.16 on 2026-10-18 10:40
+
+from django.db import migrations, models
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0004_import_manifest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageRendition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=255, unique=True, verbose_name='source')),
+                ('digest', models.CharField(blank=True, db_index=True, max_length=64, verbose_name='digest')),
+                ('grayscale', models.BooleanField(default=False, verbose_name='grayscale')),
+                ('status', models.CharField(choices=[('PND', 'pending'), ('RUN', 'running'), ('DNE', 'done'), ('ERR', 'failed')], default='PND', max_length=3, verbose_name='status')),
+                ('files', jsonfield.fields.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True, verbose_name='error')),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('modified_on', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'image rendition',
+                'verbose_name_plural': 'image renditions',
+            },
+        ),
+    ]
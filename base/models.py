@@ -1,3 +1,504 @@
-from django.db import models
+from datetime import timedelta
 
-# Create your models here.
+from django.conf import settings
+from django.apps import apps
+from django.db import connection, models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from jsonfield import JSONField
+
+from rcadmin.common import EMAIL_STATUS, IMPORT_KINDS, JOB_STATUS, get_tokens
+
+
+def use_trigram_index():
+    """on PostgreSQL the names are searched through pg_trgm indexes."""
+    return connection.vendor == "postgresql"
+
+
+class CenterScopedQuerySet(models.QuerySet):
+    def owned_by(self, request):
+        """the objects of the center of the user, or all to a superuser."""
+        if request.user.is_superuser:
+            return self
+        return self.filter(center=request.user.person.center_id)
+
+
+class NameTokenManager(models.Manager):
+    def sync(self, obj, **fields):
+        """rewrite the tokens of the given fields of obj."""
+        if use_trigram_index():
+            return
+        owner = self.model.owner_field
+        self.filter(**{owner: obj}).delete()
+        self.bulk_create(
+            [
+                self.model(**{owner: obj}, field=field, token=token[:50])
+                for field, value in fields.items()
+                for token in get_tokens(value)
+            ]
+        )
+
+    def rebuild(self, queryset, *fields):
+        """rewrite the tokens of every object of queryset."""
+        self.all().delete()
+        self.insert(queryset, *fields)
+
+    def insert(self, queryset, *fields):
+        """add the tokens of the objects of queryset."""
+        if use_trigram_index():
+            return
+        owner = f"{self.model.owner_field}_id"
+        rows = queryset.values_list("pk", *fields).iterator()
+        self.bulk_create(
+            (
+                self.model(**{owner: row[0]}, field=field, token=token[:50])
+                for row in rows
+                for field, value in zip(fields, row[1:])
+                for token in get_tokens(value)
+            ),
+            batch_size=1000,
+        )
+
+    def get_query(self, field, term, prefix=""):
+        """every word of term must be the start of a word of the field."""
+        query = Q()
+        for word in get_tokens(term):
+            if use_trigram_index():
+                _query = Q(**{f"{prefix}{field}__iregex": rf"\m{word}"})
+            else:
+                tokens = self.filter(
+                    field=field, token__gte=word, token__lt=f"{word}\uffff"
+                ).values(self.model.owner_field)
+                _query = Q(**{f"{prefix}pk__in": tokens})
+            query.add(_query, Q.AND)
+        return query
+
+
+class NameToken(models.Model):
+    """
+    a normalized word of a searchable field. it is the portable fallback of
+    the pg_trgm indexes: a word is found by the start of its tokens, with a
+    range lookup that any database answers from the index.
+    """
+
+    field = models.CharField(max_length=20)
+    token = models.CharField(max_length=50)
+
+    objects = NameTokenManager()
+
+    class Meta:
+        abstract = True
+        indexes = [
+            models.Index(
+                fields=["field", "token"], name="%(app_label)s_%(class)s_tk"
+            )
+        ]
+
+
+class TrackedFieldsMixin:
+    """
+    keeps the values of the tracked_fields as they were loaded (or last
+    saved), so save() and the signals only do their work when it changed.
+    """
+
+    tracked_fields = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reset_tracking()
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.reset_tracking(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self.reset_tracking(fields)
+
+    def reset_tracking(self, fields=None):
+        """take the current values as the saved ones."""
+        tracked = getattr(self, "_tracked", {})
+        for field in self.tracked_fields:
+            if fields is None or field in fields:
+                tracked[field] = self.get_tracked_value(field)
+        self._tracked = tracked
+
+    def get_tracked_value(self, field):
+        attname = self._meta.get_field(field).attname
+        value = self.__dict__.get(attname, models.DEFERRED)
+        # a file is compared by its name, the FieldFile itself changes
+        return getattr(value, "name", value)
+
+    def get_changed_fields(self):
+        """the tracked fields that changed, all of them on a new object."""
+        if self._state.adding:
+            return set(self.tracked_fields)
+        return {
+            field
+            for field in self.tracked_fields
+            if self._tracked[field] is models.DEFERRED
+            or self._tracked[field] != self.get_tracked_value(field)
+        }
+
+    def has_changed(self, *fields):
+        return bool(self.get_changed_fields().intersection(fields))
+
+    def get_saved_value(self, field):
+        value = self._tracked[field]
+        return None if value is models.DEFERRED else value
+
+
+class CacheVersion(models.Model):
+    """
+    the version of a cached data (the counts of a center, the name index of
+    its persons...), bumped when the data changes. it is kept in the
+    database, so every process of the site sees the bumps of the others.
+    """
+
+    key = models.CharField(max_length=200, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.key} ({self.version})"
+
+
+#  jobs  ######################################################################
+class JobManager(models.Manager):
+    def enqueue(
+        self,
+        name,
+        *args,
+        made_by=None,
+        run_after=None,
+        max_attempts=3,
+        **kwargs,
+    ):
+        return self.create(
+            name=name,
+            args=list(args),
+            kwargs=kwargs,
+            made_by=made_by,
+            run_after=run_after or timezone.now(),
+            max_attempts=max_attempts,
+        )
+
+    def claim(self, worker):
+        """
+        lock the next pending job to worker. the pending rows are locked
+        with SELECT ... FOR UPDATE SKIP LOCKED where the database can do it,
+        otherwise (SQLite) the job is taken by a conditional update.
+        """
+        pending = self.filter(
+            status="PND", run_after__lte=timezone.now()
+        ).order_by("run_after", "pk")
+        changes = dict(
+            status="RUN",
+            locked_by=worker,
+            locked_on=timezone.now(),
+            attempts=F("attempts") + 1,
+        )
+        if connection.features.has_select_for_update_skip_locked:
+            with transaction.atomic():
+                pk = (
+                    pending.select_for_update(skip_locked=True)
+                    .values_list("pk", flat=True)
+                    .first()
+                )
+                if pk is None:
+                    return None
+                self.filter(pk=pk).update(**changes)
+            return self.get(pk=pk)
+
+        for pk in pending.values_list("pk", flat=True)[:10]:
+            if self.filter(pk=pk, status="PND").update(**changes):
+                return self.get(pk=pk)
+        return None
+
+    def requeue_stale(self, timeout):
+        """return to the queue the jobs of the workers that died."""
+        return self.filter(
+            status="RUN",
+            locked_on__lt=timezone.now() - timedelta(seconds=timeout),
+        ).update(status="PND", locked_by="", locked_on=None)
+
+
+class Job(models.Model):
+    name = models.CharField(_("name"), max_length=100)
+    args = JSONField(default=list, blank=True)
+    kwargs = JSONField(default=dict, blank=True)
+    status = models.CharField(
+        _("status"), max_length=3, choices=JOB_STATUS, default="PND"
+    )
+    attempts = models.PositiveSmallIntegerField(_("attempts"), default=0)
+    max_attempts = models.PositiveSmallIntegerField(
+        _("max attempts"), default=3
+    )
+    run_after = models.DateTimeField(_("run after"), default=timezone.now)
+    locked_by = models.CharField(_("locked by"), max_length=100, blank=True)
+    locked_on = models.DateTimeField(_("locked on"), null=True, blank=True)
+    progress = models.PositiveSmallIntegerField(_("progress"), default=0)
+    message = models.CharField(_("message"), max_length=200, blank=True)
+    result = JSONField(null=True, blank=True)
+    error = models.TextField(_("error"), blank=True)
+    made_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="created_job",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+    )
+    created_on = models.DateTimeField(auto_now_add=True)
+    modified_on = models.DateTimeField(auto_now=True)
+
+    objects = JobManager()
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in ("DNE", "ERR")
+
+    def set_progress(self, progress, message=""):
+        """saved at once, so the pages polling the job can see it."""
+        self.progress, self.message = min(progress, 100), message[:200]
+        Job.objects.filter(pk=self.pk).update(
+            progress=self.progress,
+            message=self.message,
+            modified_on=timezone.now(),
+        )
+
+    class Meta:
+        verbose_name = _("job")
+        verbose_name_plural = _("jobs")
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+
+#  imports  ###################################################################
+class ImportRun(models.Model):
+    """
+    an import of people (see base.importer), with the checkpoint of its
+    last chunk: the state of the importer, saved in the transaction of the
+    chunk, from where an interrupted import is resumed. once finished, it is
+    the entry of the import in the history of the imports.
+    """
+
+    center = models.ForeignKey(
+        "center.Center", on_delete=models.PROTECT, verbose_name=_("center")
+    )
+    kind = models.CharField(
+        _("kind"), max_length=3, choices=IMPORT_KINDS, default="IMP"
+    )
+    file_name = models.CharField(_("file"), max_length=200)
+    file_hash = models.CharField(
+        _("file hash"), max_length=64, blank=True, db_index=True
+    )
+    status = models.CharField(
+        _("status"), max_length=3, choices=JOB_STATUS, default="PND"
+    )
+    entries = models.PositiveIntegerField(_("entries"), default=0)
+    rows = models.PositiveIntegerField(_("rows"), default=0)
+    importeds = models.PositiveIntegerField(_("importeds"), default=0)
+    without_email = models.PositiveIntegerField(_("without email"), default=0)
+    duplicate_email = models.PositiveIntegerField(
+        _("duplicate email"), default=0
+    )
+    used_email = models.PositiveIntegerField(_("used email"), default=0)
+    duration = models.DurationField(_("duration"), null=True, blank=True)
+    state = JSONField(default=dict, blank=True)
+    error = models.TextField(_("error"), blank=True)
+    made_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="created_import_run",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+    )
+    created_on = models.DateTimeField(auto_now_add=True)
+    modified_on = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.file_name} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status == "DNE"
+
+    @property
+    def progress(self):
+        if self.is_finished:
+            return 100
+        return min(self.rows * 100 // self.entries, 99) if self.entries else 0
+
+    @property
+    def file(self):
+        """the name of its files, as download_csv takes it."""
+        if self.kind == "LGP":
+            return self.file_name
+        return f"{self.file_name}.csv"
+
+    @property
+    def report(self):
+        if self.kind == "LGP":
+            return f"{self.file_name}_to_sign_lgpd__report.txt"
+        return f"{self.file_name}__report.txt"
+
+    class Meta:
+        verbose_name = _("import")
+        verbose_name_plural = _("imports")
+        ordering = ["-created_on"]
+
+
+#  emails  ####################################################################
+class EmailManager(models.Manager):
+    def queue(self, context=None, **fields):
+        return self.create(context=dump_context(context or {}), **fields)
+
+    def queue_many(self, emails, batch_size=1000):
+        """queue at once the emails, dicts with the fields of queue."""
+        return self.bulk_create(
+            (
+                self.model(
+                    **dict(email, context=dump_context(email.get("context")))
+                )
+                for email in emails
+            ),
+            batch_size=batch_size,
+        )
+
+    def claim(self, sender, limit):
+        """
+        lock up to limit pending emails to sender, as the jobs are claimed
+        (see JobManager.claim), and return them.
+        """
+        pending = self.filter(
+            status="PND", send_after__lte=timezone.now()
+        ).order_by("send_after", "pk")
+        changes = dict(
+            status="SND",
+            locked_by=sender,
+            locked_on=timezone.now(),
+            attempts=F("attempts") + 1,
+        )
+        if connection.features.has_select_for_update_skip_locked:
+            with transaction.atomic():
+                pks = list(
+                    pending.select_for_update(skip_locked=True).values_list(
+                        "pk", flat=True
+                    )[:limit]
+                )
+                self.filter(pk__in=pks).update(**changes)
+        else:
+            pks = list(pending.values_list("pk", flat=True)[:limit])
+            self.filter(pk__in=pks, status="PND").update(**changes)
+        return list(
+            self.filter(pk__in=pks, status="SND", locked_by=sender).order_by(
+                "send_after", "pk"
+            )
+        )
+
+    def requeue_stale(self, timeout):
+        """return to the queue the emails of the senders that died."""
+        return self.filter(
+            status="SND",
+            locked_on__lt=timezone.now() - timedelta(seconds=timeout),
+        ).update(status="PND", locked_by="", locked_on=None)
+
+
+class Email(models.Model):
+    """
+    an email of the outbox. the templates are rendered only when it is sent,
+    with its context, where the objects are kept as references.
+    """
+
+    to = models.EmailField(_("to"))
+    subject = models.CharField(_("subject"), max_length=200)
+    body_text = models.CharField(_("text template"), max_length=200)
+    body_html = models.CharField(_("html template"), max_length=200)
+    from_email = models.EmailField(_("from"))
+    context = JSONField(default=dict, blank=True)
+    batch = models.CharField(_("batch"), max_length=200, blank=True)
+    status = models.CharField(
+        _("status"), max_length=3, choices=EMAIL_STATUS, default="PND"
+    )
+    attempts = models.PositiveSmallIntegerField(_("attempts"), default=0)
+    max_attempts = models.PositiveSmallIntegerField(
+        _("max attempts"), default=5
+    )
+    send_after = models.DateTimeField(_("send after"), default=timezone.now)
+    locked_by = models.CharField(_("locked by"), max_length=100, blank=True)
+    locked_on = models.DateTimeField(_("locked on"), null=True, blank=True)
+    sent_on = models.DateTimeField(_("sent on"), null=True, blank=True)
+    error = models.TextField(_("error"), blank=True)
+    created_on = models.DateTimeField(auto_now_add=True)
+
+    objects = EmailManager()
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to} ({self.get_status_display()})"
+
+    def get_context(self):
+        return load_context(self.context)
+
+    class Meta:
+        verbose_name = _("email")
+        verbose_name_plural = _("emails")
+        indexes = [
+            models.Index(fields=["status", "send_after"]),
+            models.Index(fields=["batch"]),
+        ]
+
+
+#  images  ####################################################################
+class ImageRendition(models.Model):
+    """
+    the renditions of an uploaded image (see base.images), made once by a
+    background job. the files are named by the hash of the content of the
+    image, so the same image is never processed twice.
+    """
+
+    source = models.CharField(_("source"), max_length=255, unique=True)
+    digest = models.CharField(
+        _("digest"), max_length=64, blank=True, db_index=True
+    )
+    grayscale = models.BooleanField(_("grayscale"), default=False)
+    status = models.CharField(
+        _("status"), max_length=3, choices=JOB_STATUS, default="PND"
+    )
+    files = JSONField(default=dict, blank=True)
+    error = models.TextField(_("error"), blank=True)
+    created_on = models.DateTimeField(auto_now_add=True)
+    modified_on = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source} ({self.get_status_display()})"
+
+    @property
+    def is_ready(self):
+        return self.status == "DNE"
+
+    class Meta:
+        verbose_name = _("image rendition")
+        verbose_name_plural = _("image renditions")
+
+
+# helpers
+def dump_context(context):
+    """the context as json, with the model instances as references."""
+    return {
+        key: {"_model": value._meta.label_lower, "_pk": str(value.pk)}
+        if isinstance(value, models.Model)
+        else value
+        for key, value in (context or {}).items()
+    }
+
+
+def load_context(context):
+    """the context of dump_context, with the referred objects."""
+    return {
+        key: apps.get_model(value["_model"]).objects.get(pk=value["_pk"])
+        if isinstance(value, dict) and "_model" in value
+        else value
+        for key, value in context.items()
+    }
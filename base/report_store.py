@@ -0,0 +1,95 @@
+"""
+disk store of the generated reports, so the session keeps only a short
+handle instead of the whole report. each report is written to a file in the
+directory of its user, in the feather format when pyarrow is installed (or
+pickled by pandas otherwise), and expires after REPORT_TTL seconds.
+"""
+import os
+import re
+import time
+import uuid
+
+import pandas as pd
+
+from django.conf import settings
+
+try:
+    import pyarrow  # noqa
+
+    EXTENSION = "feather"
+except ImportError:
+    EXTENSION = "pkl"
+
+REPORT_PATH = settings.get(
+    "REPORT_PATH", f"{os.path.dirname(settings.BASE_DIR)}/reports"
+)
+REPORT_TTL = settings.get("REPORT_TTL", 60 * 60 * 6)
+
+
+def get_user_path(user_id):
+    return f"{REPORT_PATH}/{user_id}"
+
+
+def get_report_path(user_id, handle):
+    return f"{get_user_path(user_id)}/{handle}.{EXTENSION}"
+
+
+def save_report(request, frame, name):
+    """writes frame to the disk and keeps its handle in the session."""
+    delete_report(request)
+    clear_reports(get_user_path(request.user.pk))
+    os.makedirs(get_user_path(request.user.pk), exist_ok=True)
+
+    handle = uuid.uuid4().hex
+    path = get_report_path(request.user.pk, handle)
+    if EXTENSION == "feather":
+        frame.reset_index(drop=True).to_feather(path)
+    else:
+        frame.to_pickle(path)
+
+    request.session["report_file"] = {"handle": handle, "name": name}
+    return handle
+
+
+def load_report(request):
+    """the frame and file name of the report in the session, or None."""
+    path = get_session_report_path(request)
+    if not path or is_expired(path):
+        return None
+    if EXTENSION == "feather":
+        frame = pd.read_feather(path)
+    else:
+        frame = pd.read_pickle(path)
+    return frame, request.session["report_file"]["name"]
+
+
+def delete_report(request):
+    path = get_session_report_path(request)
+    if path and os.path.exists(path):
+        os.remove(path)
+    request.session.pop("report_file", None)
+
+
+def clear_reports(path=None):
+    """removes the expired reports below path (all of them by default)."""
+    removed = 0
+    for root, dirs, files in os.walk(path or REPORT_PATH):
+        for file in files:
+            if is_expired(f"{root}/{file}"):
+                os.remove(f"{root}/{file}")
+                removed += 1
+    return removed
+
+
+# helpers
+def get_session_report_path(request):
+    report = request.session.get("report_file")
+    if not report or not re.fullmatch(r"[0-9a-f]{32}", report["handle"]):
+        return None
+    return get_report_path(request.user.pk, report["handle"])
+
+
+def is_expired(path):
+    if not os.path.exists(path):
+        return True
+    return time.time() - os.path.getmtime(path) > REPORT_TTL
@@ -0,0 +1,95 @@
+"""
+paginated view of the generated reports. the first page is rendered with
+the report, and the next ones (sorted and filtered) are served by htmx from
+the frame kept by the report store, without computing the report again.
+"""
+from math import ceil
+from urllib.parse import urlencode
+
+import pandas as pd
+
+from django.template.loader import render_to_string
+
+REPORT_PAGE_SIZE = 50
+
+
+def render_report_page(request, frame):
+    """the html of the first page of the report in frame."""
+    return render_to_string(
+        "base/reports/elements/hx/report_page_hx.html",
+        get_report_page(frame, {}),
+        request=request,
+    )
+
+
+def get_report_page(frame, params):
+    """
+    the context of a page of frame, sorted by params["sort"] (descending
+    when params["desc"]) and filtered by the term of params["q"].
+    """
+    sort = params.get("sort") if params.get("sort") in frame.columns else ""
+    desc = bool(params.get("desc"))
+    term = params.get("q", "").strip()
+
+    if term:
+        frame = frame[get_matches(frame, term)]
+    if sort:
+        frame = frame.sort_values(
+            sort, ascending=not desc, kind="mergesort", na_position="last"
+        )
+
+    count = len(frame)
+    pages = max(1, ceil(count / REPORT_PAGE_SIZE))
+    page = get_page_number(params.get("page"), pages)
+    start = (page - 1) * REPORT_PAGE_SIZE
+    rows = frame.iloc[start : start + REPORT_PAGE_SIZE]
+
+    return {
+        "columns": [str(column) for column in frame.columns],
+        "rows": [
+            (start + pos, [get_cell(value) for value in row])
+            for pos, row in enumerate(
+                rows.itertuples(index=False, name=None), 1
+            )
+        ],
+        "count": count,
+        "page": page,
+        "pages": pages,
+        "sort": sort,
+        "desc": desc,
+        "q": term,
+        "params": urlencode(
+            {"sort": sort, "desc": "on" if desc else "", "q": term}
+        ),
+    }
+
+
+# helpers
+def get_matches(frame, term):
+    """rows with a text column containing term."""
+    matches = pd.Series(False, index=frame.index)
+    for column in frame.columns:
+        if frame[column].dtype == object:
+            matches |= (
+                frame[column]
+                .astype(str)
+                .str.contains(term, case=False, regex=False)
+            )
+    return matches
+
+
+def get_page_number(page, pages):
+    try:
+        return min(max(1, int(page)), pages)
+    except (TypeError, ValueError):
+        return 1
+
+
+def get_cell(value):
+    if isinstance(value, pd.Timedelta):
+        return value.days
+    if isinstance(value, pd.Timestamp) and value == value.normalize():
+        return value.date()
+    if value is None or value != value:
+        return ""
+    return value
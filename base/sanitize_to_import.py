@@ -1,7 +1,10 @@
+import os
 import re
 
+import numpy as np
 import pandas as pd
 
+from concurrent.futures import ProcessPoolExecutor
 from io import StringIO
 
 # lists to sanitize class
@@ -41,41 +44,42 @@ COLUMNS = [
 ]
 
 DATES = ["birth", "A1", "A2", "A3", "A4", "GR", "A5", "A6", "date"]
+TEXTS = ["reg", "cpf", "zip", "id_card", "phone", "cell_phone", "sos_phone"]
+PHONES = ["phone", "cell_phone", "sos_phone"]
+# files from this size are validated in parallel, when processes are given
+PARALLEL_ROWS = 50000
+EMAIL_REGEX = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
 
 
 class SanitizeCsv:
-    def __init__(self, file, path):
+    def __init__(self, file, path, processes=1):
         self.file = file
         self.path = path
+        # the views validate in their own process, the check_people_file
+        # command in a pool (see validate)
+        self.processes = processes
         self.columns = COLUMNS[:]
         self.df = self.get_dataframe
 
     @property
     def get_dataframe(self):
-        # getting dataframe
-        df = pd.read_csv(StringIO(self.file.read().decode("utf-8")))
+        # getting dataframe (the texts as read, to keep the leading zeros)
+        df = pd.read_csv(
+            StringIO(self.file.read().decode("utf-8")),
+            dtype={col: str for col in TEXTS},
+        )
 
         # checking if the dataframe is malformed
         for col in df.columns:
-            print(col)
             if col not in self.columns:
-                print(f"{col} not in self.columns")
                 return False
 
+        # validate the rows before any change
+        self.errors = validate(df, processes=self.processes)
+
         # adjust dates
         for _dt in DATES:
-            df[_dt] = pd.to_datetime(df[_dt]).dt.date
-
-        # adjusting some columns to be strings
-        for col in [
-            "reg",
-            "zip",
-            "id_card",
-            "phone",
-            "cell_phone",
-            "sos_phone",
-        ]:
-            df[col] = df[col].astype(str)
+            df[_dt] = pd.to_datetime(df[_dt], errors="coerce").dt.date
 
         # choose _address or address, number, complement colunms
         if "_address" in df.columns:
@@ -119,14 +123,8 @@ class SanitizeCsv:
             self.df[_obj] = self.df[_obj].fillna("")
 
         # clear phones
-        phones = [_ph for _ph in COLUMNS if "phone" in _ph]
-        if phones:
-            for phone in phones:
-                self.df[phone] = (
-                    self.df[phone]
-                    .apply(lambda x: self.clear_phone(x))
-                    .fillna("")
-                )
+        for phone in PHONES:
+            self.df[phone] = get_digits(self.df[phone])
 
     def generate_files(self):
         # without emails
@@ -154,8 +152,192 @@ class SanitizeCsv:
             cleaned_df = with_emails
         cleaned_df.to_csv(f"{self.path}/{self.file}")
 
+    @property
+    def has_errors(self):
+        """if some row can't be imported."""
+        return self.errors.level.eq("error").any()
+
+    def generate_errors(self):
+        """write the errors of the rows, to be fixed in the file."""
+        os.makedirs(f"{self.path}/errors", exist_ok=True)
+        self.errors.to_csv(
+            f"{self.path}/errors/errors__{self.file}", index=False
+        )
+
     @staticmethod
     def clear_phone(phone):
         if isinstance(phone, str):
             return "".join(re.findall(r"\d*", phone))
         return phone
+
+
+#  validation  ################################################################
+def validate(df, processes=1):
+    """
+    the errors of the rows of df, one by line: (line, name, column, value,
+    error, level). given more processes (None is one by cpu), the big
+    frames are split across a process pool, by the check_people_file
+    command. it is never done in a request, where it would fork the web
+    worker with its connections and threads.
+    """
+    if len(df) >= PARALLEL_ROWS and processes != 1:
+        size = PARALLEL_ROWS // 2
+        starts = range(0, len(df), size)
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            errors = executor.map(
+                validate_rows,
+                [df.iloc[start : start + size] for start in starts],
+                [start + 2 for start in starts],
+            )
+            errors = [part for part in errors if not part.empty]
+        if errors:
+            return pd.concat(errors, ignore_index=True)
+        return validate_rows(df.iloc[:0])
+    return validate_rows(df)
+
+
+def validate_rows(df, first_line=2):
+    """the errors of the rows of df, the first of them in first_line."""
+    checks = []
+    lines = pd.Series(np.arange(len(df)) + first_line, index=df.index)
+
+    def check(column, wrong, error, level="error"):
+        if column in df.columns and wrong.any():
+            checks.append(
+                pd.DataFrame(
+                    {
+                        "line": lines[wrong],
+                        "name": df.get("name", lines)[wrong],
+                        "column": column,
+                        "value": df[column][wrong].astype(str),
+                        "error": error,
+                        "level": level,
+                    }
+                )
+            )
+
+    check("name", get_blanks(df["name"]), "required")
+    emails = df["email"].fillna("").astype(str).str.strip()
+    check(
+        "email",
+        df["email"].notna() & ~emails.str.match(EMAIL_REGEX),
+        "invalid email",
+    )
+    for column in DATES:
+        if column in df.columns:
+            dates = pd.to_datetime(df[column], errors="coerce")
+            check(
+                column, dates.isna() & ~get_blanks(df[column]), "invalid date"
+            )
+    if "cpf" in df.columns:
+        check(
+            "cpf",
+            ~get_blanks(df["cpf"]) & ~get_valid_cpfs(df["cpf"]),
+            "invalid cpf",
+            level="warning",
+        )
+    for column in PHONES:
+        if column in df.columns:
+            size = get_digits(df[column]).str.len()
+            check(
+                column,
+                ~get_blanks(df[column]) & ~size.between(8, 15),
+                "invalid phone",
+                level="warning",
+            )
+
+    if not checks:
+        return pd.DataFrame(
+            columns=["line", "name", "column", "value", "error", "level"]
+        )
+    return (
+        pd.concat(checks)
+        .sort_values(["line"], kind="mergesort")
+        .reset_index(drop=True)
+    )
+
+
+# helpers
+def get_blanks(series):
+    return series.isna() | series.astype(str).str.strip().eq("")
+
+
+def get_digits(series):
+    """only the digits of the texts of series ("" to the blanks)."""
+    return series.fillna("").astype(str).str.replace(r"\D", "", regex=True)
+
+
+def get_valid_cpfs(series):
+    """
+    if each text of series is a valid CPF, checking the digits of all of
+    them at once (as cpf_validation does for one).
+    """
+    digits = get_digits(series)
+    sized = digits.str.len().eq(11).to_numpy()
+    valid = np.zeros(len(series), dtype=bool)
+    if sized.any():
+        cpfs = np.frombuffer(
+            "".join(digits[sized]).encode(), dtype=np.uint8
+        ).reshape(-1, 11) - ord("0")
+        digit1 = 11 - cpfs[:, :9] @ np.arange(10, 1, -1) % 11
+        digit1[digit1 > 9] = 0
+        digit2 = 11 - (cpfs[:, :9] @ np.arange(11, 2, -1) + digit1 * 2) % 11
+        digit2[digit2 > 9] = 0
+        valid[sized] = (
+            (cpfs[:, 9] == digit1)
+            & (cpfs[:, 10] == digit2)
+            & (cpfs != cpfs[:, :1]).any(axis=1)
+        )
+    return pd.Series(valid, index=series.index)
+
+
+def get_phones(series):
+    """the phones of series, formatted as phone_format does for one."""
+    texts = series.fillna("").astype(str).str.strip()
+    digits = get_digits(texts)
+    size = digits.str.len()
+    international = texts.str.startswith("+")
+    return pd.Series(
+        np.select(
+            [
+                digits.eq(""),
+                international & size.eq(13),
+                international,
+                size.eq(11),
+                size.eq(10),
+            ],
+            [
+                "",
+                "+"
+                + digits.str[:2]
+                + " "
+                + digits.str[2:4]
+                + " "
+                + digits.str[4:9]
+                + "-"
+                + digits.str[9:],
+                "+"
+                + digits.str[:2]
+                + " "
+                + digits.str[2:4]
+                + " "
+                + digits.str[4:8]
+                + "-"
+                + digits.str[8:],
+                "+55 "
+                + digits.str[:2]
+                + " "
+                + digits.str[2:7]
+                + "-"
+                + digits.str[7:],
+                "+55 "
+                + digits.str[:2]
+                + " "
+                + digits.str[2:6]
+                + "-"
+                + digits.str[6:],
+            ],
+            default=digits,
+        ),
+        index=series.index,
+    )
@@ -1,17 +1,26 @@
 from datetime import datetime, timedelta
+from urllib.parse import urlencode
+from uuid import UUID
 
 from django.db.models import Q
 from django.utils import timezone
+from rcadmin.common import (
+    ACTIVITY_TYPES,
+    ASPECTS,
+    LECTURE_TYPES,
+    ORDER_STATUS,
+    SEEKER_STATUS,
+    STATUS,
+    WORKGROUP_TYPES,
+    get_keyset_page,
+)
+from person.models import PersonNameToken
+from publicwork.models import SeekerNameToken
 
 
 #  center  ####################################################################
 def search_center(request, obj, _from, _to):
-    # checking for search in request.session
-    if not request.session.get("search"):
-        get_base_search(request)
-    adjust_session(request, ["ct_term", "page", "all"])
-    # basic query
-    search = request.session["search"]
+    search = SearchState(request, ["ct_term", "all"])
     _query = [Q(is_active=True)]
     # adding more complexity
     if search["ct_term"]:
@@ -23,20 +32,14 @@ def search_center(request, obj, _from, _to):
     for q in _query:
         query.add(q, Q.AND)
 
-    count = obj.objects.filter(query).count()
-    objects = obj.objects.filter(query).order_by("name")[_from:_to]
-
-    return (objects, count)
+    return get_keyset_page(
+        request, obj.objects.filter(query), ["name"], _from, _to
+    )
 
 
 #  invitations  ###############################################################
 def search_invitations(request, obj, _from, _to):
-    # checking for search in request.session
-    if not request.session.get("search"):
-        get_base_search(request)
-    adjust_session(request, ["ps_term", "page", "all"])
-    # basic query
-    search = request.session["search"]
+    search = SearchState(request, ["ps_term", "all"])
     _query = [Q(imported=False), Q(center=request.user.person.center)]
     # adding more complexity
     if search["ps_term"]:
@@ -52,24 +55,20 @@ def search_invitations(request, obj, _from, _to):
     for q in _query:
         query.add(q, Q.AND)
 
-    count = obj.objects.filter(query).count()
-    objects = obj.objects.filter(query).order_by("name")[_from:_to]
-
-    return (objects, count)
+    return get_keyset_page(
+        request, obj.objects.filter(query), ["name"], _from, _to
+    )
 
 
 #  person  ####################################################################
 def search_person(request, obj, _from, _to):
-    # checking for search in request.session
-    if not request.session.get("search"):
-        get_base_search(request)
-    adjust_session(request, ["ps_term", "ps_aspect", "ps_status", "all"])
-    # basic query
-    search = request.session["search"]
+    search = SearchState(request, ["ps_term", "ps_aspect", "ps_status", "all"])
     _query = [Q(is_active=True), Q(center=request.user.person.center)]
     # adding more complexity
     if search["ps_term"]:
-        _query.append(Q(name_sa__icontains=search["ps_term"]))
+        _query.append(
+            PersonNameToken.objects.get_query("name_sa", search["ps_term"])
+        )
     if search["ps_aspect"] != "all":
         _query.append(Q(aspect=search["ps_aspect"]))
     if search["ps_status"] != "all":
@@ -87,20 +86,20 @@ def search_person(request, obj, _from, _to):
     for q in _query:
         query.add(q, Q.AND)
 
-    count = obj.objects.filter(query).count()
-    objects = obj.objects.filter(query).order_by("name_sa")[_from:_to]
-
-    return (objects, count)
+    return get_keyset_page(
+        request,
+        obj.objects.filter(query),
+        ["name_sa"],
+        _from,
+        _to,
+        cached_count=True,
+        center=get_query_center(_query),
+    )
 
 
 #  event  ####################################################################
 def search_event(request, obj, _from, _to):
-    # checking for search in request.session
-    if not request.session.get("search"):
-        get_base_search(request)
-    adjust_session(request, ["dt1", "dt2", "ev_type", "page", "all"])
-    # basic query
-    search = request.session["search"]
+    search = SearchState(request, ["dt1", "dt2", "ev_type", "all"])
     _query = [
         Q(is_active=True),
         Q(center=request.user.person.center),
@@ -117,20 +116,20 @@ def search_event(request, obj, _from, _to):
     for q in _query:
         query.add(q, Q.AND)
 
-    count = obj.objects.filter(query).count()
-    objects = obj.objects.filter(query).order_by("-date")[_from:_to]
-
-    return (objects, count)
+    return get_keyset_page(
+        request,
+        obj.objects.filter(query),
+        ["-date"],
+        _from,
+        _to,
+        cached_count=True,
+        center=get_query_center(_query),
+    )
 
 
 #  workgroups  ################################################################
 def search_workgroup(request, obj, _from, _to):
-    # checking for search in request.session
-    if not request.session.get("search"):
-        get_base_search(request)
-    adjust_session(request, ["wg_term", "wg_type", "page", "all"])
-    # basic query
-    search = request.session["search"]
+    search = SearchState(request, ["wg_term", "wg_type", "all"])
     _query = [Q(is_active=True), Q(center=request.user.person.center)]
     # adding more complexity
     if search["wg_term"]:
@@ -145,28 +144,32 @@ def search_workgroup(request, obj, _from, _to):
     for q in _query:
         query.add(q, Q.AND)
 
-    count = obj.objects.filter(query).count()
-    objects = obj.objects.filter(query).order_by("name")[_from:_to]
-
-    return (objects, count)
+    return get_keyset_page(
+        request,
+        obj.objects.filter(query),
+        ["name"],
+        _from,
+        _to,
+        cached_count=True,
+        center=get_query_center(_query),
+    )
 
 
 #  seeker  ####################################################################
 def search_seeker(request, obj, _from, _to):
-    # checking for search in request.session
-    if not request.session.get("search"):
-        get_base_search(request)
-    adjust_session(
-        request, ["sk_name", "sk_city", "sk_status", "center", "page", "all"]
+    search = SearchState(
+        request, ["sk_name", "sk_city", "sk_status", "center", "all"]
     )
-    # basic query
-    search = request.session["search"]
     _query = [Q(is_active=True), Q(center=request.user.person.center)]
     # adding more complexity
     if search["sk_name"]:
-        _query.append(Q(name_sa__icontains=search["sk_name"]))
+        _query.append(
+            SeekerNameToken.objects.get_query("name_sa", search["sk_name"])
+        )
     if search["sk_city"]:
-        _query.append(Q(city__icontains=search["sk_city"]))
+        _query.append(
+            SeekerNameToken.objects.get_query("city_sa", search["sk_city"])
+        )
     if search["sk_status"] == "all":
         _query.append(Q(status__in=("NEW", "MBR", "INS")))
     else:
@@ -183,20 +186,20 @@ def search_seeker(request, obj, _from, _to):
     for q in _query:
         query.add(q, Q.AND)
 
-    count = obj.objects.filter(query).count()
-    objects = obj.objects.filter(query).order_by("name_sa")[_from:_to]
-
-    return (objects, count)
+    return get_keyset_page(
+        request,
+        obj.objects.filter(query),
+        ["name_sa"],
+        _from,
+        _to,
+        cached_count=True,
+        center=get_query_center(_query),
+    )
 
 
 #  lecture  ###################################################################
 def search_lecture(request, obj, _from, _to):
-    # checking for search in request.session
-    if not request.session.get("search"):
-        get_base_search(request)
-    adjust_session(request, ["dt1", "dt2", "lc_type", "page", "all"])
-    # basic query
-    search = request.session["search"]
+    search = SearchState(request, ["dt1", "dt2", "lc_type", "all"])
     _query = [
         Q(is_active=True),
         Q(center=request.user.person.center),
@@ -213,20 +216,20 @@ def search_lecture(request, obj, _from, _to):
     for q in _query:
         query.add(q, Q.AND)
 
-    count = obj.objects.filter(query).count()
-    objects = obj.objects.filter(query).order_by("-date")[_from:_to]
-
-    return (objects, count)
+    return get_keyset_page(
+        request,
+        obj.objects.filter(query),
+        ["-date"],
+        _from,
+        _to,
+        cached_count=True,
+        center=get_query_center(_query),
+    )
 
 
 #  pw group  ##################################################################
 def search_pw_group(request, obj, _from, _to):
-    # checking for search in request.session
-    if not request.session.get("search"):
-        get_base_search(request)
-    adjust_session(request, ["pw_name", "center", "page", "all"])
-    # basic query
-    search = request.session["search"]
+    search = SearchState(request, ["pw_name", "center", "all"])
     _query = [Q(is_active=True), Q(center=request.user.person.center)]
     # adding more complexity
     if search["pw_name"]:
@@ -243,19 +246,20 @@ def search_pw_group(request, obj, _from, _to):
     for q in _query:
         query.add(q, Q.AND)
 
-    count = obj.objects.filter(query).count()
-    objects = obj.objects.filter(query).order_by("name")[_from:_to]
-
-    return (objects, count)
+    return get_keyset_page(
+        request,
+        obj.objects.filter(query),
+        ["name"],
+        _from,
+        _to,
+        cached_count=True,
+        center=get_query_center(_query),
+    )
 
 
 #  orders  ####################################################################
 def search_order(request, obj, _from, _to):
-    if not request.session.get("search"):
-        get_base_search(request)
-    adjust_session(request, ["dt1", "dt2", "od_name", "od_status", "page"])
-    # basic query
-    search = request.session["search"]
+    search = SearchState(request, ["dt1", "dt2", "od_name", "od_status"])
     # basic query
     _query = [
         Q(center=request.user.person.center),
@@ -263,7 +267,11 @@ def search_order(request, obj, _from, _to):
     ]
     # adding more complexity
     if search["od_name"]:
-        _query.append(Q(person__name_sa__icontains=search["od_name"]))
+        _query.append(
+            PersonNameToken.objects.get_query(
+                "name_sa", search["od_name"], prefix="person__"
+            )
+        )
     if search["od_status"] != "all":
         _query.append(Q(status=search["od_status"]))
     # generating query
@@ -271,15 +279,39 @@ def search_order(request, obj, _from, _to):
     for q in _query:
         query.add(q, Q.AND)
 
-    count = obj.objects.filter(query).count()
-    objects = obj.objects.filter(query).order_by("-created_on")[_from:_to]
-
-    return (objects, count)
+    return get_keyset_page(
+        request,
+        obj.objects.filter(query),
+        ["-created_on"],
+        _from,
+        _to,
+        # the versions of the orders don't follow the names of the persons
+        cached_count=not search["od_name"],
+        center=get_query_center(_query),
+    )
 
 
 #  handlers  ##################################################################
-def get_base_search(request):
-    request.session["search"] = {
+def get_query_center(_query):
+    """the center a search is limited to, or None for all centers."""
+    for q in _query:
+        if len(q) == 1 and q.children[0][0] in ("center", "center__pk"):
+            return q.children[0][1]
+
+
+SEARCH_CHOICES = {
+    "ps_aspect": [asp[0] for asp in ASPECTS],
+    "ps_status": [stt[0] for stt in STATUS],
+    "od_status": [stt[0] for stt in ORDER_STATUS],
+    "sk_status": [stt[0] for stt in SEEKER_STATUS],
+    "ev_type": [tp[0] for tp in ACTIVITY_TYPES],
+    "lc_type": [tp[0] for tp in LECTURE_TYPES],
+    "wg_type": [tp[0] for tp in WORKGROUP_TYPES],
+}
+
+
+def get_base_search():
+    return {
         "ct_term": "",
         "ps_term": "",
         "wg_term": "",
@@ -297,34 +329,62 @@ def get_base_search(request):
         "lc_type": "all",
         "wg_type": "all",
         "center": "",
-        "page": 1,
         "all": "off",
     }
 
 
-def get_date(request, dtx, days=0):
-    date = (
-        datetime.strptime(request.GET[dtx], "%Y-%m-%d")
-        if request.GET.get(dtx)
-        else datetime.strptime(request.session["search"][dtx], "%Y-%m-%d")
-    )
-    return date.strftime("%Y-%m-%d")
+class SearchState(dict):
+    """
+    the filters of a search, parsed and validated from the query string.
 
+    the filters travel in the urls (see urlencode), so the session is only
+    read when the request brings no filter at all, and only written when the
+    user asks to remember the filters (remember=on).
+    """
 
-def adjust_session(request, fields):
-    search = request.session["search"]
-    for field in fields:
-        if field == "all":
-            if request.GET.get(field) in ("on", "off"):
-                search[field] = request.GET[field]
-        elif field in ["dt1", "dt2", "dt", "date"]:
-            search[field] = (
-                get_date(request, "dt1", days=30)
-                if field == "dt1"
-                else get_date(request, "dt2")
-            )
+    def __init__(self, request, fields):
+        super().__init__()
+        self.fields = fields
+        defaults = get_base_search()
+        remembered = request.session.get("search") or {}
+        if any(field in request.GET for field in fields):
+            source = request.GET
+        else:
+            source = remembered
+
+        for field in fields:
+            self[field] = self.clean(field, source, defaults[field])
+
+        if request.GET.get("remember") == "on":
+            request.session["search"] = {**remembered, **self}
+        # makes the filters available to the templates
+        request.search = self
+
+    @staticmethod
+    def clean(field, source, default):
+        if hasattr(source, "getlist"):
+            values = [val.strip() for val in source.getlist(field)]
         else:
-            if request.GET.get(field):
-                search[field] = request.GET[field]
-    # save session
-    request.session.modified = True
+            values = [str(source.get(field, "")).strip()]
+        value = values[-1] if values else ""
+
+        if field == "all":
+            return "on" if "on" in values else default
+        if field in ("dt1", "dt2"):
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                return default
+            return value
+        if field in SEARCH_CHOICES:
+            return value if value in SEARCH_CHOICES[field] else default
+        if field == "center":
+            try:
+                return str(UUID(value))
+            except ValueError:
+                return default
+        return value[:100]
+
+    def urlencode(self):
+        """the canonical query string of the search."""
+        return urlencode(sorted(self.items()))
@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_save
+
+from event.models import Event
+from person.models import Person
+from publicwork.models import Lecture, PublicworkGroup, Seeker
+from rcadmin.common import bump_count_version
+from treasury.models import Order
+from workgroup.models import Workgroup
+
+COUNTED_MODELS = (
+    Person,
+    Seeker,
+    Event,
+    Lecture,
+    Workgroup,
+    PublicworkGroup,
+    Order,
+)
+
+
+def update_count_version(sender, instance, **kwargs):
+    # every counted model tracks its center (see TrackedFieldsMixin)
+    old_center_id = instance.get_saved_value("center")
+    if old_center_id and old_center_id != instance.center_id:
+        bump_count_version(sender, old_center_id)
+    bump_count_version(sender, instance.center_id)
+
+
+for model in COUNTED_MODELS:
+    post_save.connect(update_count_version, sender=model)
+    post_delete.connect(update_count_version, sender=model)
@@ -0,0 +1,59 @@
+import traceback
+
+from django.urls import reverse
+
+from .images import render
+from .importer import PeopleImporter
+from .jobs import task
+from .models import ImageRendition, ImportRun
+
+
+@task(max_attempts=3)
+def import_people(job, import_run_id):
+    """
+    imports the sanitized files of the import run, going on from its last
+    checkpoint when it was interrupted.
+    """
+    import_run = ImportRun.objects.select_related("center__made_by").get(
+        pk=import_run_id
+    )
+    import_run.status, import_run.error = "RUN", ""
+    import_run.save()
+    job.set_progress(import_run.progress, f"importing {import_run.file_name}")
+
+    def on_chunk(total):
+        if import_run.entries:
+            job.set_progress(import_run.progress, f"{total} rows read")
+
+    try:
+        PeopleImporter(
+            import_run.center,
+            import_run.file_name,
+            on_chunk=on_chunk,
+            import_run=import_run,
+        ).run()
+    except Exception:
+        ImportRun.objects.filter(pk=import_run.pk).update(
+            status="ERR", error=traceback.format_exc()
+        )
+        raise
+    return {
+        "report": import_run.report,
+        "url": f"{reverse('import_people')}?report={import_run.report}",
+    }
+
+
+@task(max_attempts=3)
+def make_renditions(job, rendition_id):
+    """makes the renditions of an uploaded image."""
+    rendition = ImageRendition.objects.get(pk=rendition_id)
+    rendition.status = "RUN"
+    rendition.save()
+    try:
+        render(rendition)
+    except Exception:
+        ImageRendition.objects.filter(pk=rendition.pk).update(
+            status="ERR", error=traceback.format_exc()
+        )
+        raise
+    return {"source": rendition.source, "files": rendition.files}
@@ -1,10 +1,16 @@
 from django import template
-from django.contrib.auth.models import Group
+
+from base.images import get_url
+from rcadmin.common import in_groups
 
 register = template.Library()
 
 
 @register.filter(name="has_group")
 def has_group(user, group_name):
-    group = Group.objects.get(name=group_name)
-    return True if group in user.groups.all() else False
+    return in_groups(user, group_name)
+
+
+@register.filter(name="rendition")
+def rendition(file, name="list"):
+    return get_url(file, name)
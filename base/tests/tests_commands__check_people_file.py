@@ -0,0 +1,56 @@
+import pandas as pd
+
+from io import StringIO
+
+from django.core.management import call_command
+
+from base import sanitize_to_import
+from base.sanitize_to_import import COLUMNS, validate
+
+
+def write_people(path, total):
+    columns = [col for col in COLUMNS if col != "_address"]
+    rows = pd.DataFrame(
+        [
+            dict(
+                name=f"P{n}", birth=f"1980-01-{n % 40:02}", email=f"p{n}@x.io"
+            )
+            for n in range(1, total + 1)
+        ],
+        columns=columns,
+    )
+    rows.to_csv(path, index=False)
+    return rows
+
+
+def test_check_people_file_validates_in_a_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(sanitize_to_import, "PARALLEL_ROWS", 4)
+    pools = []
+    pool = sanitize_to_import.ProcessPoolExecutor
+
+    def get_pool(max_workers):
+        pools.append(max_workers)
+        return pool(max_workers=max_workers)
+
+    monkeypatch.setattr(sanitize_to_import, "ProcessPoolExecutor", get_pool)
+    rows = write_people(tmp_path / "people.csv", 39)
+    out = StringIO()
+    call_command(
+        "check_people_file",
+        str(tmp_path / "people.csv"),
+        "--processes=2",
+        stdout=out,
+    )
+
+    assert pools == [2]
+    assert "8 rows with errors and 0 with warnings" in out.getvalue()
+    report = pd.read_csv(tmp_path / "errors/errors__people.csv")
+    assert report.line.tolist() == validate(rows).line.tolist()
+
+
+def test_check_people_file_without_errors(tmp_path):
+    write_people(tmp_path / "people.csv", 3)
+    out = StringIO()
+    call_command("check_people_file", str(tmp_path / "people.csv"), stdout=out)
+    assert "no rows with errors" in out.getvalue()
+    assert not (tmp_path / "errors").exists()
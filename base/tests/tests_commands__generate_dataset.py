@@ -0,0 +1,85 @@
+import pytest
+
+from django.core.management import call_command
+from django.db import transaction
+
+from center.models import Center
+from event.models import Frequency
+from person.models import Person, PersonNameToken
+from publicwork.models import Listener, Seeker
+from treasury.models import CashLedger, Order
+
+COUNTS = [
+    "--persons=20",
+    "--historics=10",
+    "--events=3",
+    "--frequencies=30",
+    "--workgroups=2",
+    "--memberships=5",
+    "--orders=10",
+    "--seekers=15",
+    "--lectures=3",
+    "--listeners=20",
+    "--pw-groups=2",
+    "--pw-members=5",
+]
+
+
+@pytest.mark.django_db
+def test_generate_dataset():
+    call_command("generate_dataset", "--centers=2", *COUNTS)
+
+    assert Center.objects.filter(name__startswith="Dataset").count() == 2
+    center = Center.objects.get(name="Dataset Center 0-0")
+    # the made_by person belongs to the center too
+    assert Person.objects.filter(center=center).count() == 21
+    assert Frequency.objects.filter(event__center=center).count() == 30
+    assert Order.objects.filter(center=center).count() == 10
+    assert Seeker.objects.filter(center=center).count() == 15
+    assert Listener.objects.filter(lecture__center=center).count() == 20
+    assert CashLedger.objects.filter(center=center).exists()
+    assert PersonNameToken.objects.filter(person__center=center).exists()
+
+
+@pytest.mark.django_db
+def test_generate_dataset_is_deterministic():
+    def generate():
+        with transaction.atomic():
+            call_command("generate_dataset", "--seed=7", *COUNTS)
+            names = list(Seeker.objects.order_by("pk").values_list("name"))
+            transaction.set_rollback(True)
+        return names
+
+    assert generate() == generate()
+
+
+@pytest.mark.django_db
+def test_generate_dataset_takes_a_count_of_0():
+    counts = [
+        count
+        for count in COUNTS
+        if not count.startswith(("--persons", "--seekers"))
+    ]
+    call_command("generate_dataset", "--persons=0", "--seekers=0", *counts)
+
+    center = Center.objects.get(name="Dataset Center 0-0")
+    # only the made_by person
+    assert Person.objects.filter(center=center).count() == 1
+    assert not Frequency.objects.filter(event__center=center).exists()
+    assert not Order.objects.filter(center=center).exists()
+    assert not Seeker.objects.filter(center=center).exists()
+    assert not Listener.objects.exists()
+
+
+@pytest.mark.django_db
+def test_generate_dataset_twice_with_the_same_seed():
+    call_command("generate_dataset", *COUNTS)
+    call_command("generate_dataset", *COUNTS)
+
+    assert list(
+        Center.objects.filter(name__startswith="Dataset")
+        .order_by("name")
+        .values_list("name", flat=True)
+    ) == ["Dataset Center 0-0", "Dataset Center 0-1"]
+    center = Center.objects.get(name="Dataset Center 0-1")
+    assert Seeker.objects.filter(center=center).count() == 15
@@ -0,0 +1,96 @@
+import pytest
+
+import pandas as pd
+
+from io import StringIO
+
+from django.core.management import call_command
+
+from base.models import ImportRun
+from person.models import Invitation, Person
+from rcadmin.common import get_cache_version, get_count_version_key
+
+
+@pytest.fixture
+def lgpd_center(
+    tmp_path, monkeypatch, create_center, create_person, create_user
+):
+    for folder in ("reports", "to_send_email"):
+        (tmp_path / folder).mkdir()
+    monkeypatch.setattr("base.importer.IMPORT_PATH", str(tmp_path))
+
+    center = create_center(
+        name="Center Lgpd", user=create_user(email="maker@mail.com")
+    )
+    # the person that made the center is also active in it
+    Person.objects.filter(user=center.made_by).update(center=center)
+    for n in range(4):
+        # a name longer than the name of an invitation
+        name = "Maria " * 16 if n == 2 else None
+        person = create_person(
+            center=center, email=f"p{n}@mail.com", name=name
+        )
+        person.user.profile.city = "Campinas"
+        person.user.profile.phone = "11987654321"
+        person.user.profile.save()
+    inactive = create_person(center=center, email="inactive@mail.com")
+    inactive.is_active = False
+    inactive.save()
+    Invitation.objects.create(center=center, name="P0", email="p0@mail.com")
+    return center
+
+
+def run_command(*args):
+    out = StringIO()
+    call_command("people_to_sign_lgpd", *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+def test_dry_run_only_counts(lgpd_center, tmp_path):
+    output = run_command("Lgpd", "--dry-run")
+
+    assert "4 people to sign lgpd, 1 already in db (dry run)" in output
+    assert Invitation.objects.count() == 1
+    assert Person.objects.filter(is_active=True).count() == 5
+    assert not ImportRun.objects.exists()
+    assert not list((tmp_path / "reports").iterdir())
+
+
+@pytest.mark.django_db
+def test_people_are_moved_by_bulk_queries(
+    lgpd_center, tmp_path, django_assert_max_num_queries
+):
+    count_key = get_count_version_key(Person, lgpd_center.pk)
+    count_version = get_cache_version(count_key)
+    # center, people, invited emails, the transaction, then the versions
+    with django_assert_max_num_queries(15):
+        output = run_command("Lgpd")
+    assert get_cache_version(count_key) > count_version
+
+    assert "4 people to sign lgpd, 1 already in db" in output
+    assert Invitation.objects.filter(sign_lgpd=True).count() == 4
+    invite = Invitation.objects.get(email="p1@mail.com")
+    assert (invite.city, invite.phone) == ("Campinas", "+55 11 98765-4321")
+    assert invite.migration
+    assert len(Invitation.objects.get(email="p2@mail.com").name) == 80
+
+    active = Person.objects.filter(center=lgpd_center, is_active=True)
+    assert list(active.values_list("user__email", flat=True)) == [
+        "p0@mail.com"
+    ]
+    assert not Person.objects.filter(
+        is_active=False, user__is_active=True
+    ).exists()
+
+    import_run = ImportRun.objects.get()
+    assert (import_run.kind, import_run.file) == ("LGP", "Lgpd")
+    assert (import_run.importeds, import_run.used_email) == (4, 1)
+
+    report = (tmp_path / "reports" / import_run.report).read_text()
+    assert "- ALREADY IN DB:   1" in report
+    assert "- IMPORTEDS:       4" in report
+    to_send = pd.read_csv(
+        tmp_path / "to_send_email/to_send_email__Lgpd__to_sign_lgpd.csv"
+    )
+    assert sorted(to_send.email)[-1] == "p3@mail.com"
@@ -0,0 +1,111 @@
+import pytest
+
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from base.jobs import Worker, enqueue, run_job, task
+from base.models import Job
+
+calls = []
+
+
+@task(name="tests.add")
+def add(job, a, b):
+    job.set_progress(50, "adding")
+    calls.append((a, b))
+    return {"sum": a + b}
+
+
+@task(name="tests.fail", max_attempts=2)
+def fail(job):
+    raise ValueError("boom")
+
+
+@pytest.mark.django_db
+def test_job_runs_and_keeps_its_result():
+    job = enqueue(add, 1, b=2)
+    assert (job.status, job.args, job.kwargs) == ("PND", [1], {"b": 2})
+
+    claimed = Job.objects.claim("worker-1")
+    assert claimed.pk == job.pk
+    assert (claimed.status, claimed.attempts) == ("RUN", 1)
+    assert Job.objects.claim("worker-2") is None
+
+    assert run_job(claimed)
+    job.refresh_from_db()
+    assert (job.status, job.progress, job.result) == ("DNE", 100, {"sum": 3})
+    assert job.message == "adding"
+    assert job.locked_by == ""
+
+
+@pytest.mark.django_db
+def test_failed_job_is_retried_with_backoff_then_fails():
+    job = enqueue(fail)
+
+    assert not run_job(Job.objects.claim("worker-1"))
+    job.refresh_from_db()
+    assert job.status == "PND"
+    assert "ValueError: boom" in job.error
+    assert job.run_after > timezone.now() + timedelta(seconds=20)
+    # not due yet
+    assert Job.objects.claim("worker-1") is None
+
+    Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+    assert not run_job(Job.objects.claim("worker-1"))
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == ("ERR", 2)
+
+
+@pytest.mark.django_db
+def test_unknown_task_fails():
+    job = Job.objects.enqueue("tests.nope", max_attempts=1)
+    run_job(Job.objects.claim("worker-1"))
+    job.refresh_from_db()
+    assert job.status == "ERR"
+    assert "unknown task" in job.error
+
+
+@pytest.mark.django_db
+def test_stale_jobs_are_requeued():
+    job = enqueue(add, 1, 1)
+    Job.objects.claim("worker-1")
+    assert Job.objects.requeue_stale(60) == 0
+    Job.objects.filter(pk=job.pk).update(
+        locked_on=timezone.now() - timedelta(minutes=5)
+    )
+    assert Job.objects.requeue_stale(60) == 1
+    assert Job.objects.get(pk=job.pk).status == "PND"
+
+
+@pytest.mark.django_db
+def test_worker_runs_the_queue_in_burst_mode():
+    calls.clear()
+    for n in range(3):
+        enqueue(add, n, n)
+    assert Worker(burst=True).run() == 3
+    assert sorted(calls) == [(0, 0), (1, 1), (2, 2)]
+
+    enqueue(add, 5, 5)
+    call_command("run_jobs", "--burst")
+    assert not Job.objects.exclude(status="DNE").exists()
+
+
+@pytest.mark.django_db
+def test_job_progress_view(auto_login_user, create_user):
+    client, user = auto_login_user()
+    job = enqueue(add, 1, 2, made_by=user)
+    url = reverse("job_progress", args=[job.pk])
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert 'hx-trigger="every 2s"' in response.content.decode()
+
+    Job.objects.filter(pk=job.pk).update(status="DNE", progress=100)
+    assert "hx-trigger" not in client.get(url).content.decode()
+
+    other = enqueue(add, 1, 2, made_by=create_user())
+    url = reverse("job_progress", args=[other.pk])
+    assert client.get(url).status_code == 404
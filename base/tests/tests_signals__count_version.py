@@ -0,0 +1,29 @@
+import pytest
+
+from base.signals import COUNTED_MODELS
+from rcadmin.common import get_cache_version, get_count_version_key
+
+
+@pytest.mark.parametrize("model", COUNTED_MODELS)
+def test_every_counted_model_tracks_its_center(model):
+    assert "center" in model.tracked_fields
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("create", ["create_event", "create_workgroup"])
+def test_moving_to_another_center_bumps_both_centers(
+    create, request, create_center
+):
+    obj = request.getfixturevalue(create)()
+    old_center, new_center = obj.center, create_center(name="Other")
+
+    def get_versions():
+        return [
+            get_cache_version(get_count_version_key(type(obj), center.pk))
+            for center in (old_center, new_center)
+        ]
+
+    versions = get_versions()
+    obj.center = new_center
+    obj.save()
+    assert all(new > old for new, old in zip(get_versions(), versions))
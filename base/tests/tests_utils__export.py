@@ -0,0 +1,86 @@
+import csv
+from io import BytesIO, StringIO
+from types import SimpleNamespace
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from base.export import export, frame_rows, queryset_rows
+from publicwork.models import Seeker
+from rcadmin.common import SEEKER_STATUS
+
+
+def get_request(**params):
+    return SimpleNamespace(GET=params)
+
+
+def read_csv(response):
+    content = b"".join(response.streaming_content).decode()
+    return list(csv.reader(StringIO(content)))
+
+
+def read_xlsx(response):
+    content = b"".join(response.streaming_content)
+    return list(openpyxl.load_workbook(BytesIO(content)).active.values)
+
+
+@pytest.mark.django_db
+def test_queryset_rows_are_read_lazily_with_labels(
+    create_center, create_seeker
+):
+    center = create_center()
+    for name in ["Ana Maria", "Bruno Lima"]:
+        seeker = create_seeker(center=center, name=name)
+        seeker.status = "MBR"
+        seeker.save()
+    queryset = Seeker.objects.order_by("name_sa")
+
+    with CaptureQueriesContext(connection) as context:
+        rows = queryset_rows(
+            queryset, ["name", "status"], {"status": SEEKER_STATUS}
+        )
+        assert len(context.captured_queries) == 0
+        assert list(rows) == [
+            ["Ana Maria", "member"],
+            ["Bruno Lima", "member"],
+        ]
+    assert len(context.captured_queries) == 1
+    assert queryset._result_cache is None
+
+
+def test_export_csv():
+    frame = pd.DataFrame({"name": ["Ana", "Bia"], "freqs": [3, 1]})
+    response = export(
+        get_request(format="csv"), ["name", "freqs"], frame_rows(frame), "r"
+    )
+    assert response.streaming
+    assert response["Content-Disposition"] == 'attachment; filename="r.csv"'
+    assert read_csv(response) == [
+        ["name", "freqs"],
+        ["Ana", "3"],
+        ["Bia", "1"],
+    ]
+
+
+def test_export_csv_converts_the_cells():
+    rows = [("Ana", float("nan"), 3)]
+    response = export(
+        get_request(format="csv"), ["name", "obs", "freqs"], rows, "r"
+    )
+    assert read_csv(response)[1] == ["Ana", "", "3"]
+
+
+def test_export_xlsx_converts_the_cells():
+    now = timezone.now().replace(microsecond=0)
+    rows = [("Ana", now, float("nan"), 3)]
+    response = export(get_request(), ["name", "on", "obs", "freqs"], rows, "r")
+    assert "r.xlsx" in response["Content-Disposition"]
+    assert read_xlsx(response) == [
+        ("name", "on", "obs", "freqs"),
+        ("Ana", timezone.make_naive(now), None, 3),
+    ]
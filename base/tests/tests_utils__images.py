@@ -0,0 +1,111 @@
+import pytest
+
+from io import BytesIO
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from base import images
+from base.images import get_url
+from base.jobs import run_job
+from base.models import ImageRendition, Job
+from user.models import Profile
+
+
+def get_upload(name="me.jpg", size=(1200, 900), color="red"):
+    content = BytesIO()
+    Image.new("RGB", size, color).save(content, format="JPEG")
+    return SimpleUploadedFile(name, content.getvalue())
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def profile(media, create_user):
+    return Profile.objects.get(user=create_user())
+
+
+def upload(profile, file, capture):
+    with capture(execute=True):
+        profile.image = file
+        profile.save()
+    return ImageRendition.objects.get(source=profile.image.name)
+
+
+@pytest.mark.django_db
+def test_an_upload_is_processed_once_by_a_job(
+    profile, django_capture_on_commit_callbacks, monkeypatch
+):
+    rendition = upload(
+        profile, get_upload(), django_capture_on_commit_callbacks
+    )
+    assert rendition.status == "PND"
+    assert get_url(profile.image) == "/static/images/placeholder.png"
+
+    assert run_job(Job.objects.claim("worker-1"))
+    rendition.refresh_from_db()
+    assert rendition.is_ready
+    assert sorted(rendition.files) == ["detail", "list", "thumbnail"]
+    for name, size in images.RENDITIONS.items():
+        assert rendition.digest in rendition.files[name]
+        with default_storage.open(rendition.files[name]) as _file:
+            assert max(Image.open(_file).size) == size
+    assert get_url(profile.image, "thumbnail").endswith(
+        f"{rendition.digest}_thumbnail.jpg"
+    )
+    # the original is kept as it was uploaded
+    assert Image.open(profile.image.path).size == (1200, 900)
+
+    # the other saves leave the image alone
+    monkeypatch.setattr(images, "render", pytest.fail)
+    with django_capture_on_commit_callbacks(execute=True):
+        profile.city = "Campinas"
+        profile.save()
+        profile.user.save()
+    assert Job.objects.filter(status="PND").count() == 0
+
+
+@pytest.mark.django_db
+def test_the_same_content_reuses_the_renditions(
+    profile, create_user, django_capture_on_commit_callbacks
+):
+    upload(profile, get_upload(), django_capture_on_commit_callbacks)
+    assert run_job(Job.objects.claim("worker-1"))
+
+    other = Profile.objects.get(user=create_user())
+    rendition = upload(
+        other, get_upload("other.jpg"), django_capture_on_commit_callbacks
+    )
+    assert run_job(Job.objects.claim("worker-1"))
+    rendition.refresh_from_db()
+
+    assert ImageRendition.objects.values("digest").distinct().count() == 1
+    folder = rendition.files["list"].rsplit("/", 1)[0]
+    assert len(default_storage.listdir(folder)[1]) == 3
+
+
+@pytest.mark.django_db
+def test_the_defaults_have_no_renditions(profile):
+    assert get_url(profile.image) == profile.image.url
+    assert not ImageRendition.objects.exists()
+
+
+@pytest.mark.django_db
+def test_the_old_uploads_are_queued_by_the_command(
+    profile, django_capture_on_commit_callbacks
+):
+    default_storage.save("profile_pics/old.jpg", get_upload())
+    Profile.objects.filter(pk=profile.pk).update(image="profile_pics/old.jpg")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("build_renditions")
+        call_command("build_renditions")
+
+    assert ImageRendition.objects.get().source == "profile_pics/old.jpg"
+    assert Job.objects.count() == 1
@@ -0,0 +1,229 @@
+import pytest
+
+import pandas as pd
+
+from django.urls import reverse
+
+from base.importer import PeopleImporter
+from base.jobs import enqueue, run_job
+from base.models import ImportRun, Job
+from base.tasks import import_people
+from person.models import Invitation
+
+COLUMNS = (
+    "name,birth,gender,cpf,id_card,address,number,complement,district,city,"
+    "state,country,zip,phone,cell_phone,email,sos_contact,sos_phone,obs,obs2,"
+    "A1,A2,A3,A4,GR,A5,A6,from,to,date"
+)
+
+
+def get_row(n, email, **fields):
+    row = dict.fromkeys(COLUMNS.split(","), "")
+    row.update(
+        name=f"PUPIL NUMBER {n}",
+        birth="1980-01-31",
+        gender="M",
+        city="Campinas",
+        state="sp",
+        cell_phone="11987654321",
+        email=email,
+        A1="2010-05-01",
+    )
+    row.update(fields)
+    return row
+
+
+@pytest.fixture
+def import_path(tmp_path):
+    for folder in (
+        "reports",
+        "used_email",
+        "to_send_email",
+        "without_email",
+        "duplicate_email",
+    ):
+        (tmp_path / folder).mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def people_file(import_path, create_center, create_user, create_invitation):
+    center = create_center()
+    create_user(email="used@mail.com")
+    invite = create_invitation(center)
+    invite.email = "invited@mail.com"
+    invite.save()
+
+    rows = [get_row(n, f"pupil{n}@mail.com") for n in range(5)]
+    rows[0].update(cpf="529.982.247-25", obs="first", A2="2015-05-01")
+    rows[1].update(birth="")
+    rows.append(get_row(5, "used@mail.com"))
+    rows.append(get_row(6, "invited@mail.com"))
+    pd.DataFrame(rows).to_csv(import_path / "people.csv", index=False)
+    pd.DataFrame([get_row(7, "")]).to_csv(
+        import_path / "without_email/without_email__people.csv", index=False
+    )
+    return center
+
+
+@pytest.mark.django_db
+def test_importer_inserts_the_invitations_in_chunks(
+    import_path, people_file, django_assert_max_num_queries
+):
+    chunks = []
+    importer = PeopleImporter(
+        people_file,
+        "people",
+        path=str(import_path),
+        chunk_size=3,
+        on_chunk=chunks.append,
+    )
+    # the used emails, then one insert by chunk (each in a transaction)
+    with django_assert_max_num_queries(12):
+        importer.run()
+
+    assert chunks == [4, 7, 8]
+    assert len(importer.importeds) == 5
+    assert [row["email"] for row in importer.used_email] == [
+        "used@mail.com",
+        "invited@mail.com",
+    ]
+
+    invite = Invitation.objects.get(email="pupil0@mail.com")
+    assert invite.name == "Pupil Number 0"
+    assert invite.center == people_file
+    assert (invite.state, invite.phone) == ("SP", "+55 11 98765-4321")
+    assert invite.id_card == "529.982.247-25"
+    assert invite.historic == {"A1": "2010-05-01", "A2": "2015-05-01"}
+    assert invite.observations == "| first "
+    assert invite.migration
+    assert Invitation.objects.get(email="pupil1@mail.com").birth is None
+
+    report = (import_path / "reports/people__report.txt").read_text()
+    assert "- ENTRIES:         8" in report
+    assert "- IMPORTEDS:       5" in report
+    assert "- WITHOUT_EMAIL:   1" in report
+    assert "- USED_EMAIL:      2" in report
+    assert "1 - Pupil Number 0 - pupil0@mail.com" in report
+
+    to_send = pd.read_csv(
+        import_path / "to_send_email/to_send_email__people.csv"
+    )
+    assert len(to_send) == 5
+    assert to_send.link[0].endswith(f"/{invite.pk}/")
+    used = pd.read_csv(import_path / "used_email/used_email__people.csv")
+    assert list(used.email) == ["used@mail.com", "invited@mail.com"]
+
+
+@pytest.fixture
+def import_run(import_path, people_file, monkeypatch):
+    monkeypatch.setattr("base.importer.IMPORT_PATH", str(import_path))
+    monkeypatch.setattr("base.importer.CHUNK_SIZE", 3)
+    return ImportRun.objects.create(
+        center=people_file, file_name="people", entries=8
+    )
+
+
+@pytest.mark.django_db
+def test_importer_cuts_the_values_to_their_fields(import_path, create_center):
+    rows = [
+        get_row(0, "long@mail.com", name="Maria " * 16, address="Rua " * 40),
+        get_row(1, "short@mail.com"),
+    ]
+    pd.DataFrame(rows).to_csv(import_path / "people.csv", index=False)
+    PeopleImporter(create_center(), "people", path=str(import_path)).run()
+
+    invite = Invitation.objects.get(email="long@mail.com")
+    assert len(invite.name) == Invitation._meta.get_field("name").max_length
+    assert len(invite.address) == (
+        Invitation._meta.get_field("address").max_length
+    )
+    assert Invitation.objects.filter(email="short@mail.com").exists()
+
+
+@pytest.mark.django_db
+def test_import_people_task_reports_the_progress(import_run):
+    job = enqueue(import_people, import_run.pk)
+    assert run_job(Job.objects.claim("worker-1"))
+
+    job.refresh_from_db()
+    assert (job.status, job.progress) == ("DNE", 100)
+    assert job.result["report"] == "people__report.txt"
+    import_run.refresh_from_db()
+    assert (import_run.status, import_run.rows) == ("DNE", 8)
+    # the entry in the history of the imports
+    assert (import_run.entries, import_run.importeds) == (8, 5)
+    assert (import_run.without_email, import_run.used_email) == (1, 2)
+    assert import_run.duration is not None
+    assert Invitation.objects.filter(migration=True).count() == 5
+
+
+@pytest.mark.django_db
+def test_interrupted_import_goes_on_from_its_checkpoint(
+    import_path, import_run, monkeypatch
+):
+    get_invitation = PeopleImporter.get_invitation
+
+    def crash(self, row):
+        if row["email"] == "pupil4@mail.com":
+            raise OSError("worker killed")
+        return get_invitation(self, row)
+
+    monkeypatch.setattr(PeopleImporter, "get_invitation", crash)
+    enqueue(import_people, import_run.pk)
+    assert not run_job(Job.objects.claim("worker-1"))
+
+    # the first chunk was kept, with its checkpoint
+    import_run.refresh_from_db()
+    assert import_run.status == "ERR"
+    assert "worker killed" in import_run.error
+    assert (import_run.rows, import_run.state["done"]) == (4, 3)
+    # only the counters, the rows to report are in the files
+    assert import_run.state["written"] == {
+        "used_email": 0,
+        "to_send_email": 3,
+    }
+    to_send = import_path / "to_send_email/to_send_email__people.csv"
+    assert len(pd.read_csv(to_send)) == 3
+    # a row written by a chunk that was not committed
+    with open(to_send, "a") as _file:
+        _file.write("Lost,lost@mail.com,link\n")
+    assert Invitation.objects.filter(migration=True).count() == 3
+
+    monkeypatch.setattr(PeopleImporter, "get_invitation", get_invitation)
+    read = []
+    importer = PeopleImporter(
+        import_run.center,
+        "people",
+        import_run=import_run,
+        on_chunk=read.append,
+    ).run()
+
+    assert read == [7, 8]
+    assert Invitation.objects.filter(migration=True).count() == 5
+    assert len(importer.importeds) == 5
+    assert len(importer.without_email) == 1
+    assert ImportRun.objects.get(pk=import_run.pk).status == "DNE"
+    report = (import_path / "reports/people__report.txt").read_text()
+    assert "- ENTRIES:         8" in report
+    assert "- IMPORTEDS:       5" in report
+    assert len(pd.read_csv(to_send)) == 5
+
+
+@pytest.mark.django_db
+def test_import_progress_and_resume_views(import_run, auto_login_user):
+    client, user = auto_login_user()
+    user.is_superuser = True
+    user.save()
+
+    url = reverse("import_progress", args=[import_run.pk])
+    assert 'hx-trigger="every 2s"' in client.get(url).content.decode()
+
+    # only a failed import can be resumed
+    url = reverse("resume_import", args=[import_run.pk])
+    assert client.post(url).status_code == 404
+
+    ImportRun.objects.filter(pk=import_run.pk).update(status="ERR")
+    assert client.post(url).status_code == 200
+    assert Job.objects.get().args == [import_run.pk]
+    assert ImportRun.objects.get(pk=import_run.pk).status == "PND"
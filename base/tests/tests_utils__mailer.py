@@ -0,0 +1,179 @@
+import pytest
+
+from datetime import timedelta
+
+from django.core import mail
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from base import mailer
+from base.mailer import Sender, Throttle, send_batch, send_csv_emails
+from base.models import Email
+from person.views.invitation import send_invitation
+
+
+@pytest.fixture
+def broken_backend(monkeypatch):
+    def send_messages(self, messages):
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr(
+        "django.core.mail.backends.locmem.EmailBackend.send_messages",
+        send_messages,
+    )
+
+
+@pytest.mark.django_db
+def test_invitation_is_queued_and_rendered_when_sent(
+    create_center, create_invitation
+):
+    invite = create_invitation(create_center())
+    send_invitation(None, invite)
+    assert len(mail.outbox) == 0
+
+    email = Email.objects.get()
+    assert (email.to, email.status) == (invite.email, "PND")
+
+    # the object is kept as a reference and read when the email is sent
+    mailer.send_email(
+        body_text="person/invitation/emails/to_congratulate.txt",
+        body_html="person/invitation/emails/to_congratulate.html",
+        _subject="cadastro realizado",
+        _to=invite.email,
+        _context={"object": invite},
+    )
+    invite.name = "Renamed Pupil"
+    invite.save()
+
+    assert Sender(burst=True).run() == 2
+    assert len(mail.outbox) == 2
+    assert str(invite.pk) in mail.outbox[0].body
+    assert "Renamed Pupil" in mail.outbox[1].body
+    assert mail.outbox[1].alternatives[0][1] == "text/html"
+    assert not Email.objects.exclude(status="SNT").exists()
+
+
+@pytest.mark.django_db
+def test_a_batch_uses_one_connection(monkeypatch):
+    connections = []
+    get_connection = mailer.get_connection
+
+    def counted_connection():
+        connections.append(get_connection())
+        return connections[-1]
+
+    monkeypatch.setattr(mailer, "get_connection", counted_connection)
+    for n in range(5):
+        mailer.send_email("a.txt", "a.html", "test", f"p{n}@mail.com")
+    monkeypatch.setattr(mailer, "render_to_string", lambda name, ctx: name)
+
+    assert send_batch("sender-1", batch_size=3) == 3
+    assert send_batch("sender-1", batch_size=3) == 2
+    assert send_batch("sender-1", batch_size=3) == 0
+    assert len(connections) == 2
+    assert len(mail.outbox) == 5
+
+
+@pytest.mark.django_db
+def test_failed_email_is_retried_with_backoff_then_fails(broken_backend):
+    email = mailer.send_email("a.txt", "a.html", "test", "p@mail.com")
+    Email.objects.filter(pk=email.pk).update(max_attempts=2)
+
+    assert send_batch("sender-1") == 1
+    email.refresh_from_db()
+    assert (email.status, email.attempts) == ("PND", 1)
+    assert email.send_after > timezone.now() + timedelta(seconds=50)
+    assert send_batch("sender-1") == 0
+
+    Email.objects.filter(pk=email.pk).update(send_after=timezone.now())
+    send_batch("sender-1")
+    email.refresh_from_db()
+    assert (email.status, email.attempts) == ("ERR", 2)
+    assert email.error
+
+
+@pytest.mark.django_db
+def test_stale_emails_are_requeued():
+    email = mailer.send_email("a.txt", "a.html", "test", "p@mail.com")
+    Email.objects.claim("sender-1", 10)
+    Email.objects.filter(pk=email.pk).update(
+        locked_on=timezone.now() - timedelta(hours=1)
+    )
+    assert Email.objects.requeue_stale(60) == 1
+    assert Email.objects.get(pk=email.pk).status == "PND"
+
+
+def test_throttle_keeps_the_rate(monkeypatch):
+    pauses = []
+    monkeypatch.setattr(mailer.time, "sleep", pauses.append)
+    throttle = Throttle(rate=2)
+    for _ in range(3):
+        throttle.wait()
+    assert len(pauses) == 2
+    assert all(0.4 < pause <= 0.5 for pause in pauses)
+
+    pauses.clear()
+    Throttle(rate=0).wait()
+    Throttle(rate=0).wait()
+    assert pauses == []
+
+
+@pytest.mark.django_db
+def test_the_rate_is_kept_across_the_batches(monkeypatch):
+    for number in range(3):
+        mailer.send_email("a.txt", "a.html", "test", f"p{number}@mail.com")
+    monkeypatch.setattr(mailer, "get_message", lambda *args: None)
+    monkeypatch.setattr(
+        "django.core.mail.backends.locmem.EmailBackend.send_messages",
+        lambda self, messages: len(messages),
+    )
+    pauses = []
+    monkeypatch.setattr(mailer.time, "sleep", pauses.append)
+
+    assert Sender(burst=True, batch_size=1, rate=2).run() == 3
+    assert len(pauses) == 2
+    assert Email.objects.filter(status="SNT").count() == 3
+
+
+@pytest.mark.django_db
+def test_csv_emails_are_queued_once(tmp_path):
+    path = tmp_path / "to_send_email__people.csv"
+    path.write_text(
+        "name,email,link\n"
+        "Ana,ana@mail.com,http://x/1\n"
+        "Bia,,http://x/2\n"
+        "Cid,cid@mail.com,http://x/3\n"
+    )
+    args = (
+        "person/invitation/emails/confirm_invitation.txt",
+        "person/invitation/emails/confirm_invitation.html",
+        "Convite para ser aluno",
+    )
+    assert send_csv_emails(str(path), *args) == 2
+    assert send_csv_emails(str(path), *args) == 0
+
+    call_command("send_emails", "--burst")
+    assert sorted(message.to[0] for message in mail.outbox) == [
+        "ana@mail.com",
+        "cid@mail.com",
+    ]
+    assert any("http://x/3" in message.body for message in mail.outbox)
+
+
+@pytest.mark.django_db
+def test_send_emails_view(auto_login_user, create_user, tmp_path, monkeypatch):
+    monkeypatch.setattr("base.views.tools.IMPORT_PATH", str(tmp_path))
+    (tmp_path / "to_send_email").mkdir()
+    (tmp_path / "to_send_email" / "to_send_email__people.csv").write_text(
+        "name,email,link\nAna,ana@mail.com,http://x/1\n"
+    )
+    user = create_user()
+    user.is_superuser = True
+    user.save()
+    client, user = auto_login_user(user=user)
+
+    url = reverse("send_emails", args=["people.csv"])
+    response = client.post(url)
+    assert response.status_code == 302
+    assert Email.objects.get().batch == "to_send_email__people.csv"
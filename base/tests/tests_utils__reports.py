@@ -0,0 +1,338 @@
+import pytest
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from base.utils import (
+    get_breakdown,
+    get_frequencies_frame,
+    get_installed_per_period_frame,
+    get_lectures_frame,
+    get_occurrences_per_period_frame,
+    get_seekers_frame,
+    queryset_per_date,
+)
+from person.models import Historic, Person
+from publicwork.models import Lecture, Listener, Seeker
+
+
+def get_request(center, **params):
+    today = timezone.now().date()
+    params.setdefault("dt1", str(today - timedelta(30)))
+    params.setdefault("dt2", str(today))
+    request = RequestFactory().get("/", params)
+    request.user = SimpleNamespace(person=SimpleNamespace(center=center))
+    request.session = SessionStore()
+    return request
+
+
+# the row by row builders replaced by the frames
+def get_installed_rows(center):
+    return [
+        dict(
+            pk=obj.pk,
+            name=obj.short_name,
+            local=f"{obj.user.profile.city} ({obj.user.profile.state})",
+            status=obj.get_status_display(),
+            aspect=obj.get_aspect_display(),
+            date=obj.aspect_date,
+        )
+        for obj in Person.objects.filter(center=center, aspect="A1").order_by(
+            "-aspect_date"
+        )
+    ]
+
+
+def get_occurrences_rows(center):
+    return [
+        dict(
+            pk=obj.pk,
+            name=obj.person.short_name,
+            local="{} ({})".format(
+                obj.person.user.profile.city, obj.person.user.profile.state
+            ),
+            occurrence=obj.get_occurrence_display(),
+            description=obj.description,
+            date=obj.date,
+        )
+        for obj in Historic.objects.filter(person__center=center).order_by(
+            "-date"
+        )
+    ]
+
+
+def get_lectures_rows(request):
+    return [
+        dict(
+            pk=obj.pk,
+            date=obj.date,
+            theme=obj.theme,
+            type=str(obj.get_type_display()),
+            listeners=obj.listener_set.count(),
+            center=str(obj.center),
+            center_city=obj.center.city,
+            center_state=obj.center.state,
+            center_country=obj.center.country,
+        )
+        for obj in queryset_per_date(request, Lecture)
+    ]
+
+
+def get_frequencies_rows(request):
+    return [
+        dict(
+            pk=freq.pk,
+            obs=freq.observations,
+            lect_pk=freq.lecture.pk,
+            lect_theme=freq.lecture.theme,
+            lect_type=str(freq.lecture.get_type_display()),
+            lect_date=freq.lecture.date,
+            lect_center=str(freq.lecture.center),
+            seek_pk=freq.seeker.pk,
+            seek_name=freq.seeker.short_name,
+            seek_birth=freq.seeker.birth,
+            seek_gender=freq.seeker.gender,
+            seek_city=freq.seeker.city,
+            seek_state=freq.seeker.state,
+            seek_country=freq.seeker.country,
+            seek_local=f"{freq.seeker.city} ({freq.seeker.state})",
+            seek_center=str(freq.seeker.center),
+            seek_status=str(freq.seeker.get_status_display()),
+            seek_status_date=freq.seeker.status_date,
+            seek_is_active=freq.seeker.is_active,
+        )
+        for obj in queryset_per_date(request, Lecture)
+        for freq in obj.listener_set.all()
+        if freq.seeker.is_active
+    ]
+
+
+def get_seekers_rows(center):
+    return [
+        dict(
+            pk=obj.pk,
+            name=obj.short_name,
+            birth=obj.birth,
+            gender=obj.gender,
+            city=obj.city,
+            state=obj.state,
+            country=obj.country,
+            local=f"{obj.city} ({obj.state})",
+            center=str(obj.center),
+            status=obj.get_status_display(),
+            status_date=obj.status_date,
+        )
+        for obj in Seeker.objects.filter(
+            center=center, is_active=True
+        ).order_by("name_sa")
+    ]
+
+
+def get_records(frame, key=None):
+    records = frame.to_dict("records")
+    return sorted(records, key=lambda row: row[key]) if key else records
+
+
+@pytest.fixture
+def publicwork_data(create_center, create_seeker, create_lecture):
+    center = create_center()
+    other_center = create_center()
+    today = timezone.now().date()
+    seekers = [
+        create_seeker(center=center, name="Ana Maria"),
+        create_seeker(center=center, name="Bruno Lima"),
+        create_seeker(center=other_center, name="Carla Dias"),
+    ]
+    seekers[0].status = "MBR"
+    seekers[0].status_date = today
+    seekers[0].save()
+    inactive = create_seeker(center=center, name="Davi Souza")
+    inactive.is_active = False
+    inactive.save()
+
+    lectures = [
+        create_lecture(center=center, date=today),
+        create_lecture(center=center, date=today - timedelta(1)),
+        create_lecture(center=other_center, date=today),
+    ]
+    lectures[1].type = "MET"
+    lectures[1].save()
+    for lecture, seeker in [
+        (lectures[0], inactive),
+        (lectures[0], seekers[0]),
+        (lectures[0], seekers[1]),
+        (lectures[1], seekers[0]),
+        (lectures[2], seekers[2]),
+    ]:
+        Listener.objects.create(lecture=lecture, seeker=seeker)
+    return center
+
+
+@pytest.mark.django_db
+def test_lectures_frame_matches_the_lectures(publicwork_data):
+    request = get_request(publicwork_data)
+    frame = get_lectures_frame(request, Lecture)
+    assert get_records(frame) == get_lectures_rows(request)
+    assert list(frame["listeners"]) == [3, 1]
+
+
+@pytest.mark.django_db
+def test_lectures_frame_of_all_centers(publicwork_data):
+    request = get_request(publicwork_data, all="on")
+    frame = get_lectures_frame(request, Lecture)
+    assert get_records(frame, "pk") == sorted(
+        get_lectures_rows(request), key=lambda row: row["pk"]
+    )
+
+
+@pytest.mark.django_db
+def test_frequencies_frame_matches_the_listeners(publicwork_data):
+    request = get_request(publicwork_data)
+    frame = get_frequencies_frame(request, Lecture)
+    assert get_records(frame, "pk") == sorted(
+        get_frequencies_rows(request), key=lambda row: row["pk"]
+    )
+
+
+@pytest.mark.django_db
+def test_frequencies_frame_skips_inactive_seekers(publicwork_data):
+    frame = get_frequencies_frame(get_request(publicwork_data), Lecture)
+    assert "Davi Souza" not in set(frame["seek_name"])
+    assert frame["seek_is_active"].all()
+    # no row is repeated in place of the inactive seeker
+    assert frame["pk"].is_unique
+
+
+@pytest.mark.django_db
+def test_seekers_frame_matches_the_seekers(publicwork_data):
+    request = get_request(publicwork_data, status="all")
+    frame = get_seekers_frame(request, Seeker)
+    assert get_records(frame) == get_seekers_rows(publicwork_data)
+
+
+@pytest.mark.django_db
+def test_seekers_frame_filters_by_status(publicwork_data):
+    request = get_request(publicwork_data, status="MBR")
+    frame = get_seekers_frame(request, Seeker)
+    assert list(frame["name"]) == ["Ana Maria"]
+    assert list(frame["status"]) == ["member"]
+
+
+@pytest.mark.django_db
+def test_frames_use_a_single_query(publicwork_data):
+    request = get_request(publicwork_data, status="all")
+    for get_frame, model in [
+        (get_lectures_frame, Lecture),
+        (get_frequencies_frame, Lecture),
+        (get_seekers_frame, Seeker),
+    ]:
+        with CaptureQueriesContext(connection) as context:
+            get_frame(request, model)
+        assert len(context.captured_queries) == 1
+
+
+@pytest.mark.django_db
+def test_frames_without_rows_keep_their_columns(create_center):
+    request = get_request(create_center(), status="all")
+    frame = get_frequencies_frame(request, Lecture)
+    assert frame.empty
+    assert "seek_local" in frame.columns
+    assert get_seekers_frame(request, Seeker).empty
+
+
+#  person reports  ############################################################
+@pytest.fixture
+def person_data(create_center, create_person):
+    center = create_center()
+    today = timezone.now().date()
+    for name, aspect, days, occurrence in [
+        ("Ana Maria", "A1", 0, "A1"),
+        ("Bruno Lima", "A1", 40, "TRF"),
+        ("Carla Dias", "A2", 3, "A2"),
+        ("Davi Souza", "A1", 400, "OTH"),
+    ]:
+        person = create_person(center=center, name=name)
+        person.aspect = aspect
+        person.aspect_date = today - timedelta(days)
+        person.status = "ACT"
+        person.save()
+        person.user.profile.city = "Campinas"
+        person.user.profile.state = "SP"
+        person.user.profile.save()
+        Historic.objects.create(
+            person=person,
+            occurrence=occurrence,
+            description=name,
+            date=today - timedelta(days),
+        )
+    return center
+
+
+def get_period_request(center, **params):
+    today = timezone.now().date()
+    return get_request(center, dt1=str(today - timedelta(60)), **params)
+
+
+@pytest.mark.django_db
+def test_installed_frame_matches_the_persons(person_data):
+    frame = get_installed_per_period_frame(
+        get_period_request(person_data), Person
+    )
+    rows = get_installed_rows(person_data)[:2]
+    assert get_records(frame[list(rows[0])]) == rows
+    assert list(frame["name"]) == ["Ana Maria", "Bruno Lima"]
+
+
+@pytest.mark.django_db
+def test_occurrences_frame_matches_the_historics(person_data):
+    frame = get_occurrences_per_period_frame(
+        get_period_request(person_data), Historic
+    )
+    rows = get_occurrences_rows(person_data)[:3]
+    assert get_records(frame[list(rows[0])]) == rows
+
+
+@pytest.mark.django_db
+def test_person_frames_use_a_single_query(person_data):
+    request = get_period_request(person_data)
+    for get_frame, model in [
+        (get_installed_per_period_frame, Person),
+        (get_occurrences_per_period_frame, Historic),
+    ]:
+        with CaptureQueriesContext(connection) as context:
+            get_frame(request, model)
+        assert len(context.captured_queries) == 1
+
+
+@pytest.mark.django_db
+def test_breakdown_per_month_and_aspect(person_data):
+    request = get_period_request(person_data, by_aspect="on")
+    frame = get_installed_per_period_frame(request, Person)
+    today = timezone.now().date()
+    months = sorted(
+        {(today - timedelta(days)).strftime("%Y-%m") for days in (0, 3, 40)}
+    )
+
+    per_aspect = get_breakdown(frame, by_aspect=True)
+    assert per_aspect["total"].to_dict() == {
+        "1st. Aspect": 2,
+        "2nd. Aspect": 1,
+        "total": 3,
+    }
+
+    per_month = get_breakdown(frame, by_month=True)
+    assert list(per_month.index) == months + ["total"]
+    assert per_month["total"].sum() == 6
+
+    both = get_breakdown(frame, by_month=True, by_aspect=True)
+    assert list(both.columns) == ["1st. Aspect", "2nd. Aspect", "total"]
+    assert both.loc["total"].to_dict() == {
+        "1st. Aspect": 2,
+        "2nd. Aspect": 1,
+        "total": 3,
+    }
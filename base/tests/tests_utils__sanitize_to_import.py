@@ -0,0 +1,128 @@
+import pytest
+
+import pandas as pd
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from faker import Faker
+
+from base import sanitize_to_import
+from base.sanitize_to_import import (
+    COLUMNS,
+    SanitizeCsv,
+    get_phones,
+    get_valid_cpfs,
+    validate,
+)
+from rcadmin.common import cpf_validation, phone_format
+
+fake = Faker("pt_BR")
+
+HEADER = "name,birth,gender,cpf,email,phone,cell_phone,sos_phone," + ",".join(
+    ["A1", "A2", "A3", "A4", "GR", "A5", "A6", "date"]
+)
+
+
+def get_frame(*rows):
+    return pd.read_csv(
+        pd.io.common.StringIO("\n".join((HEADER,) + rows)),
+        dtype={col: str for col in sanitize_to_import.TEXTS},
+    )
+
+
+def test_cpfs_are_checked_as_cpf_validation_does():
+    cpfs = [fake.cpf() for _ in range(200)]
+    cpfs += [cpf[:-1] + str((int(cpf[-1]) + 1) % 10) for cpf in cpfs[:50]]
+    cpfs += ["111.111.111-11", "00000000000", "123", "", "529.982.247-25"]
+    series = pd.Series(cpfs + [None])
+
+    assert get_valid_cpfs(series).tolist() == [
+        cpf_validation(cpf) for cpf in cpfs
+    ] + [False]
+
+
+def test_phones_are_formatted_as_phone_format_does():
+    phones = [
+        "11987654321",
+        "(11) 3456-7890",
+        "+55 11 98765-4321",
+        "+1 555 123-4567",
+        "987654321",
+        "",
+        " 11 3456 7890 ",
+    ]
+    assert get_phones(pd.Series(phones)).tolist() == [
+        phone_format(phone.strip()) for phone in phones
+    ]
+
+
+def test_validate_reports_the_errors_by_row():
+    errors = validate(
+        get_frame(
+            "Ana,1980-01-31,F,529.982.247-25,ana@mail.com,,11987654321,,"
+            "2010-01-01,,,,,,,",
+            ",1980-13-45,M,123.456.789-00,bad-email,12,,,,,,,,,,",
+            "Cid,,M,,,,,,,,,,,,,",
+        )
+    )
+    assert errors[["line", "column", "error", "level"]].values.tolist() == [
+        [3, "name", "required", "error"],
+        [3, "email", "invalid email", "error"],
+        [3, "birth", "invalid date", "error"],
+        [3, "cpf", "invalid cpf", "warning"],
+        [3, "phone", "invalid phone", "warning"],
+    ]
+
+
+def test_big_files_are_validated_in_parallel(monkeypatch):
+    monkeypatch.setattr(sanitize_to_import, "PARALLEL_ROWS", 4)
+    rows = [
+        f"P{n},1980-01-{n % 40:02},M,,p{n}@mail.com,,,,,,,,,,,"
+        for n in range(1, 40)
+    ]
+    frame = get_frame(*rows)
+
+    serial = validate(frame, processes=1)
+    assert len(serial) == 8
+    assert validate(frame, processes=2).equals(serial)
+
+
+def test_sanitize_keeps_the_errors_and_the_texts(tmp_path):
+    columns = [col for col in COLUMNS if col != "_address"]
+    rows = pd.DataFrame(
+        [
+            dict(name="Ana", birth="1980-01-31", cpf="012.345.678-99"),
+            dict(name="Bia", birth="31/31/1980", email="bia@mail.com"),
+        ],
+        columns=columns,
+    )
+    rows.loc[0, "email"] = "ana@mail.com"
+    content = rows.to_csv(index=False)
+    file = SimpleUploadedFile("people.csv", content.encode())
+    sf = SanitizeCsv(file=file, path=str(tmp_path))
+
+    assert sf.has_errors
+    assert sf.errors.line.tolist() == [2, 3]
+    assert sf.df.loc["Ana", "cpf"] == "012.345.678-99"
+    assert pd.isna(sf.df.loc["Bia", "birth"])
+
+    sf.generate_errors()
+    report = pd.read_csv(tmp_path / "errors/errors__people.csv")
+    assert report.error.tolist() == ["invalid cpf", "invalid date"]
+
+
+@pytest.mark.parametrize("processes", [None, 1])
+def test_small_files_are_validated_in_process(processes, monkeypatch):
+    monkeypatch.setattr(sanitize_to_import, "ProcessPoolExecutor", pytest.fail)
+    frame = get_frame("Ana,1980-01-31,F,,ana@mail.com,,,,,,,,,,,")
+    assert validate(frame, processes=processes).empty
+
+
+def test_the_uploads_are_validated_in_process(tmp_path, monkeypatch):
+    monkeypatch.setattr(sanitize_to_import, "PARALLEL_ROWS", 1)
+    monkeypatch.setattr(sanitize_to_import, "ProcessPoolExecutor", pytest.fail)
+    columns = [col for col in COLUMNS if col != "_address"]
+    rows = pd.DataFrame(
+        [dict(name="Ana", email="ana@mail.com")] * 2, columns=columns
+    )
+    file = SimpleUploadedFile("people.csv", rows.to_csv(index=False).encode())
+    assert not SanitizeCsv(file=file, path=str(tmp_path)).has_errors
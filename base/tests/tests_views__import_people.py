@@ -0,0 +1,126 @@
+import hashlib
+import pytest
+
+from datetime import timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+
+from base.models import ImportRun
+
+REPORT = """\
+******************************** IMPORT PEOPLE *********************************
+
+center:      {center}
+file:        people.csv
+imported_by: {user}
+imported_on: 2022-05-04 10:20:30.123456
+time:        0:00:02.500000
+
+*********************************** SUMMARY ************************************
+
+- ENTRIES:         10
+- IMPORTEDS:       6
+- WITHOUT_EMAIL:   1
+- DUPLICATE_EMAIL: 2
+- USED_EMAIL:      1
+"""
+
+
+@pytest.fixture
+def superuser_client(auto_login_user, create_user):
+    user = create_user()
+    user.is_superuser = True
+    user.save()
+    return auto_login_user(user=user)
+
+
+@pytest.fixture
+def import_path(tmp_path, monkeypatch):
+    (tmp_path / "reports").mkdir()
+    monkeypatch.setattr("base.importer.IMPORT_PATH", str(tmp_path))
+    monkeypatch.setattr("base.views.tools.IMPORT_PATH", str(tmp_path))
+    monkeypatch.setattr(
+        "base.management.commands.build_import_manifest.IMPORT_PATH",
+        str(tmp_path),
+    )
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_import_page_lists_the_manifest_without_reading_reports(
+    superuser_client, create_center, import_path
+):
+    client, user = superuser_client
+    center = create_center()
+    for name in ("first", "second"):
+        ImportRun.objects.create(
+            center=center,
+            file_name=name,
+            status="DNE",
+            entries=10,
+            importeds=7,
+            duration=timedelta(seconds=3),
+            made_by=user,
+        )
+    ImportRun.objects.create(
+        center=center, kind="LGP", file_name="CT", status="DNE", importeds=4
+    )
+
+    response = client.get(reverse("import_people"))
+    content = response.content.decode()
+    assert response.status_code == 200
+    assert "first.csv" in content and "second.csv" in content
+    assert "No file - Sign LGPD" in content
+    assert len(response.context["entries"]) == 3
+
+
+@pytest.mark.django_db
+def test_a_file_already_imported_is_found_by_its_content(
+    superuser_client, create_center, import_path
+):
+    client, user = superuser_client
+    content = b"name,email\nAna,ana@mail.com\n"
+    ImportRun.objects.create(
+        center=create_center(),
+        file_name="people",
+        file_hash=hashlib.sha256(content).hexdigest(),
+        status="DNE",
+    )
+
+    file = SimpleUploadedFile("renamed.csv", content)
+    response = client.post(reverse("import_people"), {"import_file": file})
+    assert (
+        "already been imported (as &#x27;people.csv&#x27;)"
+        in response.content.decode()
+    )
+    assert ImportRun.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_the_manifest_is_built_from_the_old_reports(
+    create_center, create_user, import_path
+):
+    user = create_user()
+    center = create_center()
+    center.short_name = "CT-1"
+    center.save()
+    (import_path / "reports/people__report.txt").write_text(
+        REPORT.format(center=center, user=user.email)
+    )
+    (import_path / "reports/unknown__report.txt").write_text(
+        REPORT.format(center="nowhere", user=user.email)
+    )
+
+    call_command("build_import_manifest")
+    call_command("build_import_manifest")
+
+    import_run = ImportRun.objects.get()
+    assert (import_run.center, import_run.made_by) == (center, user)
+    assert (import_run.file, import_run.status) == ("people.csv", "DNE")
+    assert (import_run.entries, import_run.importeds) == (10, 6)
+    assert (import_run.without_email, import_run.duplicate_email) == (1, 2)
+    assert import_run.used_email == 1
+    assert import_run.duration == timedelta(seconds=2.5)
+    assert import_run.created_on.year == 2022
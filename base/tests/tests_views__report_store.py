@@ -0,0 +1,113 @@
+import os
+import time
+from io import BytesIO
+
+import openpyxl
+import pytest
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from base import report_store
+
+
+@pytest.fixture(autouse=True)
+def report_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_store, "REPORT_PATH", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def report_client(auto_login_user, create_center, create_lecture):
+    center = create_center()
+    center.short_name = "CT-1"
+    center.save()
+    client, user = auto_login_user(group="admin", center=center)
+    create_lecture(center=center, theme="Theme_1")
+    create_lecture(center=center, theme="Theme_2")
+    return client, user
+
+
+def get_lectures_report(client):
+    today = str(timezone.now().date())
+    return client.get(
+        reverse("lectures_per_period"), {"dt1": today, "dt2": today}
+    )
+
+
+def get_report_files(path):
+    return [file for root, dirs, files in os.walk(path) for file in files]
+
+
+@pytest.mark.django_db
+def test_report_is_stored_on_disk(report_client, report_path):
+    client, user = report_client
+    get_lectures_report(client)
+
+    report = client.session["report_file"]
+    assert set(report) == {"handle", "name"}
+    assert os.path.exists(
+        report_store.get_report_path(user.pk, report["handle"])
+    )
+    # a new report replaces the previous one
+    get_lectures_report(client)
+    assert len(get_report_files(report_path)) == 1
+
+
+@pytest.mark.django_db
+def test_get_file_streams_the_stored_report(report_client):
+    client, user = report_client
+    get_lectures_report(client)
+
+    response = client.get(reverse("get_file"))
+    assert response.status_code == 200
+    assert client.session["report_file"]["name"] in (
+        response["Content-Disposition"]
+    )
+    sheet = openpyxl.load_workbook(
+        BytesIO(b"".join(response.streaming_content))
+    ).active
+    rows = list(sheet.values)
+    assert rows[0] == ("date", "theme", "type", "center", "listeners")
+    assert sorted(row[1] for row in rows[1:]) == ["Theme_1", "Theme_2"]
+
+
+@pytest.mark.django_db
+def test_expired_reports_are_cleared(report_client, report_path):
+    client, user = report_client
+    get_lectures_report(client)
+    handle = client.session["report_file"]["handle"]
+    path = report_store.get_report_path(user.pk, handle)
+    past = time.time() - report_store.REPORT_TTL - 1
+    os.utime(path, (past, past))
+
+    assert client.get(reverse("get_file")).status_code == 404
+    call_command("clear_reports")
+    assert get_report_files(report_path) == []
+
+
+@pytest.mark.django_db
+def test_get_file_without_report(auto_login_user, client):
+    assert "login" in client.get(reverse("get_file")).url
+    client, user = auto_login_user()
+    assert client.get(reverse("get_file")).status_code == 404
+
+
+@pytest.mark.django_db
+def test_get_file_converts_since_and_date(report_client, create_seeker):
+    client, user = report_client
+    seeker = create_seeker(center=user.person.center, name="Ana Maria")
+    seeker.status = "MBR"
+    seeker.status_date = timezone.now().date()
+    seeker.save()
+    client.get(reverse("status_per_center"), {"status": "MBR"})
+
+    response = client.get(reverse("get_file"))
+    sheet = openpyxl.load_workbook(
+        BytesIO(b"".join(response.streaming_content))
+    ).active
+    rows = list(sheet.values)
+    assert rows[0] == ("name", "local", "status", "since", "date")
+    assert rows[1][3] == 0
+    assert rows[1][4] == str(seeker.status_date)
@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+from django.urls import reverse
+from django.utils import timezone
+
+from base import report_store, report_viewer
+from base.report_viewer import get_report_page
+
+
+@pytest.fixture(autouse=True)
+def report_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_store, "REPORT_PATH", str(tmp_path))
+    monkeypatch.setattr(report_viewer, "REPORT_PAGE_SIZE", 2)
+
+
+def get_names(context):
+    return [cells[0] for number, cells in context["rows"]]
+
+
+def test_report_page_sorts_filters_and_paginates():
+    frame = pd.DataFrame(
+        {
+            "name": ["Carla", "Ana", "Bruno", "Alice", None],
+            "freqs": [1, 3, 2, 5, 4],
+            "since": pd.to_timedelta([1, 2, 3, 4, 5], unit="D"),
+        }
+    )
+
+    context = get_report_page(frame, {"sort": "freqs", "desc": "on"})
+    assert get_names(context) == ["Alice", ""]
+    assert (context["count"], context["pages"]) == (5, 3)
+    assert context["rows"][0] == (1, ["Alice", 5, 4])
+
+    context = get_report_page(frame, {"sort": "name", "page": "2"})
+    assert get_names(context) == ["Bruno", "Carla"]
+    assert [number for number, cells in context["rows"]] == [3, 4]
+
+    context = get_report_page(frame, {"q": "AL", "page": "9"})
+    assert get_names(context) == ["Alice"]
+    assert (context["page"], context["pages"]) == (1, 1)
+
+    # unknown columns are not sorted
+    context = get_report_page(frame, {"sort": "nope"})
+    assert context["sort"] == ""
+    assert get_names(context) == ["Carla", "Ana"]
+
+
+@pytest.mark.django_db
+def test_report_page_view_serves_the_stored_report(
+    auto_login_user, create_center, create_lecture
+):
+    center = create_center()
+    center.short_name = "CT-1"
+    center.save()
+    client, user = auto_login_user(group="admin", center=center)
+    for theme in ["Theme_3", "Theme_1", "Theme_2"]:
+        create_lecture(center=center, theme=theme)
+    today = str(timezone.now().date())
+
+    response = client.get(
+        reverse("lectures_per_period"), {"dt1": today, "dt2": today}
+    )
+    content = response.content.decode()
+    assert 'id="report-page"' in content
+    assert content.count("Theme_") == 2
+
+    response = client.get(reverse("report_page"), {"sort": "theme", "page": 2})
+    assert response.status_code == 200
+    assert response.context["columns"] == [
+        "date",
+        "theme",
+        "type",
+        "center",
+        "listeners",
+    ]
+    assert [cells[1] for number, cells in response.context["rows"]] == [
+        "Theme_3"
+    ]
+
+
+@pytest.mark.django_db
+def test_report_page_without_report(auto_login_user):
+    client, user = auto_login_user()
+    assert client.get(reverse("report_page")).status_code == 404
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import base, tools
+from .views import base, jobs, tools
 
 urlpatterns = [
     path("", base.home, name="home"),
@@ -9,7 +9,20 @@ urlpatterns = [
         name="change_color_scheme",
     ),
     path("import-people/", tools.import_people, name="import_people"),
+    path(
+        "import-people/<int:pk>/progress/",
+        tools.import_progress,
+        name="import_progress",
+    ),
+    path(
+        "import-people/<int:pk>/resume/",
+        tools.resume_import,
+        name="resume_import",
+    ),
     path("download-csv/<str:file>", tools.download_csv, name="download_csv"),
+    path("send-emails/<str:file>", tools.send_emails, name="send_emails"),
     path("clear-session/", base.clear_session, name="clear_session"),
     path("get-file/", base.get_file, name="get_file"),
+    path("report-page/", base.report_page, name="report_page"),
+    path("jobs/<int:pk>/progress/", jobs.job_progress, name="job_progress"),
 ]
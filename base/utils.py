@@ -1,46 +1,55 @@
 from datetime import datetime, timedelta
 
-from django.db.models import Q
+import pandas as pd
+
+from django.db.models import Count, Q
 from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from rcadmin.common import (
+    ASPECTS,
+    LECTURE_TYPES,
+    OCCURRENCES,
+    SEEKER_STATUS,
+    STATUS,
+)
 
 
 #  person - reports  ##########################################################
-def get_installed_per_period_dict(request, obj):
-    put_search_in_session(request)
-    search = request.session["search"]
-    get_period(request, search)
-    request.session.modified = True
+def get_installed_per_period_frame(request, obj):
+    search = put_breakdown_in_session(request)
     # basic query
     _query = [
         Q(is_active=True),
         Q(center=request.user.person.center),
-        Q(aspect="A1"),
         Q(aspect_date__range=[search["dt1"], search["dt2"]]),
     ]
+    # adding more complexity (per aspect, all the aspects reached count)
+    if not search["by_aspect"]:
+        _query.append(Q(aspect="A1"))
     # generating query
     query = Q()
     for q in _query:
         query.add(q, Q.AND)
 
-    _dict = []
-    for _obj in obj.objects.filter(query).order_by("-aspect_date"):
-        row = dict(
-            pk=_obj.pk,
-            name=_obj.short_name,
-            local=f"{_obj.user.profile.city} ({_obj.user.profile.state})",
-            status=_obj.get_status_display(),
-            aspect=_obj.get_aspect_display(),
-            date=_obj.aspect_date,
-        )
-        _dict.append(row)
-    return _dict
+    frame = get_frame(
+        obj.objects.filter(query).order_by("-aspect_date"),
+        pk="pk",
+        name="short_name",
+        city="user__profile__city",
+        state="user__profile__state",
+        status="status",
+        aspect="aspect",
+        date="aspect_date",
+    )
+    frame["local"] = get_local(frame)
+    frame["status"] = get_display(frame["status"], STATUS)
+    frame["aspect"] = get_display(frame["aspect"], ASPECTS)
+    return frame
 
 
-def get_occurrences_per_period_dict(request, obj):
-    put_search_in_session(request)
-    search = request.session["search"]
-    get_period(request, search)
-    request.session.modified = True
+def get_occurrences_per_period_frame(request, obj):
+    search = put_breakdown_in_session(request)
     # basic query
     _query = [
         Q(person__center=request.user.person.center),
@@ -51,73 +60,112 @@ def get_occurrences_per_period_dict(request, obj):
     for q in _query:
         query.add(q, Q.AND)
 
-    _dict = []
-    for _obj in obj.objects.filter(query).order_by("-date"):
-        row = dict(
-            pk=_obj.pk,
-            name=_obj.person.short_name,
-            local="{} ({})".format(
-                _obj.person.user.profile.city, _obj.person.user.profile.state
-            ),
-            occurrence=_obj.get_occurrence_display(),
-            description=_obj.description,
-            date=_obj.date,
-        )
-        _dict.append(row)
-    return _dict
+    frame = get_frame(
+        obj.objects.filter(query).order_by("-date"),
+        pk="pk",
+        name="person__short_name",
+        city="person__user__profile__city",
+        state="person__user__profile__state",
+        aspect="person__aspect",
+        occurrence="occurrence",
+        description="description",
+        date="date",
+    )
+    frame["local"] = get_local(frame)
+    frame["aspect"] = get_display(frame["aspect"], ASPECTS)
+    frame["occurrence"] = get_display(frame["occurrence"], OCCURRENCES)
+    return frame
+
+
+def get_breakdown(frame, by_month=False, by_aspect=False):
+    """
+    the number of rows of frame per month of their date and/or per aspect,
+    with the totals in the last row (and column, when both are used).
+    """
+    total = _("total")
+    positions = {str(label): pos for pos, (key, label) in enumerate(ASPECTS)}
+
+    def aspect_order(labels):
+        return labels.map(lambda label: positions.get(label, len(positions)))
+
+    month = pd.to_datetime(frame["date"]).dt.strftime("%Y-%m")
+    month.name = _("month")
+    aspect = frame["aspect"].rename(_("aspect"))
+    if by_month and by_aspect:
+        report = pd.crosstab(month, aspect, margins=True, margins_name=total)
+        return report.sort_index(axis="columns", key=aspect_order)
+
+    counts = (month if by_month else aspect).value_counts()
+    counts = counts.sort_index(key=None if by_month else aspect_order)
+    counts[total] = counts.sum()
+    return counts.to_frame(total)
 
 
 #  publicwork - reports  ######################################################
-def get_lectures_dict(request, obj):
-    _dict = []
-    for obj in queryset_per_date(request, obj):
-        row = dict(
-            pk=obj.pk,
-            date=obj.date,
-            theme=obj.theme,
-            type=str(obj.get_type_display()),
-            listeners=obj.listener_set.count(),
-            center=str(obj.center),
-            center_city=obj.center.city,
-            center_state=obj.center.state,
-            center_country=obj.center.country,
-        )
-        _dict.append(row)
-    return _dict
-
-
-def get_frequencies_dict(request, obj):
-    _dict = []
-    for obj in queryset_per_date(request, obj):
-        if obj.listener_set.count():
-            for freq in obj.listener_set.all():
-                if freq.seeker.is_active:
-                    row = dict(
-                        pk=freq.pk,
-                        obs=freq.observations,
-                        lect_pk=freq.lecture.pk,
-                        lect_theme=freq.lecture.theme,
-                        lect_type=str(obj.get_type_display()),
-                        lect_date=freq.lecture.date,
-                        lect_center=str(freq.lecture.center),
-                        seek_pk=freq.seeker.pk,
-                        seek_name=freq.seeker.short_name,
-                        seek_birth=freq.seeker.birth,
-                        seek_gender=freq.seeker.gender,
-                        seek_city=freq.seeker.city,
-                        seek_state=freq.seeker.state,
-                        seek_country=freq.seeker.country,
-                        seek_local=f"{freq.seeker.city} ({freq.seeker.state})",
-                        seek_center=str(freq.seeker.center),
-                        seek_status=str(freq.seeker.get_status_display()),
-                        seek_status_date=freq.seeker.status_date,
-                        seek_is_active=freq.seeker.is_active,
-                    )
-                _dict.append(row)
-    return _dict
-
-
-def get_seekers_dict(request, obj):
+def get_lectures_frame(request, obj):
+    queryset = queryset_per_date(request, obj).annotate(
+        listener_count=Count("listener")
+    )
+    frame = get_frame(
+        queryset,
+        pk="pk",
+        date="date",
+        theme="theme",
+        type="type",
+        listeners="listener_count",
+        center_short_name="center__short_name",
+        center_city="center__city",
+        center_state="center__state",
+        center_country="center__country",
+    )
+    frame["type"] = get_display(frame["type"], LECTURE_TYPES)
+    frame["center"] = get_center(frame, "center_")
+    return frame.drop(columns="center_short_name")
+
+
+def get_frequencies_frame(request, obj):
+    queryset = queryset_per_date(request, obj).filter(
+        listener__seeker__is_active=True
+    )
+    frame = get_frame(
+        queryset,
+        pk="listener__pk",
+        obs="listener__observations",
+        lect_pk="pk",
+        lect_theme="theme",
+        lect_type="type",
+        lect_date="date",
+        lect_short_name="center__short_name",
+        lect_country="center__country",
+        seek_pk="listener__seeker__pk",
+        seek_name="listener__seeker__short_name",
+        seek_birth="listener__seeker__birth",
+        seek_gender="listener__seeker__gender",
+        seek_city="listener__seeker__city",
+        seek_state="listener__seeker__state",
+        seek_country="listener__seeker__country",
+        seek_short_name="listener__seeker__center__short_name",
+        seek_center_country="listener__seeker__center__country",
+        seek_status="listener__seeker__status",
+        seek_status_date="listener__seeker__status_date",
+        seek_is_active="listener__seeker__is_active",
+    )
+    frame["lect_type"] = get_display(frame["lect_type"], LECTURE_TYPES)
+    frame["lect_center"] = get_center(frame, "lect_")
+    frame["seek_local"] = get_local(frame, "seek_")
+    frame["seek_center"] = get_center(frame, "seek_", "seek_center_")
+    frame["seek_status"] = get_display(frame["seek_status"], SEEKER_STATUS)
+    return frame.drop(
+        columns=[
+            "lect_short_name",
+            "lect_country",
+            "seek_short_name",
+            "seek_center_country",
+        ]
+    )
+
+
+def get_seekers_frame(request, obj):
     put_search_in_session(request)
     search = request.session["search"]
     search["status"] = (
@@ -134,27 +182,58 @@ def get_seekers_dict(request, obj):
     for q in _query:
         query.add(q, Q.AND)
 
-    _dict = []
-    for obj in obj.objects.filter(query).order_by("name_sa"):
-        if obj.is_active:
-            row = dict(
-                pk=obj.pk,
-                name=obj.short_name,
-                birth=obj.birth,
-                gender=obj.gender,
-                city=obj.city,
-                state=obj.state,
-                country=obj.country,
-                local=f"{obj.city} ({obj.state})",
-                center=str(obj.center),
-                status=obj.get_status_display(),
-                status_date=obj.status_date,
-            )
-        _dict.append(row)
-    return _dict
+    frame = get_frame(
+        obj.objects.filter(query).order_by("name_sa"),
+        pk="pk",
+        name="short_name",
+        birth="birth",
+        gender="gender",
+        city="city",
+        state="state",
+        country="country",
+        center_short_name="center__short_name",
+        center_country="center__country",
+        status="status",
+        status_date="status_date",
+    )
+    frame["local"] = get_local(frame)
+    frame["center"] = get_center(frame, "center_")
+    frame["status"] = get_display(frame["status"], SEEKER_STATUS)
+    return frame.drop(columns=["center_short_name", "center_country"])
 
 
 # helpers #####################################################################
+def get_frame(queryset, **fields):
+    """
+    a DataFrame with a column for each field, where the fields map the
+    column names to the lookups of queryset, read with a single query.
+    """
+    rows = list(queryset.values_list(*fields.values()))
+    if not rows:
+        return pd.DataFrame(columns=list(fields), dtype=object)
+    return pd.DataFrame(
+        {name: list(column) for name, column in zip(fields, zip(*rows))}
+    )
+
+
+def get_display(series, choices):
+    """the labels of the choices in series, as get_FOO_display() does."""
+    labels = {key: str(label) for key, label in choices}
+    return series.map(labels).fillna(series)
+
+
+def get_local(frame, prefix=""):
+    city = frame[f"{prefix}city"].astype(str)
+    return city + " (" + frame[f"{prefix}state"].astype(str) + ")"
+
+
+def get_center(frame, prefix, country_prefix=None):
+    """the str() of the centers, from their short_name and country."""
+    short_name = frame[f"{prefix}short_name"].astype(str)
+    country = frame[f"{country_prefix or prefix}country"].astype(str)
+    return short_name + " (" + country + ")"
+
+
 def queryset_per_date(request, obj):
     put_search_in_session(request)
     search = request.session["search"]
@@ -193,11 +272,11 @@ def get_period_subtitle(request):
 
 def get_report_file_title(request, report_name):
     if not request.GET.get("dt1") or not request.GET.get("dt1"):
-        return "{0} - {1}.xlsx".format(
+        return "{0} - {1}".format(
             "_".join(request.user.person.center.short_name.split()),
             report_name,
         )
-    return "{0} - {1} ({2} to {3}).xlsx".format(
+    return "{0} - {1} ({2} to {3})".format(
         "_".join(request.user.person.center.short_name.split()),
         report_name,
         request.GET["dt1"],
@@ -205,6 +284,16 @@ def get_report_file_title(request, report_name):
     )
 
 
+def put_breakdown_in_session(request):
+    put_search_in_session(request)
+    search = request.session["search"]
+    get_period(request, search)
+    search["by_month"] = "on" if request.GET.get("by_month") else ""
+    search["by_aspect"] = "on" if request.GET.get("by_aspect") else ""
+    request.session.modified = True
+    return search
+
+
 def put_search_in_session(request):
     if not request.session.get("search"):
         request.session["search"] = {}
@@ -1,11 +1,13 @@
 import pandas as pd
 
-from io import BytesIO
 from django.http.response import Http404
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from center.models import Center
+from ..export import export, frame_rows
+from ..report_store import load_report
+from ..report_viewer import get_report_page
 
 
 @login_required
@@ -49,23 +51,28 @@ def clear_session(request):
         del request.session[key]
 
 
+@login_required
 def get_file(request):
-    file = request.session["data_to_file"]
-    df = pd.read_json(file["content"])
+    report = load_report(request)
+    if not report:
+        raise Http404
+    df, name = report
 
     if "since" in df.columns:
-        df["since"] = df["since"].div(60 * 60 * 24 * 1000)
+        df["since"] = df["since"].dt.days
     if "date" in df.columns:
-        df["date"] = df["date"].dt.strftime("%Y-%m-%d")
-
-    buffer = BytesIO()
+        df["date"] = pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d")
 
-    with pd.ExcelWriter(buffer) as writer:
-        df.to_excel(writer, index=False)
+    return export(request, list(df.columns), frame_rows(df), name)
 
-    buffer.seek(0)
 
-    mime = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    response = HttpResponse(buffer, content_type=mime)
-    response["Content-Disposition"] = f"attachment; filename={file['name']}"
-    return response
+@login_required
+def report_page(request):
+    report = load_report(request)
+    if not report:
+        raise Http404
+    frame, name = report
+    context = get_report_page(frame, request.GET)
+    return render(
+        request, "base/reports/elements/hx/report_page_hx.html", context
+    )
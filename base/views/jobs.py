@@ -0,0 +1,15 @@
+from django.contrib.auth.decorators import login_required
+from django.http.response import Http404
+from django.shortcuts import get_object_or_404, render
+
+from ..models import Job
+
+
+@login_required
+def job_progress(request, pk):
+    job = get_object_or_404(Job, pk=pk)
+    if job.made_by != request.user and not request.user.is_superuser:
+        raise Http404
+    return render(
+        request, "base/jobs/elements/hx/job_progress_hx.html", {"job": job}
+    )
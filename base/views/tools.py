@@ -1,33 +1,32 @@
+import hashlib
 import os
-import re
-
-from datetime import datetime
 
+from django.contrib import messages
 from django.contrib.auth.decorators import user_passes_test
-from django.shortcuts import render, HttpResponse
+from django.shortcuts import get_object_or_404, redirect, render, HttpResponse
+from django.db.models import Q
 from django.utils.translation import gettext as _
-from django.conf import settings
 from center.models import Center
 from ..forms import CenterForm
+from base.importer import IMPORT_PATH
+from base.jobs import enqueue
+from base.mailer import send_csv_emails
+from base.models import ImportRun
 from base.sanitize_to_import import SanitizeCsv
-
-from scripts.import_people import run as _import_people
-
-
-IMPORT_PATH = f"{os.path.dirname(settings.BASE_DIR)}/imports"
+from base.tasks import import_people as import_people_task
 
 
 @user_passes_test(lambda u: u.is_superuser)
 def import_people(request):
-    # geting imported files
-    txt_files = get_txt_files(f"{IMPORT_PATH}/reports")
-
     context = {
         "title": _("import people"),
-        "entries": get_entries(IMPORT_PATH, txt_files) if txt_files else [],
+        "entries": ImportRun.objects.filter(status="DNE").select_related(
+            "center", "made_by"
+        ),
         "form": CenterForm(),
         "search": "base/searchs/modal_import_people.html",
         "import_path": IMPORT_PATH,
+        "import_runs": ImportRun.objects.exclude(status="DNE"),
     }
 
     if request.GET.get("report"):
@@ -41,11 +40,15 @@ def import_people(request):
         # get file from request.FILES
         file = request.FILES["import_file"]
 
-        # checking if the file has already been imported
-        if file.name in get_all_files(IMPORT_PATH):
-            context["error"] = (
-                "The '%s' file has already been imported!" % file.name
-            )
+        # checking if the file has already been imported (by its content)
+        file_hash = get_file_hash(file)
+        imported = ImportRun.objects.filter(
+            Q(file_hash=file_hash)
+            | Q(kind="IMP", file_name=file.name.split(".")[0])
+        ).first()
+        if imported:
+            message = "The '%s' file has already been imported (as '%s')!"
+            context["error"] = message % (file.name, imported.file)
             return render(request, "base/import_people.html", context)
 
         # checking if the file is of type .csv
@@ -57,7 +60,7 @@ def import_people(request):
         # sanitize the file if it is a consistent file
         sf = SanitizeCsv(
             file=file,
-            path=f"{os.path.dirname(settings.BASE_DIR)}/imports",
+            path=IMPORT_PATH,
         )
 
         # checking if the dataframe is ok
@@ -65,68 +68,70 @@ def import_people(request):
             context["error"] = "The '%s' file is inconsistent!" % file.name
             return render(request, "base/import_people.html", context)
 
+        # checking the rows, before any change in the database
+        if not sf.errors.empty:
+            sf.generate_errors()
+            context["errors_file"] = file.name
+        if sf.has_errors:
+            context["error"] = "The '%s' file has %s rows with errors!" % (
+                file.name,
+                sf.errors.query("level == 'error'").line.nunique(),
+            )
+            return render(request, "base/import_people.html", context)
+
         # if dataframe is ok, adjust data and generate .csv files
         sf.adjust_data()
         sf.generate_files()
 
-        # call script import_people
-        center = Center.objects.get(id=request.POST.get("conf_center"))
-        _import_people(center.name, file.name.split(".")[0])
-
-        # read report file
-        file_name = ".".join(_file[:-1])
-        with open(
-            f"{IMPORT_PATH}/reports/{file_name}__report.txt", "r"
-        ) as _file:
-            report_data = _file.readlines()
-
-        context["entries"] = get_entries(
-            IMPORT_PATH, get_txt_files(IMPORT_PATH)
+        # import the people in background (see base.tasks)
+        import_run = ImportRun.objects.create(
+            center=Center.objects.get(id=request.POST.get("conf_center")),
+            file_name=file.name.split(".")[0],
+            file_hash=file_hash,
+            entries=len(sf.df),
+            made_by=request.user,
         )
-        context["report_data"] = report_data
-        context["show_report"] = "show"
+        enqueue(import_people_task, import_run.pk, made_by=request.user)
+        context["import_runs"] = [import_run]
 
         return render(request, "base/import_people.html", context)
 
     return render(request, "base/import_people.html", context)
 
 
-# handlers
-def get_all_files(path):
-    return [file for file in os.listdir(path)]
-
-
-def get_txt_files(path):
-    return [file for file in os.listdir(path) if ".txt" in file]
+@user_passes_test(lambda u: u.is_superuser)
+def import_progress(request, pk):
+    import_run = get_object_or_404(ImportRun, pk=pk)
+    return render(
+        request,
+        "base/imports/elements/hx/import_progress_hx.html",
+        {"import_run": import_run},
+    )
 
 
-def get_entries(path, files):
-    # header of each data imported
-    data = ("center", "file", "imported_", "time", "- ")
+# go on with a failed import from its last checkpoint
+@user_passes_test(lambda u: u.is_superuser)
+def resume_import(request, pk):
+    import_run = get_object_or_404(ImportRun, pk=pk, status="ERR")
+    if request.method == "POST":
+        import_run.status = "PND"
+        import_run.save()
+        enqueue(import_people_task, import_run.pk, made_by=request.user)
+    return render(
+        request,
+        "base/imports/elements/hx/import_progress_hx.html",
+        {"import_run": import_run},
+    )
 
-    entries = []
-    for file in files:
-        _path = f"{path}/reports/{file}"
 
-        with open(_path, "r") as _file:
-            report_data = _file.readlines()
-            entry = {"report": file}
-            for line in report_data:
-                # se a linha começar com algum dos cabeçalhos: tratamento
-                if line.startswith(data):
-                    _line = line.split(": ")
-                    _key = re.findall(r"\w+", _line[0].lower())[0]
-                    if _line[0].startswith("imported_on"):
-                        _value = datetime.strptime(
-                            _line[1].strip(), "%Y-%m-%d %H:%M:%S.%f"
-                        )
-                    elif _line[1].strip().isdigit():
-                        _value = int(_line[1].strip())
-                    else:
-                        _value = _line[1].strip()
-                    entry[_key] = _value
-            entries.append(entry)
-    return entries
+# handlers
+def get_file_hash(file):
+    """the sha256 of the content of the uploaded file."""
+    sha = hashlib.sha256()
+    for chunk in file.chunks():
+        sha.update(chunk)
+    file.seek(0)
+    return sha.hexdigest()
 
 
 # generate file to download
@@ -140,13 +145,42 @@ def download_csv(request, file):
     elif request.GET.get("type") == "de":
         _file = f"duplicate_email__{file}"
         _path = f"{IMPORT_PATH}/duplicate_email/{_file}"
+    elif request.GET.get("type") == "ee":
+        _file = f"errors__{file}"
+        _path = f"{IMPORT_PATH}/errors/{_file}"
     elif request.GET.get("type") == "se":
-        if file.split(".")[-1] != "csv":
-            _file = f"to_send_email__{file.split(' ')[0]}__to_sign_lgpd.csv"
-        else:
-            _file = f"to_send_email__{file}"
-        _path = f"{IMPORT_PATH}/to_send_email/{_file}"
+        _path = get_to_send_email_path(file)
+        _file = os.path.basename(_path)
     response = HttpResponse(open(_path, "rb").read())
     response["Content-Type"] = "text/plain"
     response["Content-Disposition"] = f"attachment; filename={_file}"
     return response
+
+
+# put in the outbox the emails of a to_send_email file
+@user_passes_test(lambda u: u.is_superuser)
+def send_emails(request, file):
+    if request.method == "POST":
+        _path = get_to_send_email_path(file)
+        action = (
+            "migration" if _path.endswith("to_sign_lgpd.csv") else "invitation"
+        )
+        queued = send_csv_emails(
+            _path,
+            body_text=f"person/invitation/emails/confirm_{action}.txt",
+            body_html=f"person/invitation/emails/confirm_{action}.html",
+            _subject="Convite para ser aluno",
+        )
+        if queued:
+            messages.success(request, _("%s emails queued!") % queued)
+        else:
+            messages.warning(request, _("These emails were already queued."))
+    return redirect("import_people")
+
+
+def get_to_send_email_path(file):
+    if file.split(".")[-1] != "csv":
+        _file = f"to_send_email__{file.split(' ')[0]}__to_sign_lgpd.csv"
+    else:
+        _file = f"to_send_email__{file}"
+    return f"{IMPORT_PATH}/to_send_email/{_file}"
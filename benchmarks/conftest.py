@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+from django.db import transaction
+
+from base.dataset import DatasetGenerator
+from publicwork.models import PublicworkGroup
+
+# multiply the volumes with BENCHMARK_SCALE=<n> (budgets.json holds the
+# budgets of the default scale)
+SCALE = float(os.environ.get("BENCHMARK_SCALE", 1))
+
+
+@pytest.fixture(scope="module")
+def benchmark_data(django_db_setup, django_db_blocker):
+    """
+    a center with realistic volumes, created once for the module and
+    rolled back at its end.
+    """
+    with django_db_blocker.unblock():
+        with transaction.atomic():
+            (center,) = DatasetGenerator(seed=0, scale=SCALE).generate()
+
+            yield {
+                "scale": SCALE,
+                "center": center,
+                "user": center.made_by,
+                "pw_group": PublicworkGroup.objects.filter(
+                    center=center
+                ).first(),
+            }
+
+            transaction.set_rollback(True)
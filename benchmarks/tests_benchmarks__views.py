@@ -0,0 +1,70 @@
+import json
+import time
+
+from pathlib import Path
+
+import pytest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+BUDGETS = json.loads(
+    (Path(__file__).parent / "budgets.json").read_text(encoding="utf-8")
+)
+
+
+def get_views(pw_group):
+    today = timezone.now().date()
+    period = {
+        "dt1": (today - timezone.timedelta(365)).strftime("%Y-%m-%d"),
+        "dt2": today.strftime("%Y-%m-%d"),
+    }
+    return {
+        "person_home": (reverse("person_home"), {}),
+        "seeker_home": (reverse("seeker_home"), {}),
+        "group_frequencies": (
+            reverse("group_frequencies", args=[pw_group.pk]),
+            {},
+        ),
+        "mentoring_home": (reverse("mentoring_home"), {}),
+        "cash_balance": (reverse("cash_balance"), period),
+        "frequencies_per_period": (reverse("frequencies_per_period"), period),
+        "lectures_per_period": (reverse("lectures_per_period"), period),
+        "status_per_center": (
+            reverse("status_per_center"),
+            {"status": "all"},
+        ),
+    }
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("view_name", BUDGETS.keys())
+def test_benchmark__view(
+    benchmark_data, client, get_group, record_property, view_name
+):
+    user = benchmark_data["user"]
+    user.groups.add(get_group("admin"))
+    client.force_login(user)
+    url, params = get_views(benchmark_data["pw_group"])[view_name]
+
+    with CaptureQueriesContext(connection) as context:
+        start = time.perf_counter()
+        response = client.get(url, params)
+        elapsed = (time.perf_counter() - start) * 1000
+    queries = len(context.captured_queries)
+    record_property("queries", queries)
+    record_property("ms", round(elapsed))
+
+    budget = BUDGETS[view_name]
+    assert response.status_code == 200
+    if benchmark_data["scale"] != 1:
+        return
+    assert queries <= budget["queries"], (
+        f"{view_name} made {queries} queries " f"(budget: {budget['queries']})"
+    )
+    assert (
+        elapsed <= budget["ms"]
+    ), f"{view_name} took {elapsed:.0f}ms (budget: {budget['ms']}ms)"
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.16 on 2026-10-18 09:12
+
+from django.db import migrations
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS center_center_name_trgm '
+        'ON center_center USING gin (name gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS center_center_name_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('center', '0011_auto_20221001_1110'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
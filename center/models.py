@@ -3,7 +3,8 @@ import uuid
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 from django.db import models
-from PIL import Image
+from base.images import request_renditions
+from base.models import TrackedFieldsMixin
 from rcadmin.common import (
     get_filename,
     phone_format,
@@ -24,7 +25,7 @@ def center_pix_pics(instance, filename):
 
 
 # Center
-class Center(models.Model):
+class Center(TrackedFieldsMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(_("name"), max_length=50, unique=True)
     short_name = models.CharField(
@@ -94,21 +95,16 @@ class Center(models.Model):
         blank=True,
     )
 
+    tracked_fields = ("image", "pix_image")
+
     def save(self, *args, **kwargs):
         self.state = str(self.state).upper()
         self.phone_1 = phone_format(self.phone_1)
         self.phone_2 = phone_format(self.phone_2)
+        new_images = self.get_changed_fields()
         super(Center, self).save(*args, **kwargs)
-        if self.image and self.image.name != "default_center.jpg":
-            img = Image.open(self.image.path)
-            if img.height > 300 or img.width > 300:
-                img.thumbnail((300, 300))
-                img.save(self.image.path)
-        if self.pix_image and self.image.name != "default_center_pix.jpg":
-            pix_img = Image.open(self.pix_image.path)
-            if pix_img.height > 300 or pix_img.width > 300:
-                pix_img.thumbnail((300, 300))
-                pix_img.save(self.pix_image.path)
+        for field in new_images:
+            request_renditions(getattr(self, field))
 
     def __str__(self):
         return f"{self.short_name} ({self.country})"
@@ -8,6 +8,7 @@ from django.conf import settings
 from django.core.files import File
 from django.db import models
 from PIL import Image
+from base.models import TrackedFieldsMixin
 from rcadmin.common import ACTIVITY_TYPES, EVENT_STATUS, ASPECTS
 from person.models import Person
 
@@ -30,7 +31,7 @@ class Activity(models.Model):
 
 
 #  Event
-class Event(models.Model):
+class Event(TrackedFieldsMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     activity = models.ForeignKey(
         Activity, on_delete=models.PROTECT, verbose_name=_("activity")
@@ -66,6 +67,8 @@ class Event(models.Model):
         blank=True,
     )
 
+    tracked_fields = ("center",)
+
     def __str__(self):
         return f"{self.activity} - {self.center} ({self.date})"
 
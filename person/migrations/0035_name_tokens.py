@@ -0,0 +1,64 @@
+# Generated by Django 3.2.16 on 2026-10-18 09:12
+
+from django.db import migrations, models
+from rcadmin.common import get_tokens
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS person_person_name_sa_trgm '
+        'ON person_person USING gin (name_sa gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS person_person_name_sa_trgm')
+
+
+def fill_name_tokens(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        return
+    Person = apps.get_model('person', 'Person')
+    PersonNameToken = apps.get_model('person', 'PersonNameToken')
+    PersonNameToken.objects.bulk_create(
+        [
+            PersonNameToken(person_id=pk, field='name_sa', token=token[:50])
+            for pk, name_sa in Person.objects.values_list('pk', 'name_sa')
+            for token in get_tokens(name_sa)
+        ],
+        batch_size=1000,
+    )
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('person', '0034_remove_person_reg'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonNameToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=20)),
+                ('token', models.CharField(max_length=50)),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='name_tokens', to='person.person')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='personnametoken',
+            index=models.Index(fields=['field', 'token'], name='person_personnametoken_tk'),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+        migrations.RunPython(fill_name_tokens, migrations.RunPython.noop),
+    ]
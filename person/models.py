@@ -18,6 +18,7 @@ from rcadmin.common import (
     phone_format,
 )
 from user.models import User
+from base.models import CenterScopedQuerySet, NameToken, TrackedFieldsMixin
 
 
 # Invitation
@@ -65,11 +66,15 @@ class Invitation(models.Model):
     imported_on = models.DateTimeField(_("imported on"), null=True, blank=True)
 
     def save(self, *args, **kwargs):
+        self.adjust_fields()
+        super(Invitation, self).save(*args, **kwargs)
+
+    def adjust_fields(self):
+        """formats done on save, to be done also before a bulk_create."""
         if self.state:
             self.state = str(self.state).upper()
         if self.phone:
             self.phone = phone_format(self.phone)
-        super(Invitation, self).save(*args, **kwargs)
 
     def __str__(self):
         return "{} - {}".format(self.name, self.center)
@@ -80,7 +85,7 @@ class Invitation(models.Model):
 
 
 # Person
-class Person(models.Model):
+class Person(TrackedFieldsMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     center = models.ForeignKey(
@@ -117,6 +122,10 @@ class Person(models.Model):
         blank=True,
     )
 
+    objects = CenterScopedQuerySet.as_manager()
+
+    tracked_fields = ("center", "name", "is_active")
+
     def clean(self, *args, **kwargs):
         self.is_active = (
             False if self.status not in ("ACT", "LIC", "---", "OTH") else True
@@ -128,7 +137,10 @@ class Person(models.Model):
             self.name = f"<<{self.user.email.split('@')[0]}>>"
         self.name_sa = us_inter_char(self.name)
         self.short_name = short_name(self.name)
+        new_name = self.has_changed("name")
         super(Person, self).save(*args, **kwargs)
+        if new_name:
+            PersonNameToken.objects.sync(self, name_sa=self.name_sa)
 
     def __str__(self):
         return "{} - {}".format(self.name, self.center)
@@ -141,6 +153,14 @@ class Person(models.Model):
         return reverse("person_detail", kwargs={"id": self.id})
 
 
+# PersonNameToken
+class PersonNameToken(NameToken):
+    person = models.ForeignKey(
+        Person, on_delete=models.CASCADE, related_name="name_tokens"
+    )
+    owner_field = "person"
+
+
 # Historic
 class Historic(models.Model):
     person = models.ForeignKey(
@@ -0,0 +1,103 @@
+"""
+in-memory prefix index of the person names of each center, used by the
+typeahead searchs. each process keeps the indexes of the last used centers
+and rebuilds one when the version of its center, bumped by the person
+signals, changes. the versions are kept in the database, so a bump reaches
+every process. an index is also rebuilt after INDEX_TTL seconds, for the
+changes made without the signals.
+"""
+import time
+
+from bisect import bisect_left
+from collections import OrderedDict
+from threading import Lock
+
+from rcadmin.common import bump_cache_version, get_cache_version, get_tokens
+
+MAX_CENTERS = 32
+INDEX_TTL = 60 * 10
+
+_indexes = OrderedDict()
+_lock = Lock()
+
+
+def get_version_key(center_id):
+    return f"person_names:{center_id}"
+
+
+def get_version(center_id):
+    return get_cache_version(get_version_key(center_id))
+
+
+def bump_version(center_id):
+    if center_id:
+        bump_cache_version(get_version_key(center_id))
+
+
+class PersonNameIndex:
+    def __init__(self, version, rows):
+        self.version = version
+        self.built_on = time.monotonic()
+        self.names = {}
+        self.sort_keys = {}
+        tokens = []
+        for pk, name, name_sa in rows:
+            self.names[pk] = name
+            self.sort_keys[pk] = name_sa
+            tokens += [(token, pk) for token in get_tokens(name_sa)]
+        tokens.sort()
+        self.tokens = [token for token, pk in tokens]
+        self.ids = [pk for token, pk in tokens]
+
+    def get_ids(self, word):
+        start = bisect_left(self.tokens, word)
+        end = bisect_left(self.tokens, f"{word}\uffff", start)
+        return set(self.ids[start:end])
+
+    def search(self, term, limit=10):
+        """persons whose name has a word starting with each word of term."""
+        words = get_tokens(term)
+        if not words:
+            return []
+        ids = self.get_ids(words[0])
+        for word in words[1:]:
+            ids &= self.get_ids(word)
+        return [
+            {"id": pk, "name": self.names[pk]}
+            for pk in sorted(ids, key=self.sort_keys.get)[:limit]
+        ]
+
+    def is_current(self, version):
+        return (
+            self.version == version
+            and time.monotonic() - self.built_on < INDEX_TTL
+        )
+
+    def get(self, pk):
+        name = self.names.get(str(pk))
+        return {"id": str(pk), "name": name} if name else None
+
+
+def get_person_name_index(center_id):
+    from person.models import Person
+
+    version = get_version(center_id)
+    with _lock:
+        index = _indexes.get(center_id)
+        if index and index.is_current(version):
+            _indexes.move_to_end(center_id)
+            return index
+
+    rows = [
+        (str(pk), name, name_sa)
+        for pk, name, name_sa in Person.objects.filter(
+            center_id=center_id
+        ).values_list("pk", "name", "name_sa")
+    ]
+    index = PersonNameIndex(version, rows)
+    with _lock:
+        _indexes[center_id] = index
+        _indexes.move_to_end(center_id)
+        while len(_indexes) > MAX_CENTERS:
+            _indexes.popitem(last=False)
+    return index
@@ -1,11 +1,29 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from .models import Person
+from .name_index import bump_version
 
 
 @receiver(post_save, sender=Person)
-def save_profile(sender, instance, **kwargs):
+def save_profile(sender, instance, created, **kwargs):
+    if not (created or instance.has_changed("is_active")):
+        return
     if instance.is_active != instance.user.is_active:
         instance.user.is_active = instance.is_active
-        instance.user.save()
+        instance.user.save(update_fields=["is_active"])
+
+
+@receiver(post_save, sender=Person)
+def update_name_index(sender, instance, created, **kwargs):
+    if not (created or instance.has_changed("center", "name", "is_active")):
+        return
+    old_center_id = instance.get_saved_value("center")
+    if old_center_id != instance.center_id:
+        bump_version(old_center_id)
+    bump_version(instance.center_id)
+
+
+@receiver(post_delete, sender=Person)
+def remove_from_name_index(sender, instance, **kwargs):
+    bump_version(instance.center_id)
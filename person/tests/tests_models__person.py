@@ -1,5 +1,10 @@
 import pytest
+from types import SimpleNamespace
+
+from django.http import Http404
+
 from person.models import Person
+from rcadmin.common import get_owned_or_404
 
 
 @pytest.mark.django_db
@@ -71,3 +76,24 @@ def test_when_the_person_is_active_then_user_is_active(create_person):
     person.is_active = True
     person.save()
     assert user.is_active is True
+
+
+@pytest.mark.django_db
+def test_persons_owned_by_the_center_of_the_user(
+    center_factory, create_center, create_person, create_user
+):
+    center = center_factory.create()
+    person = create_person(center=center)
+    other = create_person(center=create_center())
+    user = create_user(email="u2@mail.com")
+    user.person.center = center
+    user.person.save()
+    request = SimpleNamespace(user=user)
+
+    owned = Person.objects.owned_by(request)
+    assert person in owned and user.person in owned and other not in owned
+    assert get_owned_or_404(request, Person, pk=person.pk) == person
+    with pytest.raises(Http404):
+        get_owned_or_404(request, Person, pk=other.pk)
+    user.is_superuser = True
+    assert get_owned_or_404(request, Person, pk=other.pk) == other
@@ -0,0 +1,40 @@
+import pytest
+
+from django.core.cache import cache
+from django.db.models import F
+
+from base.models import CacheVersion
+from person import name_index
+from person.models import Person
+from person.name_index import get_person_name_index, get_version_key
+
+
+@pytest.mark.django_db
+def test_a_bump_made_by_another_process_rebuilds_the_index(
+    center_factory, create_person
+):
+    center = center_factory.create()
+    create_person(name="César Godoi", center=center)
+    index = get_person_name_index(center.pk)
+    assert get_person_name_index(center.pk) is index
+
+    # another process renames a person: its cache is not this one
+    person = Person.objects.get(name="César Godoi")
+    Person.objects.filter(pk=person.pk).update(name="Joana Godoi")
+    CacheVersion.objects.filter(key=get_version_key(center.pk)).update(
+        version=F("version") + 1
+    )
+    cache.clear()
+
+    index = get_person_name_index(center.pk)
+    assert index.get(person.pk)["name"] == "Joana Godoi"
+
+
+@pytest.mark.django_db
+def test_an_index_is_rebuilt_after_its_ttl(
+    center_factory, create_person, monkeypatch
+):
+    center = center_factory.create()
+    index = get_person_name_index(center.pk)
+    monkeypatch.setattr(name_index, "INDEX_TTL", 0)
+    assert get_person_name_index(center.pk) is not index
@@ -1,6 +1,13 @@
 import pytest
+
+from base64 import urlsafe_b64encode
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from person.models import Person
+from rcadmin.common import get_cached_count
 from rcadmin.permissions_for_tests import permission
 
 
@@ -163,3 +170,117 @@ def test_access__person_reinsert__by_user_type(
     url = reverse("person_reinsert", args=[person.pk])
     response = client.get(url)
     assert response.status_code == status_code
+
+
+@pytest.mark.django_db
+def test_person_home__pages_by_cursor(
+    center_factory, create_person, auto_login_user
+):
+    """the 'load more' pages follow the cursor and skip the count"""
+    center = center_factory.create()
+    client, user = auto_login_user(group="office", center=center)
+    for n in range(12):
+        create_person(center=center, name=f"Person {n:02}")
+    url = reverse("person_home")
+
+    response = client.get(url, {"ps_status": "all"})
+    first_page = response.context["object_list"]
+    assert response.context["count"] == 13
+    assert len(first_page) == 10
+    assert first_page.cursor
+
+    response = client.get(
+        url, {"page": 2, "cursor": first_page.cursor}, HTTP_HX_REQUEST="true"
+    )
+    second_page = response.context["object_list"]
+    assert response.context["count"] is None
+    assert len(second_page) == 3
+    assert second_page.cursor is None
+    names = [obj.name_sa for obj in first_page + second_page]
+    assert names == sorted(names)
+    assert f"cursor={first_page.cursor}" in str(
+        client.get(url, HTTP_HX_REQUEST="true").content
+    )
+
+
+@pytest.mark.django_db
+def test_person_home__search_does_not_write_the_session(
+    center_factory, create_person, auto_login_user
+):
+    """the filters travel in the url and are only remembered on request"""
+    center = center_factory.create()
+    client, user = auto_login_user(group="office", center=center)
+    create_person(center=center, name="Zacarias Souza")
+    url = reverse("person_home")
+
+    response = client.get(url, {"ps_term": "zaca", "ps_aspect": "XX"})
+    assert "search" not in client.session
+    assert response.context["filters"]["ps_term"] == "zaca"
+    assert response.context["filters"]["ps_aspect"] == "all"
+    assert len(response.context["object_list"]) == 1
+
+    client.get(url, {"ps_term": "zaca", "remember": "on"})
+    assert client.session["search"]["ps_term"] == "zaca"
+    response = client.get(url)
+    assert response.context["filters"]["ps_term"] == "zaca"
+
+
+@pytest.mark.django_db
+def test_person_home__count_is_cached_until_a_person_changes(
+    center_factory, auto_login_user, create_person
+):
+    center = center_factory.create()
+    client, user = auto_login_user(group="office", center=center)
+    create_person(name="César Godoi", center=center)
+    url = reverse("person_home")
+
+    assert client.get(url).context["count"] == 2
+    with CaptureQueriesContext(connection) as context:
+        assert client.get(url).context["count"] == 2
+    assert not [
+        query
+        for query in context.captured_queries
+        if "COUNT(" in query["sql"] and "person_person" in query["sql"]
+    ]
+    create_person(name="Cesário Lima", center=center)
+    assert client.get(url).context["count"] == 3
+
+
+@pytest.mark.django_db
+def test_person_home__count_of_both_centers_when_a_person_moves(
+    center_factory, create_center, auto_login_user, create_person
+):
+    center, other = center_factory.create(), create_center(name="Other")
+    client, user = auto_login_user(group="office", center=center)
+    person = create_person(center=center)
+    url = reverse("person_home")
+
+    def other_count():
+        queryset = Person.objects.filter(center=other)
+        return get_cached_count(queryset, other.pk)
+
+    assert client.get(url).context["count"] == 2
+    assert other_count() == 0
+    person.center = other
+    person.save()
+    assert client.get(url).context["count"] == 1
+    assert other_count() == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "values", ['["Person 05", "not-a-uuid"]', '["Person 05", [1]]', "{}"]
+)
+def test_person_home__a_tampered_cursor_is_no_cursor(
+    values, center_factory, create_person, auto_login_user
+):
+    center = center_factory.create()
+    client, user = auto_login_user(group="office", center=center)
+    create_person(center=center, name="Person 05")
+    cursor = urlsafe_b64encode(values.encode()).decode()
+
+    response = client.get(
+        reverse("person_home"), {"page": 2, "cursor": cursor}
+    )
+    assert response.status_code == 200
+    assert response.context["count"] == 2
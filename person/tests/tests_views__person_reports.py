@@ -0,0 +1,71 @@
+import pytest
+from io import BytesIO
+
+import openpyxl
+from django.urls import reverse
+from django.utils import timezone
+
+from person.models import Person
+from rcadmin.permissions_for_tests import permission
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "_url", ["installed_per_period", "occurrences_per_period"]
+)
+@pytest.mark.parametrize(
+    "user_type, status_code", permission["adm_pub_pubj_pre__200"]
+)
+def test_access__person_reports__by_user_type(
+    center_factory, auto_login_user, _url, user_type, status_code
+):
+    center = center_factory.create()
+    client, user = auto_login_user(group=user_type, center=center)
+    response = client.get(reverse(_url))
+    assert response.status_code == status_code
+
+
+@pytest.mark.django_db
+def test_installed_per_period__per_month(auto_login_user, create_center):
+    center = create_center()
+    center.short_name = "CT-1"
+    center.save()
+    client, user = auto_login_user(group="admin", center=center)
+    person = Person.objects.get(user=user)
+    person.name = "Ana Maria"
+    person.aspect = "A1"
+    person.aspect_date = timezone.now().date()
+    person.save()
+    today = str(person.aspect_date)
+    url = reverse("installed_per_period")
+
+    response = client.get(url, {"dt1": today, "dt2": today})
+    assert "Ana Maria" in response.content.decode()
+
+    response = client.get(url, {"dt1": today, "dt2": today, "by_month": "on"})
+    content = response.content.decode()
+    assert person.aspect_date.strftime("%Y-%m") in content
+    assert "Ana Maria" not in content
+    assert response.context["filters"]["by_month"] == "on"
+
+
+@pytest.mark.django_db
+def test_persons_export(auto_login_user, create_center):
+    center = create_center()
+    center.short_name = "CT-1"
+    center.save()
+    client, user = auto_login_user(group="admin", center=center)
+    person = Person.objects.get(user=user)
+    person.name = "Ana Maria"
+    person.aspect = "A2"
+    person.save()
+
+    response = client.get(reverse("persons_export"))
+    assert response["Content-Disposition"].endswith('People.xlsx"')
+    sheet = openpyxl.load_workbook(
+        BytesIO(b"".join(response.streaming_content))
+    ).active
+    rows = list(sheet.values)
+    assert rows[0][:3] == ("name", "email", "phone")
+    assert rows[1][0] == "Ana Maria"
+    assert rows[1][6] == "2nd. Aspect"
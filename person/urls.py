@@ -164,4 +164,9 @@ urlpatterns += [
         reports.occurrences_per_period,
         name="occurrences_per_period",
     ),
+    path(
+        "reports/persons-export/",
+        reports.persons_export,
+        name="persons_export",
+    ),
 ]
@@ -16,9 +16,9 @@ from django.utils.translation import gettext as _
 from rcadmin.common import (
     clear_session,
     get_pagination,
-    send_email,
     sanitize_name,
 )
+from base.mailer import send_email
 from base.searchs import search_invitations
 
 from ..views.historic import adjust_person_side
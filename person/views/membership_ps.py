@@ -94,8 +94,7 @@ def membership_ps_create(request, person_id):
         object_list, count = None, None
         clear_session(request, ["search"])
     else:
-        queryset, count = search_workgroup(request, Workgroup, _from, _to)
-        object_list = queryset[_from:_to]
+        object_list, count = search_workgroup(request, Workgroup, _from, _to)
 
     context = {
         "LIMIT": LIMIT,
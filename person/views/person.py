@@ -11,7 +11,6 @@ from django.contrib.auth.decorators import (
 )
 from django.contrib.auth.models import Group
 from django.http import HttpResponse
-from django.http.response import Http404
 from django.shortcuts import redirect, render
 from django.utils import timezone
 from django.urls import reverse
@@ -21,6 +20,7 @@ from rcadmin.common import (
     ASPECTS,
     STATUS,
     clear_session,
+    get_owned_or_404,
     get_template_and_pagination,
 )
 from user.models import User
@@ -89,10 +89,7 @@ def person_home(request):
 @login_required
 @permission_required("person.view_person")
 def person_detail(request, id):
-    if not belongs_center(request, id):
-        raise Http404
-
-    person = Person.objects.get(id=id)
+    person = get_owned_or_404(request, Person, id=id)
 
     context = {
         "object": person,
@@ -157,10 +154,7 @@ def person_create(request):
 @login_required
 @permission_required("person.change_person")
 def update_profile(request, id):
-    if not belongs_center(request, id):
-        raise Http404
-
-    person = Person.objects.get(id=id)
+    person = get_owned_or_404(request, Person, id=id)
 
     if request.method == "POST":
         # updating the user
@@ -203,10 +197,7 @@ def update_profile(request, id):
 @login_required
 @permission_required("person.change_person")
 def update_pupil(request, id):
-    if not belongs_center(request, id):
-        raise Http404
-
-    person = Person.objects.get(id=id)
+    person = get_owned_or_404(request, Person, id=id)
 
     if request.method == "POST":
         # updating the user.person
@@ -241,10 +232,7 @@ def update_pupil(request, id):
 @login_required
 @permission_required("person.change_person")
 def update_image(request, id):
-    if not belongs_center(request, id):
-        raise Http404
-
-    person = Person.objects.get(id=id)
+    person = get_owned_or_404(request, Person, id=id)
 
     if request.method == "POST":
         # updating the user.profile
@@ -321,18 +309,6 @@ def person_reinsert(request, id):
 
 
 # auxiliar functions
-def belongs_center(request, id):
-    center_persons = [
-        person.id
-        for person in Person.objects.filter(
-            center=request.user.person.center.pk
-        )
-    ]
-    if id not in center_persons and not request.user.is_superuser:
-        return False
-    return True
-
-
 def add_historic(person, occurrence, made_by):
     historic = dict(
         person=person,
@@ -1,5 +1,3 @@
-import pandas as pd
-
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required, permission_required
 from django.utils.translation import gettext as _
@@ -7,12 +5,17 @@ from django.urls import reverse
 
 from ..models import Person, Historic
 from center.models import Responsible
+from base.export import export, queryset_rows
+from base.report_store import save_report
+from base.report_viewer import render_report_page
 from base.utils import (
-    get_installed_per_period_dict,
-    get_occurrences_per_period_dict,
+    get_breakdown,
+    get_installed_per_period_frame,
+    get_occurrences_per_period_frame,
     get_report_file_title,
     get_period_subtitle,
 )
+from rcadmin.common import ASPECTS, STATUS
 
 
 @login_required
@@ -33,9 +36,9 @@ def person_badge(request, person_id):
 @permission_required("publicwork.view_lecture")
 def installed_per_period(request):
     if request.GET.get("dt1") and request.GET.get("dt2"):
-        # get person dict
-        _dict = get_installed_per_period_dict(request, Person)
-        if _dict:
+        # get person frame
+        frame = get_installed_per_period_frame(request, Person)
+        if not frame.empty:
             # select columns to report
             columns = [
                 "name",
@@ -44,20 +47,18 @@ def installed_per_period(request):
                 "aspect",
                 "date",
             ]
-            # generate pandas dataframe
-            report_data = pd.DataFrame(_dict, columns=columns)
-            #  adjust index
-            report_data.index += 1
+            report_data = get_report_data(request, frame, columns)
             # prepare file.xslx
-            request.session["data_to_file"] = {
-                "name": get_report_file_title(request, "New_Pupils"),
-                "content": report_data.to_json(orient="records"),
-            }
+            save_report(
+                request,
+                report_data,
+                get_report_file_title(request, "New_Pupils"),
+            )
 
             context = {
                 "title": _("installed per period"),
                 "subtitle": get_period_subtitle(request),
-                "report_data": report_data.to_html(),
+                "report_data": render_report_page(request, report_data),
                 "goback": reverse("person_home") + "?init=on",
                 "search": "base/searchs/modal_period.html",
             }
@@ -77,9 +78,9 @@ def installed_per_period(request):
 @permission_required("publicwork.view_lecture")
 def occurrences_per_period(request):
     if request.GET.get("dt1") and request.GET.get("dt2"):
-        # get person dict
-        _dict = get_occurrences_per_period_dict(request, Historic)
-        if _dict:
+        # get historic frame
+        frame = get_occurrences_per_period_frame(request, Historic)
+        if not frame.empty:
             # select columns to report
             columns = [
                 "name",
@@ -88,15 +89,13 @@ def occurrences_per_period(request):
                 "description",
                 "date",
             ]
-            # generate pandas dataframe
-            report_data = pd.DataFrame(_dict, columns=columns)
-            #  adjust index
-            report_data.index += 1
+            report_data = get_report_data(request, frame, columns)
             # prepare file.xslx
-            request.session["data_to_file"] = {
-                "name": get_report_file_title(request, "Occurrences"),
-                "content": report_data.to_json(orient="records"),
-            }
+            save_report(
+                request,
+                report_data,
+                get_report_file_title(request, "Occurrences"),
+            )
 
             context = {
                 "title": _("occurrences per period"),
@@ -104,7 +103,7 @@ def occurrences_per_period(request):
                     get_period_subtitle(request),
                     str(request.user.person.center),
                 ),
-                "report_data": report_data.to_html(),
+                "report_data": render_report_page(request, report_data),
                 "goback": reverse("person_home") + "?init=on",
                 "search": "base/searchs/modal_period.html",
             }
@@ -118,3 +117,44 @@ def occurrences_per_period(request):
     }
 
     return render(request, "base/reports/show_report.html", context)
+
+
+@login_required
+@permission_required("person.view_person")
+def persons_export(request):
+    columns = [
+        "name",
+        "user__email",
+        "user__profile__phone",
+        "user__profile__city",
+        "user__profile__state",
+        "birth",
+        "aspect",
+        "aspect_date",
+        "status",
+    ]
+    queryset = Person.objects.filter(
+        center=request.user.person.center, is_active=True
+    ).order_by("name_sa")
+    return export(
+        request,
+        [column.split("__")[-1] for column in columns],
+        queryset_rows(
+            queryset, columns, {"aspect": ASPECTS, "status": STATUS}
+        ),
+        get_report_file_title(request, "People"),
+    )
+
+
+# handlers
+def get_report_data(request, frame, columns):
+    search = request.session["search"]
+    if search["by_month"] or search["by_aspect"]:
+        report_data = get_breakdown(
+            frame, by_month=search["by_month"], by_aspect=search["by_aspect"]
+        ).reset_index()
+    else:
+        report_data = frame[columns].copy()
+    #  adjust index
+    report_data.index += 1
+    return report_data
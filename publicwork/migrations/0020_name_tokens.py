@@ -0,0 +1,71 @@
+# Generated by Django 3.2.16 on 2026-10-18 09:12
+
+from django.db import migrations, models
+from rcadmin.common import get_tokens
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for field in ('name_sa', 'city'):
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS publicwork_seeker_{field}_trgm '
+            f'ON publicwork_seeker USING gin ({field} gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for field in ('name_sa', 'city'):
+        schema_editor.execute(
+            f'DROP INDEX IF EXISTS publicwork_seeker_{field}_trgm'
+        )
+
+
+def fill_name_tokens(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        return
+    Seeker = apps.get_model('publicwork', 'Seeker')
+    SeekerNameToken = apps.get_model('publicwork', 'SeekerNameToken')
+    SeekerNameToken.objects.bulk_create(
+        [
+            SeekerNameToken(seeker_id=pk, field=field, token=token[:50])
+            for pk, name_sa, city in Seeker.objects.values_list(
+                'pk', 'name_sa', 'city'
+            )
+            for field, value in (('name_sa', name_sa), ('city', city))
+            for token in get_tokens(value)
+        ],
+        batch_size=1000,
+    )
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publicwork', '0019_remove_listener_ranking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeekerNameToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=20)),
+                ('token', models.CharField(max_length=50)),
+                ('seeker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='name_tokens', to='publicwork.seeker')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='seekernametoken',
+            index=models.Index(fields=['field', 'token'], name='publicwork_seekernametoken_tk'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+        migrations.RunPython(fill_name_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.2.16 on 2026-10-18 12:05
+
+from django.db import migrations, models
+from rcadmin.common import us_inter_char
+
+
+def fill_city_sa(apps, schema_editor):
+    Seeker = apps.get_model('publicwork', 'Seeker')
+    seekers = list(Seeker.objects.only('pk', 'city'))
+    for seeker in seekers:
+        seeker.city_sa = us_inter_char(seeker.city)
+    Seeker.objects.bulk_update(seekers, ['city_sa'], batch_size=1000)
+    SeekerNameToken = apps.get_model('publicwork', 'SeekerNameToken')
+    SeekerNameToken.objects.filter(field='city').update(field='city_sa')
+
+
+def empty_city_sa(apps, schema_editor):
+    SeekerNameToken = apps.get_model('publicwork', 'SeekerNameToken')
+    SeekerNameToken.objects.filter(field='city_sa').update(field='city')
+
+
+def move_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS publicwork_seeker_city_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS publicwork_seeker_city_sa_trgm '
+        'ON publicwork_seeker USING gin (city_sa gin_trgm_ops)'
+    )
+
+
+def restore_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS publicwork_seeker_city_sa_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS publicwork_seeker_city_trgm '
+        'ON publicwork_seeker USING gin (city gin_trgm_ops)'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publicwork', '0020_name_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seeker',
+            name='city_sa',
+            field=models.CharField(blank=True, editable=False, max_length=50),
+        ),
+        migrations.RunPython(fill_city_sa, empty_city_sa),
+        migrations.RunPython(move_trigram_index, restore_trigram_index),
+    ]
@@ -1,10 +1,11 @@
 import uuid
 
 from django.utils.translation import gettext_lazy as _
-from PIL import Image
 from django.conf import settings
 from django.utils import timezone
 from django.db import models
+from base.images import request_renditions
+from base.models import CenterScopedQuerySet, NameToken, TrackedFieldsMixin
 from rcadmin.common import (
     us_inter_char,
     short_name,
@@ -23,7 +24,7 @@ def seeker_pics(instance, filename):
 
 
 # Temporary Registration of Seeker
-class TempRegOfSeeker(models.Model):
+class TempRegOfSeeker(TrackedFieldsMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(_("name"), max_length=80)
     birth = models.DateField(_("birth"))
@@ -47,14 +48,15 @@ class TempRegOfSeeker(models.Model):
         _("solicited on"), default=timezone.now
     )
 
+    tracked_fields = ("image",)
+
     def save(self, *args, **kwargs):
         self.state = str(self.state).upper()
         self.phone = phone_format(self.phone)
+        new_image = self.has_changed("image")
         super(TempRegOfSeeker, self).save(*args, **kwargs)
-        img = Image.open(self.image.path)
-        if img.height > 300 or img.width > 300:
-            img.thumbnail((300, 300))
-            img.save(self.image.path)
+        if new_image:
+            request_renditions(self.image)
 
     def __str__(self):
         return "{} - {} ({}-{})".format(
@@ -67,7 +69,7 @@ class TempRegOfSeeker(models.Model):
 
 
 # Seeker
-class Seeker(models.Model):
+class Seeker(TrackedFieldsMixin, models.Model):
     center = models.ForeignKey(
         "center.Center",
         on_delete=models.PROTECT,
@@ -91,6 +93,7 @@ class Seeker(models.Model):
         blank=True,
     )
     city = models.CharField(_("city"), max_length=50, blank=True)
+    city_sa = models.CharField(max_length=50, editable=False, blank=True)
     state = models.CharField(_("state"), max_length=2, blank=True)
     country = models.CharField(
         _("country"), max_length=2, choices=COUNTRIES, default="BR"
@@ -111,18 +114,25 @@ class Seeker(models.Model):
         blank=True,
     )
 
+    objects = CenterScopedQuerySet.as_manager()
+
+    tracked_fields = ("center", "image", "name", "city")
+
     def save(self, *args, **kwargs):
         self.name_sa = us_inter_char(self.name)
+        self.city_sa = us_inter_char(self.city)
         self.short_name = short_name(self.name)
         self.state = str(self.state).upper()
         self.phone = phone_format(self.phone)
+        new_image = self.has_changed("image")
+        new_names = self.has_changed("name", "city")
         super(Seeker, self).save(*args, **kwargs)
-        if self.image:
-            img = Image.open(self.image.path)
-            if img.filename.split("/")[-1] != "default_profile.jpg":
-                if img.height > 300 or img.width > 300:
-                    img.thumbnail((300, 300))
-                    img.save(self.image.path)
+        if new_names:
+            SeekerNameToken.objects.sync(
+                self, name_sa=self.name_sa, city_sa=self.city_sa
+            )
+        if new_image:
+            request_renditions(self.image)
 
     def __str__(self):
         return "{} - {}".format(self.name, self.center)
@@ -132,6 +142,14 @@ class Seeker(models.Model):
         verbose_name_plural = _("seekers")
 
 
+# SeekerNameToken
+class SeekerNameToken(NameToken):
+    seeker = models.ForeignKey(
+        Seeker, on_delete=models.CASCADE, related_name="name_tokens"
+    )
+    owner_field = "seeker"
+
+
 # Historic of seeker
 class HistoricOfSeeker(models.Model):
     seeker = models.ForeignKey(
@@ -163,7 +181,7 @@ class HistoricOfSeeker(models.Model):
 
 
 # Lecture
-class Lecture(models.Model):
+class Lecture(TrackedFieldsMixin, models.Model):
     center = models.ForeignKey(
         "center.Center",
         on_delete=models.PROTECT,
@@ -193,6 +211,10 @@ class Lecture(models.Model):
         blank=True,
     )
 
+    objects = CenterScopedQuerySet.as_manager()
+
+    tracked_fields = ("center",)
+
     def __str__(self):
         return f"{self.theme} [{self.type}] - {self.center} ({self.date})"
 
@@ -223,7 +245,7 @@ class Listener(models.Model):
 
 
 #  PublicworkGroup
-class PublicworkGroup(models.Model):
+class PublicworkGroup(TrackedFieldsMixin, models.Model):
     name = models.CharField(_("name"), max_length=50)
     center = models.ForeignKey(
         "center.Center", on_delete=models.PROTECT, verbose_name=_("center")
@@ -247,6 +269,10 @@ class PublicworkGroup(models.Model):
         blank=True,
     )
 
+    objects = CenterScopedQuerySet.as_manager()
+
+    tracked_fields = ("center",)
+
     def __str__(self):
         return f"{self.name} - {self.center}"
 
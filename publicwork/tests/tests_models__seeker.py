@@ -1,5 +1,9 @@
 import pytest
-from publicwork.models import Seeker, HistoricOfSeeker
+
+from django.core.management import call_command
+
+from base import models as base_models
+from publicwork.models import Seeker, HistoricOfSeeker, SeekerNameToken
 
 
 @pytest.mark.django_db
@@ -45,3 +49,71 @@ def test_search_seeker(center_factory, create_seeker):
     center = center_factory.create()
     create_seeker(center=center, name="César Godoi")
     assert Seeker.objects.filter(name_sa__icontains="cesar").count() == 1
+
+
+@pytest.mark.django_db
+def test_search_seeker_by_name_tokens(center_factory, create_seeker):
+    center = center_factory.create()
+    create_seeker(center=center, name="César Godoi", city="São Paulo")
+    create_seeker(center=center, name="Gonçalo Dias", city="Curitiba")
+    query = SeekerNameToken.objects.get_query
+
+    def search(field, term):
+        return list(
+            Seeker.objects.filter(query(field, term)).values_list(
+                "name", flat=True
+            )
+        )
+
+    assert search("name_sa", "cesar") == ["César Godoi"]
+    assert search("name_sa", "GOD ces") == ["César Godoi"]
+    assert search("name_sa", "odoi") == []
+    assert search("city_sa", "sao") == ["César Godoi"]
+    assert search("city_sa", "SÃO pau") == ["César Godoi"]
+
+
+@pytest.mark.django_db
+def test_the_trigram_search_takes_the_normalized_city(
+    center_factory, create_seeker, monkeypatch
+):
+    center = center_factory.create()
+    seeker = create_seeker(center=center, city="São Paulo")
+    assert seeker.city_sa == "sao paulo"
+
+    monkeypatch.setattr(base_models, "use_trigram_index", lambda: True)
+    query = SeekerNameToken.objects.get_query("city_sa", "São")
+    assert query.children == [("city_sa__iregex", r"\msao")]
+
+
+@pytest.mark.django_db
+def test_name_tokens_are_synced_when_the_name_or_city_changes(
+    center_factory, create_seeker, monkeypatch
+):
+    center = center_factory.create()
+    seeker = create_seeker(center=center, city="São Paulo")
+    synced = []
+    monkeypatch.setattr(
+        SeekerNameToken.objects,
+        "sync",
+        lambda obj, **fields: synced.append(fields),
+    )
+    seeker.observations = "no tokens"
+    seeker.save()
+    assert synced == []
+
+    seeker.city = "Belém"
+    seeker.save()
+    assert synced[0]["city_sa"] == "belem"
+
+
+@pytest.mark.django_db
+def test_name_tokens_follow_the_seeker_name(center_factory, create_seeker):
+    center = center_factory.create()
+    seeker = create_seeker(center=center, name="César Godoi")
+    seeker.name = "Cesar Silva"
+    seeker.save()
+    query = SeekerNameToken.objects.get_query("name_sa", "godoi")
+    assert not Seeker.objects.filter(query).exists()
+    call_command("rebuild_search_index")
+    query = SeekerNameToken.objects.get_query("name_sa", "silva")
+    assert Seeker.objects.filter(query).get() == seeker
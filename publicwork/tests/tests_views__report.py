@@ -71,3 +71,52 @@ def test_access__status_per_center__by_user_type(
     url = reverse("status_per_center")
     response = client.get(url)
     assert response.status_code == status_code
+
+
+@pytest.mark.django_db
+def test_reports_show_the_frames(
+    auto_login_user, create_center, create_seeker, create_lecture
+):
+    center = create_center()
+    center.short_name = "CT-1"
+    center.save()
+    client, user = auto_login_user(group="admin", center=center)
+    seeker = create_seeker(center=center, name="Ana Maria")
+    seeker.status = "MBR"
+    seeker.save()
+    inactive = create_seeker(center=center, name="Davi Souza")
+    inactive.is_active = False
+    inactive.save()
+    lecture = create_lecture(center=center, theme="Theme_9")
+    lecture.listener_set.create(seeker=seeker)
+    lecture.listener_set.create(seeker=inactive)
+    today = lecture.date.strftime("%Y-%m-%d")
+    period = {"dt1": today, "dt2": today}
+
+    response = client.get(reverse("frequencies_per_period"), period)
+    assert "Ana Maria" in response.content.decode()
+    assert "Davi Souza" not in response.content.decode()
+
+    response = client.get(reverse("lectures_per_period"), period)
+    assert "Theme_9" in response.content.decode()
+
+    response = client.get(reverse("status_per_center"), {"status": "MBR"})
+    assert "Ana Maria" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_seekers_export(auto_login_user, create_center, create_seeker):
+    center = create_center()
+    center.short_name = "CT-1"
+    center.save()
+    client, user = auto_login_user(group="admin", center=center)
+    create_seeker(center=center, name="Ana Maria")
+    inactive = create_seeker(center=center, name="Davi Souza")
+    inactive.is_active = False
+    inactive.save()
+
+    response = client.get(reverse("seekers_export"), {"format": "csv"})
+    content = b"".join(response.streaming_content).decode()
+    assert content.startswith("name,birth,gender,city,state,country,")
+    assert "Ana Maria" in content
+    assert "Davi Souza" not in content
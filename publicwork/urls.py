@@ -201,4 +201,9 @@ urlpatterns += [
         report.status_per_center,
         name="status_per_center",
     ),
+    path(
+        "report/seekers-export/",
+        report.seekers_export,
+        name="seekers_export",
+    ),
 ]
@@ -12,13 +12,14 @@ from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from rcadmin.common import (
-    belongs_center,
     clear_session,
     SEEKER_STATUS,
     LECTURE_TYPES,
     ASPECTS,
     STATUS,
+    get_owned_or_404,
     get_template_and_pagination,
+    in_groups,
 )
 
 from center.models import Center
@@ -49,9 +50,7 @@ def group_home(request):
         "publicwork/groups/elements/group_list.html",
     )
 
-    if request.GET.get("init") or request.user.groups.filter(
-        name="publicwork_jr"
-    ):
+    if request.GET.get("init") or in_groups(request.user, "publicwork_jr"):
         count = request.user.person.publicworkgroup_set.count() or None
         object_list = request.user.person.publicworkgroup_set.all() or {}
         clear_session(request, ["pwg", "search", "frequencies"])
@@ -95,8 +94,7 @@ def group_detail(request, pk):
     )
 
     clear_session(request, ["search", "frequencies"])
-    belongs_center(request, pk, PublicworkGroup)
-    pw_group = PublicworkGroup.objects.get(pk=pk)
+    pw_group = get_owned_or_404(request, PublicworkGroup, pk=pk)
 
     _object_list = pw_group.members.exclude(
         status__in=("ITD", "RST", "STD")
@@ -160,8 +158,7 @@ def group_create(request):
 @login_required
 @permission_required("publicwork.change_publicworkgroup")
 def group_update(request, pk):
-    belongs_center(request, pk, PublicworkGroup)
-    pw_group = PublicworkGroup.objects.get(pk=pk)
+    pw_group = get_owned_or_404(request, PublicworkGroup, pk=pk)
 
     if request.method == "POST":
         pw_group_form = GroupForm(request.POST, instance=pw_group)
@@ -190,8 +187,7 @@ def group_update(request, pk):
 @login_required
 @permission_required("publicwork.delete_publicworkgroup")
 def group_delete(request, pk):
-    belongs_center(request, pk, PublicworkGroup)
-    pw_group = PublicworkGroup.objects.get(pk=pk)
+    pw_group = get_owned_or_404(request, PublicworkGroup, pk=pk)
 
     if request.method == "POST":
         if pw_group.members.count() > 0 or pw_group.mentors.count() > 0:
@@ -212,8 +208,7 @@ def group_delete(request, pk):
 @login_required
 @permission_required("publicwork.add_publicworkgroup")
 def group_reinsert(request, pk):
-    belongs_center(request, pk, PublicworkGroup)
-    pw_group = PublicworkGroup.objects.get(pk=pk)
+    pw_group = get_owned_or_404(request, PublicworkGroup, pk=pk)
 
     if request.method == "POST":
         pw_group.is_active = True
@@ -231,9 +226,7 @@ def group_reinsert(request, pk):
 # seeker frequencies
 @login_required
 @permission_required("publicwork.view_publicworkgroup")
-@user_passes_test(
-    lambda u: "presidium" not in [pr.name for pr in u.groups.all()]
-)
+@user_passes_test(lambda u: not in_groups(u, "presidium"))
 def group_frequencies(request, pk):
     LIMIT, template_name, _from, _to, page = get_template_and_pagination(
         request,
@@ -242,9 +235,7 @@ def group_frequencies(request, pk):
     )
 
     clear_session(request, ["search", "frequencies"])
-    belongs_center(request, pk, PublicworkGroup)
-
-    pw_group = PublicworkGroup.objects.get(pk=pk)
+    pw_group = get_owned_or_404(request, PublicworkGroup, pk=pk)
     active_members = pw_group.members.exclude(status__in=("ITD", "RST", "STD"))
     _object_list = get_frequencies([mbr.id for mbr in active_members])
 
@@ -293,8 +284,7 @@ def get_frequencies(ids):
 @login_required
 @permission_required("publicwork.add_listener")
 def group_add_frequencies(request, pk):
-    belongs_center(request, pk, PublicworkGroup)
-    pw_group = PublicworkGroup.objects.get(pk=pk)
+    pw_group = get_owned_or_404(request, PublicworkGroup, pk=pk)
 
     if request.GET.get("lect_pk"):
         # get lecture
@@ -357,8 +347,7 @@ def group_add_frequencies(request, pk):
 @login_required
 @permission_required("publicwork.change_publicworkgroup")
 def group_add_member(request, pk):
-    belongs_center(request, pk, PublicworkGroup)
-    pw_group = PublicworkGroup.objects.get(pk=pk)
+    pw_group = get_owned_or_404(request, PublicworkGroup, pk=pk)
 
     if request.GET.get("seek_pk"):
         seeker = Seeker.objects.get(pk=request.GET["seek_pk"])
@@ -463,8 +452,7 @@ def group_remove_member(request, group_pk, member_pk):
 @login_required
 @permission_required("publicwork.change_publicworkgroup")
 def group_add_mentor(request, pk):
-    belongs_center(request, pk, PublicworkGroup)
-    pw_group = PublicworkGroup.objects.get(pk=pk)
+    pw_group = get_owned_or_404(request, PublicworkGroup, pk=pk)
 
     if request.GET.get("person_pk"):
         person = Person.objects.get(pk=request.GET["person_pk"])
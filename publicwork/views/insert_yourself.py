@@ -11,7 +11,8 @@ from user.models import User
 from center.models import Center
 from ..forms import TempRegOfSeekerForm
 from ..models import TempRegOfSeeker, Seeker
-from rcadmin.common import clear_session, send_email, sanitize_name
+from base.mailer import send_email
+from rcadmin.common import clear_session, sanitize_name
 
 
 def insert_yourself(request):
@@ -10,8 +10,8 @@ from django.utils.translation import gettext as _
 from rcadmin.common import (
     LECTURE_TYPES,
     clear_session,
+    get_owned_or_404,
     get_template_and_pagination,
-    belongs_center,
 )
 from base.searchs import search_lecture
 
@@ -59,8 +59,7 @@ def lecture_home(request):
 @login_required
 @permission_required("publicwork.view_lecture")
 def lecture_detail(request, pk):
-    belongs_center(request, pk, Lecture)
-    lect_object = Lecture.objects.get(pk=pk)
+    lect_object = get_owned_or_404(request, Lecture, pk=pk)
 
     LIMIT, template_name, _from, _to, page = get_template_and_pagination(
         request,
@@ -123,8 +122,7 @@ def lecture_create(request):
 @login_required
 @permission_required("publicwork.change_lecture")
 def lecture_update(request, pk):
-    belongs_center(request, pk, Lecture)
-    lect_object = Lecture.objects.get(pk=pk)
+    lect_object = get_owned_or_404(request, Lecture, pk=pk)
     if lect_object.center != request.user.person.center:
         raise Http404
 
@@ -160,8 +158,7 @@ def lecture_update(request, pk):
 @login_required
 @permission_required("publicwork.delete_lecture")
 def lecture_delete(request, pk):
-    belongs_center(request, pk, Lecture)
-    lect_object = Lecture.objects.get(pk=pk)
+    lect_object = get_owned_or_404(request, Lecture, pk=pk)
     if lect_object.center != request.user.person.center:
         raise Http404
 
@@ -59,8 +59,7 @@ def add_listener(request, lect_pk):
         object_list, count = None, None
         clear_session(request, ["search"])
     else:
-        queryset, count = search_seeker(request, Seeker, _from, _to)
-        object_list = queryset[_from:_to]
+        object_list, count = search_seeker(request, Seeker, _from, _to)
         # add action links
         for item in object_list:
             item.add_link = reverse("add_listener", args=[lect_pk])
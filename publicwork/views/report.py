@@ -6,11 +6,14 @@ from django.utils.translation import gettext as _
 from django.urls import reverse
 
 from ..models import Lecture, Seeker
+from base.export import export, queryset_rows
+from base.report_store import save_report
+from base.report_viewer import render_report_page
 from base.utils import (
     get_period_subtitle,
-    get_frequencies_dict,
-    get_lectures_dict,
-    get_seekers_dict,
+    get_frequencies_frame,
+    get_lectures_frame,
+    get_seekers_frame,
     get_report_file_title,
 )
 from rcadmin.common import SEEKER_STATUS, LECTURE_TYPES, check_center_module
@@ -35,8 +38,8 @@ def publicwork_home(request):
 @permission_required("publicwork.view_lecture")
 def frequencies_per_period(request):
     if request.GET.get("dt1") and request.GET.get("dt2"):
-        _dict = get_frequencies_dict(request, Lecture)
-        if _dict:
+        frame = get_frequencies_frame(request, Lecture)
+        if not frame.empty:
             columns = [
                 "seek_pk",
                 "seek_name",
@@ -46,7 +49,7 @@ def frequencies_per_period(request):
                 "seek_status_date",
             ]
 
-            dataframe = pd.DataFrame(_dict, columns=columns)
+            dataframe = frame[columns].copy()
 
             dataframe["since"] = since(dataframe, "seek_status_date")
 
@@ -86,15 +89,16 @@ def frequencies_per_period(request):
             }
             report_data = report_data.rename(columns=rename, inplace=False)
             # prepare file.xslx
-            request.session["data_to_file"] = {
-                "name": get_report_file_title(request, "Frequencies"),
-                "content": report_data.to_json(orient="records"),
-            }
+            save_report(
+                request,
+                report_data,
+                get_report_file_title(request, "Frequencies"),
+            )
 
             context = {
                 "title": _("frequencies per period"),
                 "subtitle": get_period_subtitle(request),
-                "report_data": report_data.to_html(),
+                "report_data": render_report_page(request, report_data),
                 "status": SEEKER_STATUS,
                 "goback": reverse("publicwork_home"),
                 "search": "base/searchs/modal_frequencies.html",
@@ -116,11 +120,11 @@ def frequencies_per_period(request):
 @permission_required("publicwork.view_lecture")
 def lectures_per_period(request):
     if request.GET.get("dt1") and request.GET.get("dt2"):
-        _dict = get_lectures_dict(request, Lecture)
-        if _dict:
+        frame = get_lectures_frame(request, Lecture)
+        if not frame.empty:
             columns = ["date", "theme", "type", "center", "listeners"]
 
-            report_data = pd.DataFrame(_dict, columns=columns)
+            report_data = frame[columns].copy()
 
             search = request.session["search"]
             search["type"] = (
@@ -134,15 +138,16 @@ def lectures_per_period(request):
             report_data.reset_index(drop=True, inplace=True)
             report_data.index += 1
             # prepare file.xslx
-            request.session["data_to_file"] = {
-                "name": get_report_file_title(request, "Lectures"),
-                "content": report_data.to_json(orient="records"),
-            }
+            save_report(
+                request,
+                report_data,
+                get_report_file_title(request, "Lectures"),
+            )
 
             context = {
                 "title": _("lectures per period"),
                 "subtitle": get_period_subtitle(request),
-                "report_data": report_data.to_html(),
+                "report_data": render_report_page(request, report_data),
                 "type": LECTURE_TYPES,
                 "goback": reverse("publicwork_home"),
                 "search": "base/searchs/modal_lectures.html",
@@ -163,10 +168,10 @@ def lectures_per_period(request):
 @permission_required("publicwork.view_lecture")
 def status_per_center(request):
     if request.GET.get("status"):
-        _dict = get_seekers_dict(request, Seeker)
-        if _dict:
+        frame = get_seekers_frame(request, Seeker)
+        if not frame.empty:
             columns = ["name", "local", "status", "status_date"]
-            dataframe = pd.DataFrame(_dict, columns=columns)
+            dataframe = frame[columns]
 
             report_data = (
                 pd.DataFrame(dataframe.groupby(columns).count())
@@ -184,16 +189,17 @@ def status_per_center(request):
 
             report_data.index += 1
             # prepare file.xslx
-            request.session["data_to_file"] = {
-                "name": get_report_file_title(request, "Seeker Status"),
-                "content": report_data.to_json(orient="records"),
-            }
+            save_report(
+                request,
+                report_data,
+                get_report_file_title(request, "Seeker Status"),
+            )
 
             context = {
                 "title": _("status per center"),
                 "subtitle": request.user.person.center,
                 "status": SEEKER_STATUS,
-                "report_data": report_data.to_html(),
+                "report_data": render_report_page(request, report_data),
                 "goback": reverse("publicwork_home"),
                 "search": "base/searchs/modal_status.html",
             }
@@ -210,6 +216,32 @@ def status_per_center(request):
     return render(request, "base/reports/show_report.html", context)
 
 
+@login_required
+@permission_required("publicwork.view_seeker")
+def seekers_export(request):
+    columns = [
+        "name",
+        "birth",
+        "gender",
+        "city",
+        "state",
+        "country",
+        "phone",
+        "email",
+        "status",
+        "status_date",
+    ]
+    queryset = Seeker.objects.filter(
+        center=request.user.person.center, is_active=True
+    ).order_by("name_sa")
+    return export(
+        request,
+        columns,
+        queryset_rows(queryset, columns, {"status": SEEKER_STATUS}),
+        get_report_file_title(request, "Seekers"),
+    )
+
+
 # handlers
 def since(df, date):
     df[date] = pd.to_datetime(df[date]).dt.normalize()
@@ -11,10 +11,11 @@ from django.urls import reverse
 from django.utils.translation import gettext as _
 
 from rcadmin.common import (
-    belongs_center,
     clear_session,
     SEEKER_STATUS,
+    get_owned_or_404,
     get_template_and_pagination,
+    in_groups,
 )
 
 from center.models import Center
@@ -69,8 +70,7 @@ def seeker_home(request):
 @login_required
 @permission_required("publicwork.view_seeker")
 def seeker_detail(request, pk):
-    belongs_center(request, pk, Seeker)
-    seeker = Seeker.objects.get(pk=pk)
+    seeker = get_owned_or_404(request, Seeker, pk=pk)
 
     age = (date.today() - seeker.birth).days // 365
     if request.GET.get("pwg"):
@@ -117,8 +117,7 @@ def seeker_create(request):
 @login_required
 @permission_required("publicwork.change_seeker")
 def seeker_update(request, pk):
-    belongs_center(request, pk, Seeker)
-    seeker = Seeker.objects.get(pk=pk)
+    seeker = get_owned_or_404(request, Seeker, pk=pk)
 
     if request.method == "POST":
         seeker_form = SeekerForm(request.POST, request.FILES, instance=seeker)
@@ -147,8 +146,7 @@ def seeker_update(request, pk):
 @login_required
 @permission_required("publicwork.delete_seeker")
 def seeker_delete(request, pk):
-    belongs_center(request, pk, Seeker)
-    seeker = Seeker.objects.get(pk=pk)
+    seeker = get_owned_or_404(request, Seeker, pk=pk)
 
     if request.method == "POST":
         if seeker.listener_set.count():
@@ -169,13 +167,9 @@ def seeker_delete(request, pk):
 
 
 @login_required
-@user_passes_test(
-    lambda u: "admin" in [pr.name for pr in u.groups.all()]
-    or "publicwork" in [pr.name for pr in u.groups.all()]
-)
+@user_passes_test(lambda u: in_groups(u, "admin", "publicwork"))
 def seeker_reinsert(request, pk):
-    belongs_center(request, pk, Seeker)
-    seeker = Seeker.objects.get(pk=pk)
+    seeker = get_owned_or_404(request, Seeker, pk=pk)
 
     if request.method == "POST":
         seeker.is_active = True
@@ -194,7 +188,7 @@ def seeker_reinsert(request, pk):
 @login_required
 @permission_required("publicwork.view_seeker")
 def seeker_frequencies(request, pk):
-    belongs_center(request, pk, Seeker)
+    seeker = get_owned_or_404(request, Seeker, pk=pk)
 
     LIMIT, template_name, _from, _to, page = get_template_and_pagination(
         request,
@@ -202,7 +196,6 @@ def seeker_frequencies(request, pk):
         "publicwork/seeker/elements/frequency_list.html",
     )
 
-    seeker = Seeker.objects.get(pk=pk)
     _object_list = seeker.listener_set.all()
 
     count = len(_object_list)
@@ -232,7 +225,7 @@ def seeker_frequencies(request, pk):
 @login_required
 @permission_required("publicwork.view_seeker")
 def seeker_historic(request, pk):
-    belongs_center(request, pk, Seeker)
+    seeker = get_owned_or_404(request, Seeker, pk=pk)
 
     LIMIT, template_name, _from, _to, page = get_template_and_pagination(
         request,
@@ -240,7 +233,6 @@ def seeker_historic(request, pk):
         "publicwork/seeker/elements/historic_list.html",
     )
 
-    seeker = Seeker.objects.get(pk=pk)
     _object_list = seeker.historicofseeker_set.all().order_by("-date")
 
     count = len(_object_list)
@@ -1,12 +1,19 @@
+import json
 import re
 
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date
+from hashlib import md5
 from unicodedata import normalize
+from uuid import UUID
 
 from django import forms
-from django.template.loader import render_to_string
-from django.core.mail import send_mail
+from django.apps import apps
+from django.core.cache import cache
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
-from django.http.response import Http404
+from django.db.models import F, Q
+from django.shortcuts import get_object_or_404
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.core.validators import RegexValidator
 from django.utils.translation import gettext_lazy as _
 
@@ -90,6 +97,22 @@ ORDER_STATUS = (
     ("PND", _("pending")),
     ("CCD", _("concluded")),
 )
+JOB_STATUS = (
+    ("PND", _("pending")),
+    ("RUN", _("running")),
+    ("DNE", _("done")),
+    ("ERR", _("failed")),
+)
+IMPORT_KINDS = (
+    ("IMP", _("import")),
+    ("LGP", _("to sign lgpd")),
+)
+EMAIL_STATUS = (
+    ("PND", _("pending")),
+    ("SND", _("sending")),
+    ("SNT", _("sent")),
+    ("ERR", _("failed")),
+)
 PAY_TYPES = (
     ("MON", _("monthly")),
     ("EVE", _("by event")),
@@ -153,6 +176,11 @@ def us_inter_char(txt, codif="utf-8"):
     )
 
 
+def get_tokens(txt):
+    """the distinct normalized words of a text, in order."""
+    return list(dict.fromkeys(re.findall(r"[a-z0-9]+", us_inter_char(txt))))
+
+
 def short_name(name):
     words = name.split(" ")
     if len(words) <= 2:
@@ -269,13 +297,9 @@ def paginator(queryset, limit=10, page=1):
     return object_list
 
 
-def belongs_center(request, pk, obj):
-    object_list = [
-        pk.pk
-        for pk in obj.objects.filter(center=request.user.person.center.id)
-    ]
-    if pk not in object_list and not request.user.is_superuser:
-        raise Http404
+def get_owned_or_404(request, obj, **kwargs):
+    """get the object of obj only if it belongs to the center of the user."""
+    return get_object_or_404(obj.objects.owned_by(request), **kwargs)
 
 
 def clear_session(request, items):
@@ -284,29 +308,6 @@ def clear_session(request, items):
             del request.session[item]
 
 
-def send_email(
-    body_text,
-    body_html,
-    _subject,
-    _to,
-    _from="no-reply@rosacruzaurea.org.br",
-    _context={},
-):
-    text_content = render_to_string(body_text, _context)
-    html_content = render_to_string(body_html, _context)
-
-    subject = f"{GRC} - {_subject}"
-
-    send_mail(
-        subject=subject,
-        from_email=_from,
-        message=text_content,
-        recipient_list=[_to],
-        html_message=html_content,
-        fail_silently=True,
-    )
-
-
 def get_filename(instance, field=None):
     if field:
         if field == "pix_key":
@@ -345,12 +346,178 @@ def get_pagination(request, limit=10):
     return (page, _from, _to, limit)
 
 
+# keyset pagination
+class KeysetPage(list):
+    """a page of objects that knows the cursor of the next page."""
+
+    def __init__(self, objects, cursor=None):
+        super().__init__(objects)
+        self.cursor = cursor
+
+
+def get_keyset_ordering(ordering):
+    # the pk is the tie-breaker, in the same direction of the last field
+    if "pk" in [field.lstrip("-") for field in ordering]:
+        return list(ordering)
+    return [*ordering, "-pk" if ordering[-1].startswith("-") else "pk"]
+
+
+def encode_cursor(obj, ordering):
+    values = []
+    for field in ordering:
+        value = getattr(obj, field.lstrip("-"))
+        if isinstance(value, (date, UUID)):
+            value = (
+                str(value) if isinstance(value, UUID) else value.isoformat()
+            )
+        values.append(value)
+    return urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor, ordering, model):
+    """the values of cursor, or None when it is not a cursor of ordering."""
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(ordering):
+            return None
+        if None in values:
+            return None
+        # each value as its field takes it, so a tampered one fails here
+        return [
+            get_ordering_field(model, field).to_python(value)
+            for field, value in zip(ordering, values)
+        ]
+    except (ValueError, TypeError, ValidationError, FieldDoesNotExist):
+        return None
+
+
+def get_ordering_field(model, field):
+    name = field.lstrip("-")
+    return model._meta.pk if name == "pk" else model._meta.get_field(name)
+
+
+def get_keyset_query(ordering, values):
+    # (a > x) or (a = x and b > y) or ...
+    query = Q()
+    for n, field in enumerate(ordering):
+        lookup = "lt" if field.startswith("-") else "gt"
+        _query = Q(**{f"{field.lstrip('-')}__{lookup}": values[n]})
+        for prev_field, value in zip(ordering[:n], values[:n]):
+            _query &= Q(**{prev_field.lstrip("-"): value})
+        query |= _query
+    return query
+
+
+#  cached counts  #############################################################
+COUNT_CACHE_TIMEOUT = 60 * 10
+
+
+def get_cache_version(key):
+    """the version of key, kept in the database (see base.CacheVersion)."""
+    CacheVersion = apps.get_model("base", "CacheVersion")
+    return (
+        CacheVersion.objects.filter(key=key)
+        .values_list("version", flat=True)
+        .first()
+        or 0
+    )
+
+
+def bump_cache_version(key):
+    CacheVersion = apps.get_model("base", "CacheVersion")
+    versions = CacheVersion.objects.filter(key=key)
+    if versions.update(version=F("version") + 1):
+        return
+    _, created = CacheVersion.objects.get_or_create(
+        key=key, defaults={"version": 1}
+    )
+    if not created:
+        versions.update(version=F("version") + 1)
+
+
+def get_count_version_key(model, center_id=None):
+    return f"count_version:{model._meta.label_lower}:{center_id or 'all'}"
+
+
+def bump_count_version(model, center_id=None):
+    """invalidate the cached counts of model in the center and in 'all'."""
+    if center_id:
+        bump_cache_version(get_count_version_key(model, center_id))
+    bump_cache_version(get_count_version_key(model))
+
+
+def get_cached_count(queryset, center_id=None):
+    """
+    count queryset once for each version of its model in the center (or in
+    all centers, when it is not limited to one).
+    """
+    version = get_cache_version(
+        get_count_version_key(queryset.model, center_id)
+    )
+    sql, params = queryset.query.sql_with_params()
+    key = "count:{}:{}:{}:{}".format(
+        queryset.model._meta.label_lower,
+        center_id or "all",
+        version,
+        md5(f"{sql}{params}".encode()).hexdigest(),
+    )
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def get_keyset_page(
+    request, queryset, ordering, _from, _to, cached_count=False, center=None
+):
+    """
+    return a page of queryset and the count of objects. when the request
+    brings a cursor, the page starts after it and the count is not made.
+    a cached count is kept by the versions of the center the queryset is
+    limited to (or of all centers).
+    """
+    ordering = get_keyset_ordering(ordering)
+    limit = _to - _from
+    cursor = request.GET.get("cursor")
+    values = (
+        decode_cursor(cursor, ordering, queryset.model) if cursor else None
+    )
+
+    if values:
+        count = None
+        objects = queryset.filter(get_keyset_query(ordering, values))
+        objects = list(objects.order_by(*ordering)[:limit])
+    else:
+        count = (
+            get_cached_count(queryset, getattr(center, "pk", center))
+            if cached_count
+            else queryset.count()
+        )
+        objects = list(queryset.order_by(*ordering)[_from:_to])
+
+    next_cursor = (
+        encode_cursor(objects[-1], ordering)
+        if objects and len(objects) == limit
+        else None
+    )
+    return (KeysetPage(objects, next_cursor), count)
+
+
+def get_group_names(user):
+    """the names of the groups of user, loaded once for each user object."""
+    if not hasattr(user, "_group_names"):
+        user._group_names = frozenset(
+            user.groups.values_list("name", flat=True)
+        )
+    return user._group_names
+
+
+def in_groups(user, *names):
+    return not get_group_names(user).isdisjoint(names)
+
+
 def check_center_module(request, module):
-    if module == "mentoring":
-        return request.user.person.center.mentoring
-    elif module == "treasury":
-        return request.user.person.center.treasury
-    elif module == "publicwork":
-        return request.user.person.center.publicwork
-    elif module == "accommodation":
-        return request.user.person.center.accommodation
+    if hasattr(request, "actor"):
+        return request.actor.has_module(module)
+    return getattr(request.user.person.center, module)
@@ -1,7 +1,17 @@
 from django.conf import settings
 
+from rcadmin.middleware import get_actor
+
 
 def export_vars(request):
     data = {}
     data["APP_NAME"] = settings.get("APP_NAME", "rc@dmin")
+    # who is making the request (see rcadmin.middleware.ActorMiddleware)
+    data["actor"] = get_actor(request) if hasattr(request, "user") else None
+    # the filters of the current search (see base.searchs.SearchState)
+    data["filters"] = getattr(request, "search", None) or (
+        request.session.get("search", {})
+        if hasattr(request, "session")
+        else {}
+    )
     return data
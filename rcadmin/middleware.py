@@ -0,0 +1,55 @@
+from person.models import Person
+from rcadmin.common import get_group_names
+
+CENTER_MODULES = ("mentoring", "treasury", "publicwork", "accommodation")
+
+
+class Actor:
+    """
+    who is making the request: the user, its person and center, the names of
+    its groups and the modules of its center, loaded once.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.person = None
+        self.center = None
+        if user.is_authenticated:
+            self.person = (
+                Person.objects.select_related("center")
+                .filter(user_id=user.pk)
+                .first()
+            )
+        if self.person:
+            # the views keep reading request.user.person.center
+            Person.user.field.set_cached_value(self.person, user)
+            Person.user.field.remote_field.set_cached_value(user, self.person)
+            self.center = self.person.center
+        self.groups = get_group_names(user)
+        self.modules = {
+            module: getattr(self.center, module, False)
+            for module in CENTER_MODULES
+        }
+
+    def in_groups(self, *names):
+        return not self.groups.isdisjoint(names)
+
+    def has_module(self, module):
+        return self.modules.get(module, False)
+
+
+def get_actor(request):
+    if not hasattr(request, "_actor"):
+        request._actor = Actor(request.user)
+    return request._actor
+
+
+class ActorMiddleware:
+    """add the actor of the request as request.actor."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.actor = get_actor(request)
+        return self.get_response(request)
@@ -0,0 +1,73 @@
+import random
+
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Q
+
+from center.models import Center
+from publicwork.models import Seeker, SeekerNameToken
+from rcadmin.common import us_inter_char
+
+"""
+pra rodar via:
+./manage.py runscript bench_name_search --script-args <núcleo> [<quantidade>]
+Cria os buscadores numa transação que é desfeita ao final.
+"""
+
+FIRST_NAMES = ["Ana", "José", "Maria", "João", "Antônio", "Luíza", "Cecília"]
+LAST_NAMES = ["Silva", "Souza", "Conceição", "Araújo", "Gonçalves", "Lima"]
+CITIES = ["São Paulo", "Curitiba", "Belém", "Florianópolis", "Goiânia"]
+TERMS = ["joao", "conceicao", "ana lima", "gonc", "cecilia araujo"]
+
+
+def get_seekers(center, total):
+    rand = random.Random(total)
+    for number in range(total):
+        name = "{} {} {}".format(
+            rand.choice(FIRST_NAMES), rand.choice(LAST_NAMES), number
+        )
+        city = rand.choice(CITIES)
+        yield Seeker(
+            center=center,
+            name=name,
+            name_sa=us_inter_char(name),
+            short_name=name,
+            city=city,
+            city_sa=us_inter_char(city),
+            email=f"seeker{number}@example.com",
+            made_by=center.made_by,
+        )
+
+
+def timeit(queryset):
+    start = datetime.now()
+    count = queryset.count()
+    return count, (datetime.now() - start).total_seconds() * 1000
+
+
+def run(*args):
+    center = Center.objects.filter(name__icontains=args[0]).first()
+    total = int(args[1]) if len(args) > 1 else 100_000
+
+    with transaction.atomic():
+        start = datetime.now()
+        Seeker.objects.bulk_create(get_seekers(center, total), 5000)
+        SeekerNameToken.objects.rebuild(
+            Seeker.objects.all(), "name_sa", "city_sa"
+        )
+        print(f"{total} seekers created in {datetime.now() - start}")
+
+        for term in TERMS:
+            icontains = Q()
+            for word in term.split():
+                icontains.add(Q(name_sa__icontains=word), Q.AND)
+            tokens = SeekerNameToken.objects.get_query("name_sa", term)
+            count_1, time_1 = timeit(Seeker.objects.filter(icontains))
+            count_2, time_2 = timeit(Seeker.objects.filter(tokens))
+            print(
+                f"{term:<16} icontains: {count_1:>7} in {time_1:8.1f}ms"
+                f" | tokens: {count_2:>7} in {time_2:8.1f}ms"
+            )
+
+        transaction.set_rollback(True)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TreasuryConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "treasury"
+
+    def ready(self):
+        import treasury.signals  # noqa
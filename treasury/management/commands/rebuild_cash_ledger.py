@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from center.models import Center
+from treasury.models import CashLedger
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily cash ledger from the orders."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--center",
+            help="rebuild only the rows of the center with this id",
+        )
+
+    def handle(self, *args, **options):
+        center = (
+            Center.objects.get(pk=options["center"])
+            if options["center"]
+            else None
+        )
+        with transaction.atomic():
+            CashLedger.objects.rebuild(center)
+
+        rows = CashLedger.objects.all()
+        if center:
+            rows = rows.filter(center=center)
+        self.stdout.write(
+            self.style.SUCCESS(f"cash ledger rebuilt: {rows.count()} rows")
+        )
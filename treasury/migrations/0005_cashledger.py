@@ -0,0 +1,72 @@
+# Generated by Django 3.2.16 on 2026-10-18 09:04
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+import django.db.models.deletion
+
+
+def fill_cash_ledger(apps, schema_editor):
+    FormOfPayment = apps.get_model('treasury', 'FormOfPayment')
+    CashLedger = apps.get_model('treasury', 'CashLedger')
+    rows = (
+        FormOfPayment.objects.filter(order__center__isnull=False)
+        .annotate(day=TruncDate('order__created_on'))
+        .values(
+            'order__center',
+            'day',
+            'payform_type',
+            'order__status',
+            'order__self_payed',
+        )
+        .annotate(count=Count('pk'), value=Sum('value'))
+        .order_by()
+    )
+    CashLedger.objects.bulk_create(
+        [
+            CashLedger(
+                center_id=row['order__center'],
+                day=row['day'],
+                payform_type=row['payform_type'],
+                status=row['order__status'],
+                self_payed=row['order__self_payed'],
+                count=row['count'],
+                value=row['value'],
+            )
+            for row in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('center', '0011_auto_20221001_1110'),
+        ('treasury', '0004_auto_20220809_1526'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CashLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='day')),
+                ('payform_type', models.CharField(choices=[('PIX', 'pix'), ('CSH', 'cash'), ('CHK', 'check'), ('PRE', 'pre check'), ('DBT', 'debit'), ('CDT', 'credit'), ('DPT', 'deposit'), ('TRF', 'transfer'), ('SLP', 'bank slip')], max_length=3, verbose_name='type')),
+                ('status', models.CharField(choices=[('CCL', 'canceled'), ('PND', 'pending'), ('CCD', 'concluded')], max_length=3)),
+                ('self_payed', models.BooleanField(default=False, verbose_name='self payed')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='count')),
+                ('value', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='value')),
+                ('center', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='center.center', verbose_name='center')),
+            ],
+            options={
+                'verbose_name': 'cash ledger',
+                'verbose_name_plural': 'cash ledger',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='cashledger',
+            constraint=models.UniqueConstraint(fields=('center', 'day', 'payform_type', 'status', 'self_payed'), name='unique_cash_ledger_row'),
+        ),
+        migrations.RunPython(fill_cash_ledger, migrations.RunPython.noop),
+    ]
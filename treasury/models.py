@@ -3,11 +3,14 @@ import os
 
 from django.utils.translation import gettext_lazy as _
 from datetime import datetime
-from PIL import Image, ImageOps
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
 from django.conf import settings
 from person.models import Person
 from event.models import Event
+from base.images import request_renditions
+from base.models import TrackedFieldsMixin
 from rcadmin.common import ORDER_STATUS, PAYFORM_TYPES, PAY_TYPES
 
 
@@ -114,7 +117,7 @@ def voucher_img_filename(instance, filename):
 
 
 #  FormOfPayment
-class FormOfPayment(models.Model):
+class FormOfPayment(TrackedFieldsMixin, models.Model):
     id = models.UUIDField(
         primary_key=True, default=uuid.uuid4, editable=False, unique=True
     )
@@ -139,14 +142,13 @@ class FormOfPayment(models.Model):
         _("image"), upload_to=voucher_img_filename, null=True, blank=True
     )
 
+    tracked_fields = ("voucher_img",)
+
     def save(self, *args, **kwargs):
+        new_voucher = self.has_changed("voucher_img")
         super(FormOfPayment, self).save(*args, **kwargs)
-        if self.voucher_img:
-            img = Image.open(self.voucher_img.path)
-            img_gray = ImageOps.grayscale(img)
-            if img_gray.width > 600:
-                img_gray.thumbnail((600, 800))
-            img_gray.save(self.voucher_img.path, quality=50)
+        if new_voucher:
+            request_renditions(self.voucher_img, grayscale=True)
 
     def __str__(self):
         pg_form = f"{self.payform_type} ${self.value}"
@@ -160,7 +162,7 @@ class FormOfPayment(models.Model):
 
 
 #  Order
-class Order(models.Model):
+class Order(TrackedFieldsMixin, models.Model):
     id = models.UUIDField(
         primary_key=True, default=uuid.uuid4, editable=False, unique=True
     )
@@ -196,6 +198,8 @@ class Order(models.Model):
         blank=True,
     )
 
+    tracked_fields = ("center", "created_on")
+
     def __str__(self):
         return "{} - {} ${} ({})".format(
             self.center, self.person.name, self.amount, self.status
@@ -204,3 +208,120 @@ class Order(models.Model):
     class Meta:
         verbose_name = _("order")
         verbose_name_plural = _("orders")
+
+
+#  CashLedger
+class CashLedgerManager(models.Manager):
+    def get_rows(self, query):
+        """group the forms of payment of the orders matched by query."""
+        return (
+            FormOfPayment.objects.filter(query, order__center__isnull=False)
+            .annotate(day=TruncDate("order__created_on"))
+            .values(
+                "order__center",
+                "day",
+                "payform_type",
+                "order__status",
+                "order__self_payed",
+            )
+            .annotate(count=Count("pk"), value=Sum("value"))
+            .order_by()
+        )
+
+    def insert_rows(self, rows):
+        self.bulk_create(
+            [
+                self.model(
+                    center_id=row["order__center"],
+                    day=row["day"],
+                    payform_type=row["payform_type"],
+                    status=row["order__status"],
+                    self_payed=row["order__self_payed"],
+                    count=row["count"],
+                    value=row["value"],
+                )
+                for row in rows
+            ],
+            batch_size=500,
+        )
+
+    def refresh(self, center_id, day):
+        """
+        recompute the rows of one center in one day. the refreshes of a
+        center wait for each other on the lock of its row, so two orders
+        saved at once never insert the same rows.
+        """
+        Center = self.model._meta.get_field("center").related_model
+        with transaction.atomic():
+            list(
+                Center.objects.select_for_update(no_key=True)
+                .filter(pk=center_id)
+                .values_list("pk", flat=True)
+            )
+            self.filter(center_id=center_id, day=day).delete()
+            self.insert_rows(
+                self.get_rows(
+                    Q(order__center_id=center_id, order__created_on__date=day)
+                )
+            )
+
+    def rebuild(self, center=None):
+        """recompute all the rows, or only the rows of a center."""
+        query = Q(order__center=center) if center else Q()
+        ledger = self.filter(center=center) if center else self.all()
+        ledger.delete()
+        self.insert_rows(self.get_rows(query))
+
+    def by_payform(self, center, from_date, to_date, **kwargs):
+        return (
+            self.filter(
+                center=center, day__range=[from_date, to_date], **kwargs
+            )
+            .values("payform_type")
+            .annotate(
+                concluded=Sum("value", filter=Q(status="CCD")),
+                pending=Sum("value", filter=Q(status="PND")),
+                total=Sum("value"),
+                count=Sum("count"),
+            )
+            .order_by()
+        )
+
+
+class CashLedger(models.Model):
+    center = models.ForeignKey(
+        "center.Center", on_delete=models.CASCADE, verbose_name=_("center")
+    )
+    day = models.DateField(_("day"))
+    payform_type = models.CharField(
+        _("type"), max_length=3, choices=PAYFORM_TYPES
+    )
+    status = models.CharField(max_length=3, choices=ORDER_STATUS)
+    self_payed = models.BooleanField(_("self payed"), default=False)
+    count = models.PositiveIntegerField(_("count"), default=0)
+    value = models.DecimalField(
+        _("value"), max_digits=12, decimal_places=2, default=0
+    )
+
+    objects = CashLedgerManager()
+
+    def __str__(self):
+        return "{} - {} {} {} ${}".format(
+            self.center, self.day, self.payform_type, self.status, self.value
+        )
+
+    class Meta:
+        verbose_name = _("cash ledger")
+        verbose_name_plural = _("cash ledger")
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "center",
+                    "day",
+                    "payform_type",
+                    "status",
+                    "self_payed",
+                ],
+                name="unique_cash_ledger_row",
+            )
+        ]
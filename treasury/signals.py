@@ -0,0 +1,68 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import CashLedger, FormOfPayment, Order
+
+
+def get_ledger_keys(orders):
+    return {
+        (order.center_id, timezone.localdate(order.created_on))
+        for order in orders
+        if order.center_id
+    }
+
+
+def refresh_ledger(keys):
+    for center_id, day in keys:
+        CashLedger.objects.refresh(center_id, day)
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def update_ledger_by_order(sender, instance, **kwargs):
+    keys = get_ledger_keys([instance])
+    # an order moved to another center or day leaves its old rows
+    old_center_id = instance.get_saved_value("center")
+    old_created_on = instance.get_saved_value("created_on")
+    if old_center_id and old_created_on:
+        keys.add((old_center_id, timezone.localdate(old_created_on)))
+    refresh_ledger(keys)
+
+
+@receiver(m2m_changed, sender=Order.form_of_payments.through)
+def update_ledger_by_order_payforms(
+    sender, instance, action, pk_set, **kwargs
+):
+    if isinstance(instance, Order):
+        if action in ("post_add", "post_remove", "post_clear"):
+            refresh_ledger(get_ledger_keys([instance]))
+    # from the form of payment, pk_set holds the orders
+    elif action in ("post_add", "post_remove"):
+        refresh_ledger(get_ledger_keys(Order.objects.filter(pk__in=pk_set)))
+    # the orders of a clear are only known before it
+    elif action == "pre_clear":
+        instance._ledger_keys = get_ledger_keys(instance.order_set.all())
+    elif action == "post_clear":
+        refresh_ledger(getattr(instance, "_ledger_keys", set()))
+
+
+@receiver(post_save, sender=FormOfPayment)
+def update_ledger_by_payform(sender, instance, created, **kwargs):
+    if not created:
+        refresh_ledger(get_ledger_keys(instance.order_set.all()))
+
+
+@receiver(pre_delete, sender=FormOfPayment)
+def get_ledger_keys_of_payform(sender, instance, **kwargs):
+    instance._ledger_keys = get_ledger_keys(instance.order_set.all())
+
+
+@receiver(post_delete, sender=FormOfPayment)
+def update_ledger_by_deleted_payform(sender, instance, **kwargs):
+    refresh_ledger(getattr(instance, "_ledger_keys", set()))
@@ -0,0 +1,129 @@
+import pytest
+
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from treasury.models import CashLedger
+
+
+def get_ledger(center):
+    return {
+        (row.payform_type, row.status): (row.count, row.value)
+        for row in CashLedger.objects.filter(center=center)
+    }
+
+
+@pytest.mark.django_db
+def test_cash_ledger_is_updated_when_order_is_created(
+    center_factory, create_order, create_form_of_payment
+):
+    center = center_factory.create()
+    create_order(center=center, status="CCD")
+    create_order(
+        center=center,
+        status="CCD",
+        form_of_payment=create_form_of_payment(type="CSH", value=30),
+    )
+    create_order(
+        center=center,
+        status="PND",
+        form_of_payment=create_form_of_payment(type="PIX", value=50),
+    )
+    assert get_ledger(center) == {
+        ("CSH", "CCD"): (2, 150),
+        ("PIX", "PND"): (1, 50),
+    }
+    assert CashLedger.objects.get(payform_type="PIX").day == (
+        timezone.localdate()
+    )
+
+
+@pytest.mark.django_db
+def test_cash_ledger_is_updated_when_order_status_changes(
+    center_factory, create_order
+):
+    center = center_factory.create()
+    order = create_order(center=center, status="PND")
+    order.status = "CCD"
+    order.save()
+    assert get_ledger(center) == {("CSH", "CCD"): (1, 120)}
+
+
+@pytest.mark.django_db
+def test_cash_ledger_is_updated_when_form_of_payment_changes(
+    center_factory, create_order
+):
+    center = center_factory.create()
+    order = create_order(center=center, status="CCD")
+    payform = order.form_of_payments.first()
+    payform.value = 80
+    payform.save()
+    assert get_ledger(center) == {("CSH", "CCD"): (1, 80)}
+    payform.delete()
+    assert get_ledger(center) == {}
+
+
+@pytest.mark.django_db
+def test_cash_ledger_is_updated_when_order_is_deleted(
+    center_factory, create_order
+):
+    center = center_factory.create()
+    order = create_order(center=center, status="CCD")
+    create_order(center=center, status="CCD")
+    order.form_of_payments.all().delete()
+    order.delete()
+    assert get_ledger(center) == {("CSH", "CCD"): (1, 120)}
+
+
+@pytest.mark.django_db
+def test_rebuild_cash_ledger_command(center_factory, create_order):
+    center = center_factory.create()
+    create_order(center=center, status="CCD")
+    create_order(center=center, status="PND")
+    CashLedger.objects.all().delete()
+    call_command("rebuild_cash_ledger")
+    assert get_ledger(center) == {
+        ("CSH", "CCD"): (1, 120),
+        ("CSH", "PND"): (1, 120),
+    }
+
+
+@pytest.mark.django_db
+def test_cash_ledger_of_the_old_center_and_day_when_order_moves(
+    center_factory, create_center, create_order
+):
+    center, other = center_factory.create(), create_center(name="Other")
+    order = create_order(center=center, status="CCD")
+    order.center = other
+    order.save()
+    assert get_ledger(center) == {}
+    assert get_ledger(other) == {("CSH", "CCD"): (1, 120)}
+
+    order.created_on -= timedelta(days=3)
+    order.save()
+    assert CashLedger.objects.get(center=other).day == (
+        timezone.localdate(order.created_on)
+    )
+
+
+@pytest.mark.django_db
+def test_cash_ledger_is_updated_when_a_payform_leaves_its_orders(
+    center_factory, create_order, create_form_of_payment
+):
+    center = center_factory.create()
+    order = create_order(center=center, status="CCD")
+    payform = create_form_of_payment(type="PIX", value=50)
+    payform.order_set.add(order)
+    assert get_ledger(center) == {
+        ("CSH", "CCD"): (1, 120),
+        ("PIX", "CCD"): (1, 50),
+    }
+
+    payform.order_set.clear()
+    assert get_ledger(center) == {("CSH", "CCD"): (1, 120)}
+
+    payform.order_set.add(order)
+    payform.order_set.remove(order)
+    assert get_ledger(center) == {("CSH", "CCD"): (1, 120)}
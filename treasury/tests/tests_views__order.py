@@ -1,5 +1,6 @@
 import pytest
 from django.urls import reverse
+from django.utils import timezone
 
 from rcadmin.permissions_for_tests import permission
 
@@ -97,3 +98,78 @@ def test_access__search_orders__user_by_type(
         f"{url}?dt1=2021-10-17&dt2=2022-12-16&od_name=cesar&od_status=all"
     )
     assert response.status_code == status_code
+
+
+@pytest.mark.django_db
+def test_search_orders__count_follows_the_person_name(
+    center_factory, auto_login_user, create_person, create_order
+):
+    center = center_factory.create()
+    client, user = auto_login_user(group="treasury", center=center)
+    person = create_person(name="César Godoi", center=center)
+    create_order(center=center, person=person)
+    url = reverse("orders")
+    today = timezone.localdate().strftime("%Y-%m-%d")
+    params = {"dt1": today, "dt2": today, "od_name": "cesar"}
+
+    assert client.get(url, params).context["count"] == 1
+    person.name = "Joana Godoi"
+    person.save()
+    assert client.get(url, params).context["count"] == 0
+
+
+#  person search  #############################################################
+@pytest.mark.django_db
+def test_search_person_by_name__answers_from_the_name_index(
+    center_factory,
+    create_center,
+    create_user,
+    auto_login_user,
+    create_person,
+    django_assert_num_queries,
+):
+    center = center_factory.create()
+    # the person of a new user is named after the email
+    client, user = auto_login_user(
+        user=create_user(email="treasurer@mail.com"),
+        group="treasury",
+        center=center,
+    )
+    cesar = create_person(name="César Godoi", center=center)
+    create_person(name="Cesário Lima", center=center)
+    create_person(name="César Godoi Filho", center=create_center())
+    url = reverse("search_person_by_name")
+
+    response = client.get(url, {"term": "god CES"})
+    assert [person["id"] for person in response.context["results"]] == [
+        str(cesar.id)
+    ]
+    # the session, the user, the actor (person and groups) and the version
+    with django_assert_num_queries(5):
+        response = client.get(url, {"term": "ces"})
+    assert len(response.context["results"]) == 2
+
+    cesar.name = "Joana Godoi"
+    cesar.save()
+    response = client.get(url, {"term": "ces"})
+    assert [person["name"] for person in response.context["results"]] == [
+        "Cesário Lima"
+    ]
+
+
+@pytest.mark.django_db
+def test_order_create__gets_the_person_by_id(
+    center_factory, create_center, auto_login_user, create_person
+):
+    center = center_factory.create()
+    client, user = auto_login_user(group="treasury", center=center)
+    person = create_person(name="César Godoi", center=center)
+    other = create_person(name="César Godoi", center=create_center())
+
+    client.get(reverse("order_create"), {"person": other.id})
+    assert client.session["order"]["person"] == {}
+    client.get(reverse("order_create"), {"person": person.id})
+    assert client.session["order"]["person"] == {
+        "id": str(person.id),
+        "name": "César Godoi",
+    }
@@ -0,0 +1,187 @@
+import pytest
+from types import SimpleNamespace
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from rcadmin.permissions_for_tests import permission
+from treasury.views.useful import OrderByPeriod
+
+
+def get_order_by_period(center):
+    request = SimpleNamespace(
+        user=SimpleNamespace(person=SimpleNamespace(center=center))
+    )
+    today = timezone.now().date()
+    return OrderByPeriod(request, today, today)
+
+
+#  OrderByPeriod  #############################################################
+@pytest.mark.django_db
+def test_order_by_period__payforms_are_grouped_by_type(
+    center_factory, create_center, create_order, create_form_of_payment
+):
+    center = center_factory.create()
+    create_order(
+        center=center,
+        status="CCD",
+        form_of_payment=create_form_of_payment(type="CSH", value=100),
+    )
+    create_order(
+        center=center,
+        status="PND",
+        form_of_payment=create_form_of_payment(type="CSH", value=50),
+    )
+    create_order(
+        center=center,
+        status="CCD",
+        form_of_payment=create_form_of_payment(type="PIX", value=30),
+    )
+    create_order(
+        center=create_center(),
+        form_of_payment=create_form_of_payment(type="PIX"),
+    )
+
+    payforms = get_order_by_period(center).all_payforms
+
+    # in the order of PAYFORM_TYPES, not of the orders
+    assert [obj["type"][0] for obj in payforms] == ["PIX", "CSH"]
+    pix, cash = payforms
+    assert (pix["concluded"], pix["pending"], pix["total"]) == (30, 0, 30)
+    assert (cash["concluded"], cash["pending"], cash["total"]) == (
+        100,
+        50,
+        150,
+    )
+    assert len(cash["items"]) == 2
+    assert sorted(item["value"] for item in cash["items"]) == [50, 100]
+
+
+@pytest.mark.django_db
+def test_order_by_period__payments_are_grouped_by_paytype(
+    center_factory, create_order
+):
+    center = center_factory.create()
+    concluded = create_order(center=center, status="CCD")
+    pending = create_order(center=center, status="PND")
+
+    payments = get_order_by_period(center).all_payments
+
+    assert len(payments) == 1
+    assert payments[0]["type"] == str(concluded.payments.first().paytype)
+    assert payments[0]["concluded"] == 120
+    assert payments[0]["pending"] == 120
+    assert payments[0]["total"] == 240
+    assert [item["order_id"] for item in payments[0]["items"]] == [
+        str(concluded.id),
+        str(pending.id),
+    ]
+
+
+@pytest.mark.django_db
+def test_order_by_period__paytypes_are_sorted_by_name(
+    center_factory, create_order, create_payment, paytype_factory
+):
+    center = center_factory.create()
+    for name in ("Zeta", "Alfa"):
+        payment = create_payment(center=center)
+        payment.paytype = paytype_factory.create(name=name)
+        payment.save()
+        create_order(center=center, payment=payment)
+
+    payments = get_order_by_period(center).all_payments
+
+    assert [obj["type"] for obj in payments] == ["Alfa", "Zeta"]
+
+
+@pytest.mark.django_db
+def test_order_by_period__summaries(center_factory, create_order):
+    center = center_factory.create()
+    create_order(center=center, status="CCD")
+    self_payed = create_order(center=center, status="PND")
+    self_payed.self_payed = True
+    self_payed.save()
+
+    object_list = get_order_by_period(center)
+    summary, total = object_list.summary("concluded")
+    assert total == 120
+    assert [pay[1] for pay in summary] == [2]
+    payeds, payeds_total = object_list.summary("self_payed")
+    assert payeds == ["CSH"]
+    assert payeds_total == 120
+
+
+@pytest.mark.django_db
+def test_order_by_period__items_use_a_single_query(
+    center_factory, create_order, create_form_of_payment
+):
+    center = center_factory.create()
+    for _type in ("CSH", "PIX", "CSH", "DBT"):
+        create_order(
+            center=center, form_of_payment=create_form_of_payment(type=_type)
+        )
+    object_list = get_order_by_period(center)
+
+    with CaptureQueriesContext(connection) as context:
+        for obj in object_list.all_payforms:
+            list(obj["items"])
+    assert len(context.captured_queries) == 2
+
+
+#  reports views  #############################################################
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url_name",
+    ["treasury_home", "cash_balance", "period_payments", "payments_export"],
+)
+@pytest.mark.parametrize(
+    "user_type, status_code", permission["adm_tre_trej__200"]
+)
+def test_access__treasury_reports__user_by_type(
+    center_factory,
+    auto_login_user,
+    create_order,
+    url_name,
+    user_type,
+    status_code,
+):
+    center = center_factory.create()
+    client, user = auto_login_user(group=user_type, center=center)
+    create_order(center=center)
+    response = client.get(reverse(url_name))
+    assert response.status_code == status_code
+
+
+@pytest.mark.django_db
+def test_payments_export_streams_the_period_payments(
+    center_factory, auto_login_user, create_order
+):
+    center = center_factory.create()
+    client, user = auto_login_user(group="admin", center=center)
+    order = create_order(center=center, status="CCD")
+
+    response = client.get(reverse("payments_export"), {"format": "csv"})
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert lines[0] == "date,person,paytype,ref_month,value,status"
+    assert len(lines) == 2
+    assert lines[1].endswith(",120.00,concluded")
+    assert order.person.name in lines[1]
+
+
+@pytest.mark.django_db
+def test_payments_export_takes_the_search_dates_for_bad_ones(
+    center_factory, auto_login_user, create_order
+):
+    center = center_factory.create()
+    client, user = auto_login_user(group="admin", center=center)
+    create_order(center=center, status="CCD")
+
+    response = client.get(
+        reverse("payments_export"),
+        {"format": "csv", "dt1": "2022-13-45", "dt2": "today"},
+    )
+    assert response.status_code == 200
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert len(lines) == 2
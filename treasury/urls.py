@@ -150,6 +150,11 @@ urlpatterns += [
         reports.period_payments,
         name="period_payments",
     ),
+    path(
+        "reports/payments_export",
+        reports.payments_export,
+        name="payments_export",
+    ),
     path(
         "reports/payments_by_person",
         reports.payments_by_person,
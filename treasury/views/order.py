@@ -10,6 +10,7 @@ from django.utils.translation import gettext as _
 
 from event.models import Event
 from person.models import Person
+from person.name_index import get_person_name_index
 from rcadmin.common import (
     ORDER_STATUS,
     PAYFORM_TYPES,
@@ -17,6 +18,7 @@ from rcadmin.common import (
     clear_session,
     get_template_and_pagination,
 )
+from base.images import get_url
 from base.searchs import search_order
 
 from ..forms import FormOfPaymentForm, FormUpdateStatus, PaymentForm
@@ -85,12 +87,12 @@ def order_create(request):
         init_session(request)
 
     if request.GET.get("person"):
-        person = Person.objects.get(name=request.GET.get("person"))
-        request.session["order"]["person"] = {
-            "name": person.name,
-            "id": str(person.id),
-        }
-        request.session.modified = True
+        person = get_person_name_index(request.user.person.center_id).get(
+            request.GET.get("person")
+        )
+        if person:
+            request.session["order"]["person"] = person
+            request.session.modified = True
 
     context = {
         "to_create": True,
@@ -104,10 +106,9 @@ def order_create(request):
 def search_person_by_name(request):
     template_name = "treasury/order/elements/search_results.html"
     results = (
-        Person.objects.filter(
-            name__icontains=request.GET.get("term"),
-            center=request.user.person.center,
-        )[:10]
+        get_person_name_index(request.user.person.center_id).search(
+            request.GET.get("term"), 10
+        )
         if request.GET.get("term")
         else None
     )
@@ -426,7 +427,9 @@ def order_detail(request, id):
             "ctrl_number": pf.ctrl_number,
             "complement": pf.complement,
             "value": float(pf.value),
-            "voucher_img": pf.voucher_img.url if pf.voucher_img else None,
+            "voucher_img": get_url(pf.voucher_img, "detail")
+            if pf.voucher_img
+            else None,
         }
         payforms.append(payform)
         total_payforms += float(pf.value)
@@ -2,13 +2,16 @@ from datetime import datetime, timedelta
 
 from django.contrib.auth.decorators import login_required, permission_required
 from django.http import JsonResponse
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
+from base.export import export, queryset_rows
 from person.models import Person
-from rcadmin.common import paginator
+from person.name_index import get_person_name_index
+from rcadmin.common import ORDER_STATUS, paginator
 
+from ..models import Payment
 from .useful import OrderByPeriod, OrderToJson
 
 
@@ -114,6 +117,34 @@ def period_payments(request):
     return render(request, template_name, context)
 
 
+@login_required
+@permission_required("treasury.view_order")
+def payments_export(request):
+    search = search_dates(request)
+    dt1 = get_search_date(request, search, "dt1")
+    dt2 = get_search_date(request, search, "dt2")
+    columns = [
+        "order__created_on",
+        "person__name",
+        "paytype__name",
+        "ref_month",
+        "value",
+        "order__status",
+    ]
+    queryset = Payment.objects.filter(
+        order__center=request.user.person.center,
+        order__created_on__date__range=[dt1, dt2],
+    ).order_by("order__created_on")
+    return export(
+        request,
+        ["date", "person", "paytype", "ref_month", "value", "status"],
+        queryset_rows(queryset, columns, {"order__status": ORDER_STATUS}),
+        "{} - Payments ({} to {})".format(
+            "_".join(request.user.person.center.short_name.split()), dt1, dt2
+        ),
+    )
+
+
 @login_required
 @permission_required("treasury.view_order")
 def payments_by_person(request):
@@ -134,8 +165,12 @@ def payments_by_person(request):
     person = None
     object_list = []
 
-    if request.GET.get("person"):
-        person = Person.objects.get(name=request.GET.get("person"))
+    if request.GET.get("person_id"):
+        person = get_object_or_404(
+            Person,
+            pk=request.GET.get("person_id"),
+            center=request.user.person.center,
+        )
         request.session["order"]["person"] = {
             "name": person.name,
             "id": str(person.id),
@@ -211,11 +246,13 @@ def payments_by_person(request):
 def reports_search_person(request):
     template_name = "treasury/reports/payment_by_person.html"
     if request.is_ajax():
-        term = request.GET.get("term")
-        persons = Person.objects.filter(
-            name__icontains=term, center=request.user.person.center
-        )[:20]
-        results = [person.name for person in persons]
+        persons = get_person_name_index(request.user.person.center_id).search(
+            request.GET.get("term"), 20
+        )
+        results = [
+            {"label": person["name"], "value": person["name"], **person}
+            for person in persons
+        ]
         return JsonResponse(results, safe=False)
 
     return render(request, template_name)
@@ -231,3 +268,11 @@ def search_dates(request):
             "dt2": timezone.now().date().strftime("%Y-%m-%d"),
         }
     return request.session["search"]
+
+
+def get_search_date(request, search, key):
+    """the date of the GET, or the one of the search when it is not valid."""
+    try:
+        return datetime.strptime(request.GET[key], "%Y-%m-%d").date()
+    except (KeyError, ValueError):
+        return datetime.strptime(search[key], "%Y-%m-%d").date()
@@ -1,10 +1,43 @@
-from django.db.models import Q
+from collections import defaultdict
+
+from django.db.models import Count, Q, Sum
+from django.utils.functional import cached_property
 from rcadmin.common import ORDER_STATUS, PAYFORM_TYPES
 
-from ..models import Order
+from ..models import CashLedger, Order, Payment
+
+PAYFORM_LABELS = dict(PAYFORM_TYPES)
+PAYFORM_ORDER = {tp[0]: idx for idx, tp in enumerate(PAYFORM_TYPES)}
+
+
+class LazyItems:
+    """Items of one group of an OrderByPeriod.
+
+    The rows are loaded from a single query shared by all groups, and only
+    when the items are iterated. The length comes from the aggregation, so
+    counting the items does not load them.
+    """
+
+    def __init__(self, loader, key, count):
+        self.loader = loader
+        self.key = key
+        self.count = count
+
+    def __iter__(self):
+        return iter(self.loader().get(self.key, []))
+
+    def __len__(self):
+        return self.count
 
 
 class OrderByPeriod:
+    """
+    the orders of the center of the user in a period, grouped by form of
+    payment and by paytype. the groups come in a fixed order, the forms of
+    payment as in PAYFORM_TYPES and the paytypes by name, and not in the
+    order they first appear in the period.
+    """
+
     def __init__(self, request, from_date, to_date):
         self.request = request
         self.from_date = from_date
@@ -12,14 +45,18 @@ class OrderByPeriod:
         self.queryset = Order.objects.filter(self.get_query()).order_by(
             "created_on"
         )
-        self.all_payforms = self.get_payform_list(self.queryset)
-        self.all_payments = self.get_payment_list(self.queryset)
-        self.self_payeds = self.get_payform_list(self.get_self_payeds())
 
-    def get_query(self):
+    def get_query(self, prefix=""):
         _query = [
-            Q(center=self.request.user.person.center),
-            Q(created_on__date__range=[self.from_date, self.to_date]),
+            Q(**{f"{prefix}center": self.request.user.person.center}),
+            Q(
+                **{
+                    f"{prefix}created_on__date__range": [
+                        self.from_date,
+                        self.to_date,
+                    ]
+                }
+            ),
         ]
         # generating query
         query = Q()
@@ -27,14 +64,58 @@ class OrderByPeriod:
             query.add(q, Q.AND)
         return query
 
-    def get_self_payeds(self):
-        return [order for order in self.queryset if order.self_payed]
+    @staticmethod
+    def get_sums(value="value"):
+        return dict(
+            concluded=Sum(value, filter=Q(order__status="CCD")),
+            pending=Sum(value, filter=Q(order__status="PND")),
+            total=Sum(value),
+            count=Count("pk"),
+        )
+
+    @staticmethod
+    def get_group(_type, row, items):
+        return {
+            "type": _type,
+            "items": items,
+            "concluded": row["concluded"] or 0,
+            "pending": row["pending"] or 0,
+            "total": row["total"] or 0,
+        }
+
+    @cached_property
+    def all_payforms(self):
+        rows = CashLedger.objects.by_payform(
+            self.request.user.person.center, self.from_date, self.to_date
+        )
+        rows = sorted(rows, key=lambda row: PAYFORM_ORDER[row["payform_type"]])
+        return [
+            self.get_group(
+                (row["payform_type"], PAYFORM_LABELS[row["payform_type"]]),
+                row,
+                LazyItems(
+                    lambda: self.payform_items,
+                    row["payform_type"],
+                    row["count"],
+                ),
+            )
+            for row in rows
+        ]
 
-    def get_payform_list(self, objects):
-        object_list = []
-        for order in objects:
-            for fop in order.form_of_payments.all():
-                _payform = dict(
+    @cached_property
+    def payform_items(self):
+        items = defaultdict(list)
+        rows = (
+            Order.form_of_payments.through.objects.filter(
+                self.get_query("order__")
+            )
+            .select_related("order", "formofpayment__bank_flag")
+            .order_by("order__created_on")
+        )
+        for row in rows:
+            order, fop = row.order, row.formofpayment
+            items[fop.payform_type].append(
+                dict(
                     order_id=str(order.id),
                     date=order.created_on.strftime("%d/%m/%y"),
                     status=str(order.status),
@@ -45,43 +126,18 @@ class OrderByPeriod:
                     value=fop.value,
                     self_payed=order.self_payed,
                 )
-                if fop.payform_type not in [
-                    obj["type"][0] for obj in object_list
-                ]:
-                    object_list.append(
-                        {
-                            "type": [
-                                tp
-                                for tp in PAYFORM_TYPES
-                                if tp[0] == fop.payform_type
-                            ][0],
-                            "items": [_payform],
-                            "concluded": fop.value
-                            if order.status == "CCD"
-                            else 0,
-                            "pending": fop.value
-                            if order.status == "PND"
-                            else 0,
-                            "total": fop.value,
-                        }
-                    )
-                else:
-                    item = object_list.index(
-                        [
-                            obj
-                            for obj in object_list
-                            if obj["type"][0] == fop.payform_type
-                        ][0]
-                    )
-                    object_list[item]["items"].append(_payform)
-                    object_list[item]["concluded"] += (
-                        fop.value if order.status == "CCD" else 0
-                    )
-                    object_list[item]["pending"] += (
-                        fop.value if order.status == "PND" else 0
-                    )
-                    object_list[item]["total"] += fop.value
-        return object_list
+            )
+        return items
+
+    @cached_property
+    def self_payeds(self):
+        return CashLedger.objects.by_payform(
+            self.request.user.person.center,
+            self.from_date,
+            self.to_date,
+            self_payed=True,
+            status="PND",
+        )
 
     def summary(self, status):
         summary, total = [], 0
@@ -95,70 +151,72 @@ class OrderByPeriod:
                 )
                 summary.append(payment)
         else:
-            for obj in self.all_payforms:
-                for payment in obj["items"]:
-                    if payment["self_payed"] and payment["status"] == "PND":
-                        total += payment["value"]
-                        summary.append(payment["payform_type"])
+            for obj in self.self_payeds:
+                total += obj["total"]
+                summary += [obj["payform_type"]] * obj["count"]
         return summary, total
 
-    def get_payment_list(self, objects):
-        object_list = []
-        for order in objects:
-            for pay in order.payments.all():
-                _event = (
-                    "{}... {} - {}".format(
-                        str(pay.paytype)[:4],
-                        pay.event.center,
-                        pay.event.date.strftime("%d/%m/%y"),
-                    )
-                    if pay.event
-                    else ""
+    @cached_property
+    def all_payments(self):
+        rows = (
+            Payment.objects.filter(self.get_query("order__"))
+            .values("paytype__name")
+            .annotate(**self.get_sums())
+            .order_by("paytype__name")
+        )
+        return [
+            self.get_group(
+                row["paytype__name"],
+                row,
+                LazyItems(
+                    lambda: self.payment_items,
+                    row["paytype__name"],
+                    row["count"],
+                ),
+            )
+            for row in rows
+        ]
+
+    @cached_property
+    def payment_items(self):
+        items = defaultdict(list)
+        rows = (
+            Order.payments.through.objects.filter(self.get_query("order__"))
+            .select_related(
+                "order",
+                "payment__paytype",
+                "payment__person",
+                "payment__event__center",
+            )
+            .order_by("order__created_on")
+        )
+        for row in rows:
+            order, pay = row.order, row.payment
+            _event = (
+                "{}... {} - {}".format(
+                    str(pay.paytype)[:4],
+                    pay.event.center,
+                    pay.event.date.strftime("%d/%m/%y"),
                 )
-                _payment = dict(
+                if pay.event
+                else ""
+            )
+            items[str(pay.paytype)].append(
+                dict(
                     order_id=str(order.id),
                     date=order.created_on.strftime("%d/%m/%y"),
                     status=order.status,
                     paytype=str(pay.paytype),
-                    person=str(pay.person.short_name),
+                    person=str(pay.person.short_name) if pay.person else "",
                     event=_event,
-                    ref_month=pay.ref_month.strftime("%b/%y"),
+                    ref_month=pay.ref_month.strftime("%b/%y")
+                    if pay.ref_month
+                    else "",
                     value=float(pay.value),
                     obs=str(pay.obs),
                 )
-                if str(pay.paytype) not in [
-                    obj["type"] for obj in object_list
-                ]:
-                    object_list.append(
-                        {
-                            "type": str(pay.paytype),
-                            "items": [_payment],
-                            "concluded": pay.value
-                            if order.status == "CCD"
-                            else 0,
-                            "pending": pay.value
-                            if order.status == "PND"
-                            else 0,
-                            "total": pay.value,
-                        }
-                    )
-                else:
-                    item = object_list.index(
-                        [
-                            obj
-                            for obj in object_list
-                            if obj["type"] == str(pay.paytype)
-                        ][0]
-                    )
-                    object_list[item]["items"].append(_payment)
-                    object_list[item]["concluded"] += (
-                        pay.value if order.status == "CCD" else 0
-                    )
-                    object_list[item]["pending"] += (
-                        pay.value if order.status == "PND" else 0
-                    )
-                    object_list[item]["total"] += pay.value
-        return object_list
+            )
+        return items
 
     def summary_of_payments(self):
         summary, total = [], 0
@@ -1,4 +1,3 @@
-from PIL import Image
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -7,6 +6,8 @@ from django.contrib.auth.models import (
     PermissionsMixin,
     BaseUserManager,
 )
+from base.images import request_renditions
+from base.models import TrackedFieldsMixin
 from rcadmin.common import (
     phone_format,
     get_filename,
@@ -44,7 +45,7 @@ class UserManager(BaseUserManager):
         return user
 
 
-class User(AbstractBaseUser, PermissionsMixin):
+class User(TrackedFieldsMixin, AbstractBaseUser, PermissionsMixin):
     email = models.EmailField(
         _("email address"),
         max_length=255,
@@ -70,6 +71,8 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     USERNAME_FIELD = "email"
 
+    tracked_fields = ("is_active",)
+
     objects = UserManager()
 
     class Meta:
@@ -83,7 +86,7 @@ def profile_pics(instance, filename):
 
 
 # Profile
-class Profile(models.Model):
+class Profile(TrackedFieldsMixin, models.Model):
     user = models.OneToOneField(
         User, on_delete=models.CASCADE, verbose_name=_("user")
     )
@@ -112,6 +115,8 @@ class Profile(models.Model):
         _("emergency phone"), max_length=20, blank=True
     )
 
+    tracked_fields = ("image",)
+
     def save(self, *args, **kwargs):
         if not self.social_name:
             self.social_name = (
@@ -120,14 +125,10 @@ class Profile(models.Model):
         self.phone = phone_format(self.phone)
         self.sos_phone = phone_format(self.sos_phone)
         self.state = str(self.state).upper()
+        new_image = self.has_changed("image")
         super(Profile, self).save(*args, **kwargs)
-        if self.image:
-            img = Image.open(self.image.path)
-            if img.filename.split("/")[-1] != "default_profile.jpg":
-                if img.height > 300 or img.width > 300:
-                    output_size = (300, 300)
-                    img.thumbnail(output_size)
-                    img.save(self.image.path)
+        if new_image:
+            request_renditions(self.image)
 
     def __str__(self):
         return f"{self.social_name} ({self.user})"
@@ -15,11 +15,12 @@ def create_profile_and_person(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=User)
-def save_profile(sender, instance, **kwargs):
+def save_profile(sender, instance, created, **kwargs):
+    if not (created or instance.has_changed("is_active")):
+        return
     if instance.is_active != instance.person.is_active:
         instance.person.is_active = instance.is_active
         instance.person.save()
-    instance.profile.save()
 
 
 @receiver(post_delete, sender=Profile)
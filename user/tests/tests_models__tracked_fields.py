@@ -0,0 +1,75 @@
+import pytest
+
+from django.utils import timezone
+
+from person.models import Person
+from person.name_index import get_version
+from user.models import Profile, User
+
+
+@pytest.mark.django_db
+def test_a_login_does_not_touch_the_profile_or_the_person(
+    create_user, monkeypatch, django_assert_num_queries
+):
+    user = User.objects.get(pk=create_user().pk)
+    monkeypatch.setattr("user.models.request_renditions", pytest.fail)
+
+    # only the update of the user itself
+    with django_assert_num_queries(1):
+        user.last_login = timezone.now()
+        user.save(update_fields=["last_login"])
+    with django_assert_num_queries(1):
+        user.save()
+
+
+@pytest.mark.django_db
+def test_is_active_is_kept_in_sync_both_ways(create_user):
+    user = create_user()
+    user.is_active = False
+    user.save()
+    assert not Person.objects.get(user=user).is_active
+
+    person = Person.objects.get(user=user)
+    person.is_active = True
+    person.save()
+    assert User.objects.get(pk=user.pk).is_active
+    assert person.get_changed_fields() == set()
+
+
+@pytest.mark.django_db
+def test_the_profile_image_is_only_processed_when_it_changes(
+    create_user, monkeypatch
+):
+    profile = Profile.objects.get(user=create_user())
+    requested = []
+    monkeypatch.setattr("user.models.request_renditions", requested.append)
+
+    profile.city = "Campinas"
+    profile.save()
+    assert requested == []
+
+    profile.image = "profile_pics/new.jpg"
+    assert profile.has_changed("image")
+    profile.save()
+    profile.save()
+    assert [file.name for file in requested] == ["profile_pics/new.jpg"]
+
+
+@pytest.mark.django_db
+def test_the_name_index_is_bumped_only_when_the_center_changes(
+    create_person, create_center
+):
+    person = create_person()
+    old_center, new_center = person.center, create_center()
+    versions = get_version(old_center.pk), get_version(new_center.pk)
+
+    person.observations = "nothing about the name index"
+    person.save()
+    assert (get_version(old_center.pk), get_version(new_center.pk)) == (
+        versions
+    )
+
+    person.center = new_center
+    person.save()
+    assert get_version(old_center.pk) != versions[0]
+    assert get_version(new_center.pk) != versions[1]
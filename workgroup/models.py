@@ -2,12 +2,13 @@ from django.db import models
 from django.conf import settings
 
 from django.utils.translation import gettext_lazy as _
+from base.models import TrackedFieldsMixin
 from person.models import Person
 from rcadmin.common import ASPECTS, ROLE_TYPES, WORKGROUP_TYPES
 
 
 #  Workgroup
-class Workgroup(models.Model):
+class Workgroup(TrackedFieldsMixin, models.Model):
     name = models.CharField(_("name"), max_length=50)
     center = models.ForeignKey(
         "center.Center", on_delete=models.PROTECT, verbose_name=_("center")
@@ -32,6 +33,8 @@ class Workgroup(models.Model):
         blank=True,
     )
 
+    tracked_fields = ("center",)
+
     def __str__(self):
         return f"{self.name} - {self.center}"
 
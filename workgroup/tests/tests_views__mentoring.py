@@ -1,4 +1,6 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from event.models import Frequency
@@ -26,6 +28,20 @@ def test_access__mentoring_home__user_by_type(
     assert response.status_code == status_code
 
 
+@pytest.mark.django_db
+def test_mentoring_home__loads_the_actor_once(center_factory, auto_login_user):
+    center = center_factory.create()
+    client, user = auto_login_user(group="mentoring", center=center)
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(reverse("mentoring_home"))
+    assert response.context["actor"].in_groups("mentoring")
+    assert response.context["actor"].center == center
+    sqls = [query["sql"] for query in context.captured_queries]
+    assert len([sql for sql in sqls if 'FROM "auth_group"' in sql]) == 1
+    assert len([sql for sql in sqls if 'FROM "center_center"' in sql]) == 0
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize("user_type, status_code", permission["adm_men__200"])
 def test_access__mentoring_group_detail__user_by_type(
@@ -15,6 +15,7 @@ from rcadmin.common import (
     ACTIVITY_TYPES,
     clear_session,
     get_template_and_pagination,
+    in_groups,
     check_center_module,
 )
 from base.searchs import search_event
@@ -27,10 +28,7 @@ from ..models import Workgroup, Membership
 
 @login_required
 @permission_required("workgroup.view_workgroup")
-@user_passes_test(
-    lambda u: "admin" in [pr.name for pr in u.groups.all()]
-    or "mentoring" in [pr.name for pr in u.groups.all()]
-)
+@user_passes_test(lambda u: in_groups(u, "admin", "mentoring"))
 def mentoring_home(request):
     if not check_center_module(request, "mentoring"):
         return render(request, "base/module_not_avaiable.html")
@@ -62,10 +60,7 @@ def mentoring_home(request):
 
 @login_required
 @permission_required("workgroup.view_workgroup")
-@user_passes_test(
-    lambda u: "admin" in [pr.name for pr in u.groups.all()]
-    or "mentoring" in [pr.name for pr in u.groups.all()]
-)
+@user_passes_test(lambda u: in_groups(u, "admin", "mentoring"))
 def mentoring_group_detail(request, pk):
     LIMIT, template_name, _from, _to, page = get_template_and_pagination(
         request,
@@ -116,10 +111,7 @@ def mentoring_group_detail(request, pk):
 
 @login_required
 @permission_required("workgroup.view_workgroup")
-@user_passes_test(
-    lambda u: "admin" in [pr.name for pr in u.groups.all()]
-    or "mentoring" in [pr.name for pr in u.groups.all()]
-)
+@user_passes_test(lambda u: in_groups(u, "admin", "mentoring"))
 def mentoring_group_frequencies(request, pk):
     LIMIT, template_name, _from, _to, page = get_template_and_pagination(
         request,
@@ -166,10 +158,7 @@ def mentoring_group_frequencies(request, pk):
 
 @login_required
 @permission_required("workgroup.view_workgroup")
-@user_passes_test(
-    lambda u: "admin" in [pr.name for pr in u.groups.all()]
-    or "mentoring" in [pr.name for pr in u.groups.all()]
-)
+@user_passes_test(lambda u: in_groups(u, "admin", "mentoring"))
 def mentoring_member_detail(request, group_pk, person_pk):
     obj = Person.objects.get(pk=person_pk)
     age = (date.today() - obj.birth).days // 365
@@ -187,10 +176,7 @@ def mentoring_member_detail(request, group_pk, person_pk):
 
 @login_required
 @permission_required("workgroup.view_workgroup")
-@user_passes_test(
-    lambda u: "admin" in [pr.name for pr in u.groups.all()]
-    or "mentoring" in [pr.name for pr in u.groups.all()]
-)
+@user_passes_test(lambda u: in_groups(u, "admin", "mentoring"))
 def mentoring_member_frequencies(request, group_pk, person_pk):
     LIMIT, template_name, _from, _to, page = get_template_and_pagination(
         request,
@@ -229,10 +215,7 @@ def mentoring_member_frequencies(request, group_pk, person_pk):
 
 @login_required
 @permission_required("workgroup.view_workgroup")
-@user_passes_test(
-    lambda u: "admin" in [pr.name for pr in u.groups.all()]
-    or "mentoring" in [pr.name for pr in u.groups.all()]
-)
+@user_passes_test(lambda u: in_groups(u, "admin", "mentoring"))
 def mentoring_member_historic(request, group_pk, person_pk):
     LIMIT, template_name, _from, _to, page = get_template_and_pagination(
         request,
@@ -263,10 +246,7 @@ def mentoring_member_historic(request, group_pk, person_pk):
 
 @login_required
 @permission_required("workgroup.view_workgroup")
-@user_passes_test(
-    lambda u: "admin" in [pr.name for pr in u.groups.all()]
-    or "mentoring" in [pr.name for pr in u.groups.all()]
-)
+@user_passes_test(lambda u: in_groups(u, "admin", "mentoring"))
 def membership_add_frequency(request, group_pk, person_pk):
     LIMIT, template_name, _from, _to, page = get_template_and_pagination(
         request,
@@ -339,10 +319,7 @@ def membership_add_frequency(request, group_pk, person_pk):
 
 @login_required
 @permission_required("workgroup.view_workgroup")
-@user_passes_test(
-    lambda u: "admin" in [pr.name for pr in u.groups.all()]
-    or "mentoring" in [pr.name for pr in u.groups.all()]
-)
+@user_passes_test(lambda u: in_groups(u, "admin", "mentoring"))
 def membership_update_frequency(request, group_pk, person_pk, freq_pk):
     person = Person.objects.get(pk=person_pk)
     frequency = Frequency.objects.get(pk=freq_pk)
@@ -389,10 +366,7 @@ def membership_update_frequency(request, group_pk, person_pk, freq_pk):
 
 @login_required
 @permission_required("workgroup.view_workgroup")
-@user_passes_test(
-    lambda u: "admin" in [pr.name for pr in u.groups.all()]
-    or "mentoring" in [pr.name for pr in u.groups.all()]
-)
+@user_passes_test(lambda u: in_groups(u, "admin", "mentoring"))
 def membership_remove_frequency(request, group_pk, person_pk, freq_pk):
     frequency = Frequency.objects.get(pk=freq_pk)
 
@@ -421,10 +395,7 @@ def membership_remove_frequency(request, group_pk, person_pk, freq_pk):
 
 @login_required
 @permission_required("workgroup.view_workgroup")
-@user_passes_test(
-    lambda u: "admin" in [pr.name for pr in u.groups.all()]
-    or "mentoring" in [pr.name for pr in u.groups.all()]
-)
+@user_passes_test(lambda u: in_groups(u, "admin", "mentoring"))
 def mentoring_add_frequencies(request, group_pk):
     LIMIT, template_name, _from, _to, page = get_template_and_pagination(
         request,
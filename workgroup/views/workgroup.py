@@ -14,6 +14,7 @@ from rcadmin.common import (
     WORKGROUP_TYPES,
     clear_session,
     get_template_and_pagination,
+    in_groups,
 )
 from base.searchs import search_workgroup
 
@@ -23,11 +24,7 @@ from ..models import Workgroup
 
 @login_required
 @permission_required("workgroup.view_workgroup")
-@user_passes_test(
-    lambda u: "admin" in [pr.name for pr in u.groups.all()]
-    or "office" in [pr.name for pr in u.groups.all()]
-    or "presidium" in [pr.name for pr in u.groups.all()]
-)
+@user_passes_test(lambda u: in_groups(u, "admin", "office", "presidium"))
 def workgroup_home(request):
     LIMIT, template_name, _from, _to, page = get_template_and_pagination(
         request,
@@ -65,11 +62,7 @@ def workgroup_home(request):
 
 @login_required
 @permission_required("workgroup.view_workgroup")
-@user_passes_test(
-    lambda u: "admin" in [pr.name for pr in u.groups.all()]
-    or "office" in [pr.name for pr in u.groups.all()]
-    or "presidium" in [pr.name for pr in u.groups.all()]
-)
+@user_passes_test(lambda u: in_groups(u, "admin", "office", "presidium"))
 def workgroup_detail(request, pk):
     LIMIT, template_name, _from, _to, page = get_template_and_pagination(
         request,
@@ -104,10 +97,7 @@ def workgroup_detail(request, pk):
 
 @login_required
 @permission_required("workgroup.add_workgroup")
-@user_passes_test(
-    lambda u: "admin" in [pr.name for pr in u.groups.all()]
-    or "office" in [pr.name for pr in u.groups.all()]
-)
+@user_passes_test(lambda u: in_groups(u, "admin", "office"))
 def workgroup_create(request):
     if request.method == "POST":
         form = WorkgroupForm(request.POST)